@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the mod tools against synthetic game data.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from collections.abc import Callable
+from modtools.fixtures import (
+    CLASS_DESCRIPTIONS_PATHS,
+    FixtureUnpak,
+    PROGRESSIONS_PATHS,
+    ROOT_TEMPLATES_PATH,
+    SPELL_LISTS_PATHS,
+    synthetic_game_data,
+    write_fixtures,
+)
+from modtools.localization import Localization
+from modtools.lsx import Lsx
+from modtools.lsx.game import CharacterClass, ClassDescription, Progression, SpellList
+from modtools.lsx.lsf import DEFAULT_ENGINE_VERSION, decode_lsf, encode_lsf
+from modtools.replacers import class_description, progression, Replacer, spell_list
+from uuid import UUID
+from xml.etree.ElementTree import canonicalize, tostring
+
+type Setup = Callable[[], Callable[[], object]]  # Prepares a run, returning the function to be timed
+
+
+class _BenchmarkReplacer(Replacer):
+    """A replacer exercising the progression, spell list, and class description builders."""
+
+    def __init__(self, base_dir: str, unpak: FixtureUnpak, cache_dir: str):
+        super().__init__(base_dir, author="benchmark", name="Benchmark", unpak=unpak, cache_dir=cache_dir)
+
+    @progression(CharacterClass.WIZARD, range(1, 21))
+    def wizard_level(self, progression: Progression) -> None:
+        progression.PassivesAdded = (progression.PassivesAdded or []) + ["Synthetic_Passive_0"]
+
+    @spell_list("Synthetic Spell List 0")
+    def synthetic_spell_list(self, spell_list: SpellList) -> None:
+        spell_list.Spells = spell_list.Spells + ["Target_Synthetic_0"]
+
+    @class_description(CharacterClass.WIZARD)
+    def wizard_description(self, class_description: ClassDescription) -> None:
+        class_description.CanLearnSpells = True
+
+
+def _lsx_load(unpak: FixtureUnpak, pak_path: str) -> Setup:
+    path = unpak.get_path(pak_path)
+    return lambda: lambda: Lsx.load(path)
+
+
+def _lsx_load_tree(unpak: FixtureUnpak, pak_path: str) -> Setup:
+    """Load through an element tree, as Lsx.load() does when parsed XML is cached, starting from an empty cache."""
+    path = unpak.get_path(pak_path)
+
+    def load() -> object:
+        Lsx.cache_parsed({})
+        try:
+            return Lsx.load(path)
+        finally:
+            Lsx.cache_parsed(None)
+    return lambda: load
+
+
+def _children_update(unpak: FixtureUnpak) -> Setup:
+    def key(progression: Progression) -> tuple[str, int, bool]:
+        return (progression.Name, progression.Level, progression.IsMulticlass or False)
+
+    layers = [Lsx.load(unpak.get_path(path)).children for path in PROGRESSIONS_PATHS]
+
+    def setup() -> Callable[[], object]:
+        children = layers[0].copy()
+        return lambda: [children.update(layer, key=key) for layer in layers[1:]]
+    return setup
+
+
+def _document_save(unpak: FixtureUnpak, output_dir: str) -> Setup:
+    document = Lsx.load(unpak.get_path(ROOT_TEMPLATES_PATH))
+    return lambda: lambda: document.save(output_dir, folder="Benchmark")
+
+
+def _document_render_lsf(unpak: FixtureUnpak) -> Setup:
+    document = Lsx.load(unpak.get_path(ROOT_TEMPLATES_PATH))
+    return lambda: document.render_lsf
+
+
+def _game_data_str(scale: int) -> Setup:
+    game_data = synthetic_game_data(scale)
+    return lambda: lambda: "\n".join(str(data) for data in game_data)
+
+
+def _localization_build(scale: int, output_dir: str) -> Setup:
+    def setup() -> Callable[[], object]:
+        localization = Localization(UUID(int=0))
+        localization.add_language("en", "English")
+        for i in range(2000 * scale):
+            localization[f"Key_{i}"] = f"Synthetic text {i}.\n\nWith a <br> second paragraph."
+        return lambda: localization.build(output_dir)
+    return setup
+
+
+def _replacer_build(unpak: FixtureUnpak, output_dir: str, cache_dir: str) -> Setup:
+    """Build the replacer, recording its builds in cache_dir rather than in the mod tools' own build cache."""
+    def setup() -> Callable[[], object]:
+        argv = sys.argv
+        sys.argv = [argv[0], "--force"]  # The replacer parses its own command line
+        try:
+            replacer = _BenchmarkReplacer(output_dir, unpak, cache_dir)
+        finally:
+            sys.argv = argv
+        return replacer.build
+    return setup
+
+
+def _check_lsf_round_trip(unpak: FixtureUnpak) -> None:
+    """Check that each fixture document's .lsf encoding decodes to the same XML, raising AssertionError if not."""
+    for pak_path in [*PROGRESSIONS_PATHS, *SPELL_LISTS_PATHS, *CLASS_DESCRIPTIONS_PATHS, ROOT_TEMPLATES_PATH]:
+        document = Lsx.load(unpak.get_path(pak_path))
+        xml = document.xml(version=DEFAULT_ENGINE_VERSION)
+        decoded = decode_lsf(encode_lsf(xml), root=document.root)
+        assert canonicalize(tostring(decoded)) == canonicalize(tostring(xml)), f"{pak_path}: .lsf round trip differs"
+
+
+def _time(setup: Setup, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        fn = setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mod tools against synthetic game data.")
+    parser.add_argument("-s", "--scale", type=int, default=1,
+                        help="Size of the synthetic game data, as a multiple of the game's (default: 1)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="Number of timed runs of each benchmark (default: 5)")
+    parser.add_argument("-b", "--benchmark", type=str, action="append",
+                        help="Run only the named benchmark(s)")
+    parser.add_argument("-f", "--fixtures", type=str,
+                        help="Directory of the synthetic game data, generated if missing (default: a temporary "
+                             "directory)")
+    parser.add_argument("-o", "--output", type=str,
+                        help="Write the results to this JSON file")
+    parser.add_argument("-c", "--compare", type=str,
+                        help="Compare the results against those in this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fixtures_dir = args.fixtures or os.path.join(temp_dir, "unpak")
+        if not os.path.exists(fixtures_dir):
+            print(f"Generating synthetic game data at scale {args.scale}x in {fixtures_dir}")
+            write_fixtures(fixtures_dir, scale=args.scale)
+        unpak = FixtureUnpak(fixtures_dir)
+        output_dir = os.path.join(temp_dir, "output")
+        cache_dir = os.path.join(temp_dir, "cache")
+        _check_lsf_round_trip(unpak)
+
+        benchmarks: dict[str, Callable[[], Setup]] = {
+            "Lsx.load(Progressions.lsx)": lambda: _lsx_load(unpak, PROGRESSIONS_PATHS[0]),
+            "Lsx.load(ClassDescriptions.lsx)": lambda: _lsx_load(unpak, CLASS_DESCRIPTIONS_PATHS[0]),
+            "Lsx.load(_merged.lsf.lsx)": lambda: _lsx_load(unpak, ROOT_TEMPLATES_PATH),
+            "Lsx.load(Progressions.lsx, element tree)": lambda: _lsx_load_tree(unpak, PROGRESSIONS_PATHS[0]),
+            "Lsx.load(_merged.lsf.lsx, element tree)": lambda: _lsx_load_tree(unpak, ROOT_TEMPLATES_PATH),
+            "LsxChildren.update": lambda: _children_update(unpak),
+            "LsxDocument.save": lambda: _document_save(unpak, output_dir),
+            "LsxDocument.render_lsf": lambda: _document_render_lsf(unpak),
+            "GameData.__str__": lambda: _game_data_str(args.scale),
+            "Localization.build": lambda: _localization_build(args.scale, output_dir),
+            "Replacer.build": lambda: _replacer_build(unpak, output_dir, cache_dir),
+        }
+
+        results = {}
+        for name, benchmark in benchmarks.items():
+            if args.benchmark and name not in args.benchmark:
+                continue
+            times = _time(benchmark(), args.repeat)
+            results[name] = {
+                "min": min(times),
+                "median": statistics.median(times),
+                "mean": statistics.mean(times),
+                "times": times,
+            }
+            print(f"{name}: min {min(times):.4f}s, median {statistics.median(times):.4f}s")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+        for name, result in results.items():
+            if (base := baseline.get(name)) and base["min"] > 0:
+                print(f"{name}: {result["min"] / base["min"]:.2f}x of {args.compare}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "commit": _commit(),
+                "python": platform.python_version(),
+                "scale": args.scale,
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
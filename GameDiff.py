@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Snapshots the game's tables from the unpak cache, and reports how a game patch changed them, and which mods it affects.
+"""
+
+import argparse
+import os
+import time
+
+from modtools.gamediff import GAME_TABLES, affected_mods, diff_table, format_changes, take_snapshot
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "modtools", ".cache")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot the game's tables, and report how a patch changed them.")
+    parser.add_argument("-c", "--cache-dir", type=str, default=DEFAULT_CACHE_DIR,
+                        help=f"The mod tools' cache directory (default: {DEFAULT_CACHE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = commands.add_parser("snapshot", help="Copy the game's tables from the unpak cache")
+    snapshot_parser.add_argument("snapshot_dir", type=str,
+                                 help="Directory in which to write the snapshot")
+
+    diff_parser = commands.add_parser("diff", help="Report the changes between two snapshots")
+    diff_parser.add_argument("old_dir", type=str,
+                             help="The snapshot from before the patch")
+    diff_parser.add_argument("new_dir", type=str, nargs="?", default=None,
+                             help="The snapshot from after the patch (default: the unpak cache)")
+    diff_parser.add_argument("-v", "--verbose", action="store_true",
+                             help="List each added, removed, and changed entry")
+    args = parser.parse_args()
+
+    unpak_dir = os.path.join(args.cache_dir, "unpak")
+    match args.command:
+        case "snapshot":
+            count = take_snapshot(unpak_dir, args.snapshot_dir)
+            print(f"{unpak_dir} -> {args.snapshot_dir}: {count} files")
+        case "diff":
+            start = time.perf_counter()
+            changes = [diff_table(args.old_dir, args.new_dir or unpak_dir, table) for table in GAME_TABLES]
+            mods = affected_mods(os.path.join(args.cache_dir, "builds"), changes)
+            print(format_changes(changes, mods, verbose=args.verbose))
+            print(f"Diffed in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -141,7 +141,7 @@ class LsxParser:
 
     def parse(self, lsx_path: os.PathLike, output: str) -> None:
         _, _, relative_path = str(PurePath(lsx_path).as_posix()).partition("/")
-        cached_path = self._unpak.get_path(lsx_path)
+        lsx_data = self._unpak.get_data(lsx_path)
 
         if output:
             output_path = os.path.normpath(os.path.join(os.path.dirname(__file__), "modtools/lsx/game", output))
@@ -150,9 +150,7 @@ class LsxParser:
 
         lsx = LsxParser.Lsx()
         xml_parser = XMLParser(target=lsx)
-        with open(cached_path, "rb") as lsx_file:
-            for line in lsx_file:
-                xml_parser.feed(line)
+        xml_parser.feed(lsx_data)
 
         with (open(output_path, "w") if output_path is not None else sys.stdout) as f:
             f.write(PROLOGUE)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Packs built mod directories into .pak files.
+"""
+
+import argparse
+import os
+
+from modtools.pak import CompressionLevel, CompressionMethod, write_pak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack built mod directories into .pak files.")
+    parser.add_argument("mod_dirs", type=str, nargs="+",
+                        help="Built mod directories, each containing Mods/, Public/, and/or Localization/")
+    parser.add_argument("-o", "--output", type=str, default=".",
+                        help="Directory in which to write the .pak files (default: the current directory)")
+    parser.add_argument("-m", "--method", type=str, choices=[method.name.lower() for method in CompressionMethod],
+                        default="zlib", help="Compression method (default: zlib)")
+    parser.add_argument("-l", "--level", type=str, choices=[level.name.lower() for level in CompressionLevel],
+                        default="default", help="Compression level (default: default)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of compression threads (default: the number of processors)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    for mod_dir in args.mod_dirs:
+        pak_path = os.path.join(args.output, f"{os.path.basename(os.path.normpath(mod_dir))}.pak")
+        write_pak(pak_path, [mod_dir],
+                  method=CompressionMethod[args.method.upper()],
+                  level=CompressionLevel[args.level.upper()],
+                  jobs=args.jobs)
+        print(f"{mod_dir} -> {pak_path}")
+
+
+if __name__ == "__main__":
+    main()
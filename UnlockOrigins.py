@@ -29,35 +29,10 @@ class UnlockOrigins(Replacer):
     @origin("Shadowheart")
     @origin("Wyll")
     def unlock_background(self, origin: Origin) -> None:
-        self.mod.add(Origin(
-            AppearanceLocked=origin.AppearanceLocked,
-            AvailableInCharacterCreation=origin.AvailableInCharacterCreation,
+        self.mod.add(origin.clone(
             BackgroundUUID=None,
-            BodyShape=origin.BodyShape,
-            BodyType=origin.BodyType,
-            ClassEquipmentOverride=origin.ClassEquipmentOverride,
-            ClassUUID=origin.ClassUUID,
-            CloseUpA=origin.CloseUpA,
-            CloseUpB=origin.CloseUpB,
-            DefaultsTemplate=origin.DefaultsTemplate,
-            Description=origin.Description,
-            DisplayName=origin.DisplayName,
-            ExcludesOriginUUID=origin.ExcludesOriginUUID,
-            GlobalTemplate=origin.GlobalTemplate,
-            GodUUID=origin.GodUUID,
-            IntroDialogUUID=origin.IntroDialogUUID,
-            LockBody=origin.LockBody,
             LockClass=False,
-            LockRace=origin.LockRace,
-            Name=origin.Name,
-            Passives=origin.Passives,
-            RaceUUID=origin.RaceUUID,
-            SubClassUUID=origin.SubClassUUID,
-            SubRaceUUID=origin.SubRaceUUID,
             UUID=self.make_uuid(origin.Name),
-            Unique=origin.Unique,
-            VoiceTableUUID=origin.VoiceTableUUID,
-            children=origin.children,
         ))
 
     def __init__(self):
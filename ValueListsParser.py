@@ -32,10 +32,10 @@ class ValueListsParser:
     _VALUELIST_REGEX = re.compile("""\\s*valuelist\\s*"([^"]+)"\\s*""")
     _VALUE_REGEX = re.compile("""\\s*value\\s*"([^"]+)"\\s*""")
 
-    _value_lists_path: os.PathLike
+    _value_lists: str
 
     def __init__(self, unpak: Unpak):
-        self._value_lists_path = unpak.get_path(VALUE_LISTS_PATH)
+        self._value_lists = unpak.get_data(VALUE_LISTS_PATH).decode("utf-8")
 
     def parse(self, output: str | None):
         if output:
@@ -47,20 +47,19 @@ class ValueListsParser:
         name: str = None
         valid_values: Set[str] = set()
 
-        with open(self._value_lists_path, "r") as value_lists_file:
-            for line in value_lists_file:
-                if match := self._VALUELIST_REGEX.match(line):
-                    if name:
-                        valuelists[name] = valid_values
-                    name = match[1]
-                    valid_values = set()
-                elif match := self._VALUE_REGEX.match(line):
-                    valid_values.add(match[1])
-                elif line.strip():
-                    raise RuntimeError(f"Unknown line in ValueLists.txt: {line}")
-
-            if name:
-                valuelists[name] = valid_values
+        for line in self._value_lists.splitlines():
+            if match := self._VALUELIST_REGEX.match(line):
+                if name:
+                    valuelists[name] = valid_values
+                name = match[1]
+                valid_values = set()
+            elif match := self._VALUE_REGEX.match(line):
+                valid_values.add(match[1])
+            elif line.strip():
+                raise RuntimeError(f"Unknown line in ValueLists.txt: {line}")
+
+        if name:
+            valuelists[name] = valid_values
 
         with (open(output_path, "w") if output_path is not None else sys.stdout) as f:
             f.write(PROLOGUE)
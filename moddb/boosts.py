@@ -4,10 +4,27 @@ Boosts-related functionality for Baldur's Gate 3 mods.
 """
 
 from collections.abc import Callable
+from functools import cache
 from moddb.scripts import character_level_range
 from modtools.mod import Mod
 
 
+@cache
+def _level_ranges(boosts: tuple[str, ...]) -> tuple[tuple[int, int, str], ...]:
+    """Run-length encode per-level boosts (starting at level 1) as (first, last, boost), ending at level 20."""
+    range_and_boost = [(1, 1, boosts[0])]
+
+    for level, boost in enumerate(boosts, start=1):
+        if boost != range_and_boost[-1][2]:
+            range_and_boost.append((level, level, boost))
+        else:
+            range_and_boost[-1] = (range_and_boost[-1][0], level, boost)
+
+    range_and_boost[-1] = (range_and_boost[-1][0], 20, range_and_boost[-1][2])  # End at level 20
+
+    return tuple(range_and_boost)
+
+
 class Boosts:
     """Boosts-related functionality for Baldur's Gate 3 mods."""
     _mod: Mod
@@ -18,17 +35,16 @@ class Boosts:
 
     def by_level(self, boost_fn: (Callable[[int], str]), lastLevel: int = 20) -> list[str]:
         """Generate a list of boost values."""
-        self._mod.add(character_level_range)
-
-        range_and_boost = [(1, 1, boost_fn(1))]
+        return self.by_level_many([boost_fn], lastLevel)[0]
 
-        for level in range(1, lastLevel + 1):
-            boost = boost_fn(level)
-            if boost != range_and_boost[-1][2]:
-                range_and_boost.append((level, level, boost))
-            else:
-                range_and_boost[-1] = (range_and_boost[-1][0], level, boost)
-
-        range_and_boost[-1] = (range_and_boost[-1][0], 20, range_and_boost[-1][2])  # End at level 20
+    def by_level_many(self, boost_fns: list[Callable[[int], str]], lastLevel: int = 20) -> list[list[str]]:
+        """Generate a list of boost values for each boost function, compressing identical level series once."""
+        self._mod.add(character_level_range)
 
-        return [f"IF(CharacterLevelRange({first},{last})):{boost}" for first, last, boost in range_and_boost]
+        return [
+            [
+                f"IF(CharacterLevelRange({first},{last})):{boost}"
+                for first, last, boost in _level_ranges(tuple(boost_fn(level) for level in range(1, lastLevel + 1)))
+            ]
+            for boost_fn in boost_fns
+        ]
@@ -3,33 +3,63 @@
 LevelMapSeries operations for Baldur's Gate 3 mods.
 """
 
-from typing import Any
+import sys
+
+from collections.abc import Iterable
+from functools import cache
+from typing import Any, Self
+from modtools.lsx import Lsx
 from modtools.mod import Mod
 from modtools.lsx.game import LevelMapSeries
 
 from .scripts import character_level_range
 
-def level_map_ranges(level_map: LevelMapSeries) -> list[(int, int, Any)]:
-    """
-    Return a list of tuples containing the ranges and corresponding values from a LevelMapSeries
-    (first, last, value). The range is right-exclusive, [first, last).
-    """
+type LevelValues = tuple[Any, ...]  # Values indexed by level; index 0 is unused and always None
+
+_MAX_LEVEL = 20
+
+_LEVEL_MAP_LSX_PATHS = [
+    "Shared.pak/Public/Shared/Levelmaps/LevelMapValues.lsx",
+    "Shared.pak/Public/SharedDev/Levelmaps/LevelMapValues.lsx",
+    "GustavX.pak/Public/GustavX/Levelmaps/LevelMapValues.lsx",
+]
+
+
+def level_map_values(level_map: LevelMapSeries) -> LevelValues:
+    """Return the values of a LevelMapSeries, indexed by level."""
+    return (None, *(getattr(level_map, f"Level{i}", None) for i in range(1, _MAX_LEVEL + 1)))
+
+
+@cache
+def _ranges(values: LevelValues) -> tuple[tuple[int, int, Any], ...]:
     ranges = []
     first = 0
     value = None
 
-    for i in range(0, 21):
-        if (new_value := getattr(level_map, f"Level{i}", None)) is not None:
+    for i, new_value in enumerate(values):
+        if new_value is not None:
             if first != 0:
                 ranges.append((first, i, value))
             first = i
             value = new_value
     if first != 0:
-        ranges.append((first, 21, value))
+        ranges.append((first, len(values), value))
+
+    return tuple(ranges)
 
-    return ranges
 
-def level_map_ranges_format(mod: Mod, level_map: LevelMapSeries, template: str) -> list[str]:
+def level_map_ranges(level_map: LevelMapSeries | LevelValues) -> list[(int, int, Any)]:
+    """
+    Return a list of tuples containing the ranges and corresponding values from a LevelMapSeries
+    (first, last, value). The range is right-exclusive, [first, last).
+
+    The ranges are cached by the series' values, so series with the same values are only compressed once.
+    """
+    values = level_map_values(level_map) if isinstance(level_map, LevelMapSeries) else level_map
+    return list(_ranges(values))
+
+
+def level_map_ranges_format(mod: Mod, level_map: LevelMapSeries | LevelValues, template: str) -> list[str]:
     """
     For each range in a LevelMapSeries, generate a CharacterLevelRange combined with the template string formatted with
     the range's value.
@@ -40,3 +70,40 @@ def level_map_ranges_format(mod: Mod, level_map: LevelMapSeries, template: str)
     for (first, last, value) in level_map_ranges(level_map):
         formatted_values.append(f"IF(CharacterLevelRange({first},{last - 1})):{template.format(value)}")
     return formatted_values
+
+
+class LevelMapTable:
+    """A table of LevelMapSeries values, indexed by series name and level, with the values interned."""
+
+    _values: dict[str, LevelValues]  # Name -> values
+
+    def __init__(self, level_maps: Iterable[LevelMapSeries] = ()):
+        self._values = {}
+        for level_map in level_maps:
+            self._values[level_map.Name] = tuple(
+                sys.intern(value) if isinstance(value, str) else value for value in level_map_values(level_map)
+            )
+
+    @classmethod
+    def load(cls, mod: Mod) -> Self:
+        """Load the game's LevelMapSeries from the .pak cache; later files override earlier ones."""
+        return cls(level_map
+                   for lsx_path in _LEVEL_MAP_LSX_PATHS
+                   for level_map in Lsx.load(mod.get_cache_path(lsx_path)).children)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def __getitem__(self, name: str) -> LevelValues:
+        return self._values[name]
+
+    def names(self) -> list[str]:
+        return list(self._values)
+
+    def value(self, name: str, level: int) -> Any:
+        """Return the value of a series at a level, or None if the series does not set that level."""
+        return self._values[name][level]
+
+    def ranges(self, names: Iterable[str] | None = None) -> dict[str, list[(int, int, Any)]]:
+        """Return the ranges (see level_map_ranges) of the named series, or of every series if names is None."""
+        return {name: list(_ranges(self._values[name])) for name in (self._values if names is None else names)}
@@ -3,36 +3,69 @@
 Progression-related functions for Baldur's Gate 3 mods.
 """
 
-import re
+from collections.abc import Container, Mapping, Sequence
+from dataclasses import replace
+from modtools.lsx.game import (
+    ActionResource,
+    AddSpells,
+    Boost,
+    Progression,
+    Selectors,
+    format_boosts,
+    parse_boosts,
+    update_action_resources,
+)
 
-from collections.abc import Container
-from modtools.lsx.game import ActionResource, Progression, update_action_resources
+_MAX_LEVEL = 20
+_MAX_RESOURCE_LEVEL = 9
 
-# AddSpells(UUID[,a][,b][,c][,d])
-_ADD_SPELLS_REGEX = re.compile(r"AddSpells\(([^,)]+)(?:,([^,)]*))?(?:,([^,)]*))?(?:,([^,)]*))?(?:,([^,)]*))?\)")
 
+def level_deltas(totals: Mapping[int, Sequence[int]],
+                 max_resource_level: int = _MAX_RESOURCE_LEVEL) -> dict[int, list[int]]:
+    """
+    Convert a table of per-level resource totals into the per-level increases that progressions grant.
 
-def multiply_resources(progression: Progression,
+    totals -- level -> [total count for resource level 1, 2, ...]; missing levels and resource levels count as 0.
+    """
+    def total(level: int, resource_level: int) -> int:
+        counts = totals.get(level, [])
+        return counts[resource_level - 1] if resource_level <= len(counts) else 0
+
+    return {
+        level: [total(level, resource_level) - total(level - 1, resource_level)
+                for resource_level in range(1, max_resource_level + 1)]
+        for level in range(1, _MAX_LEVEL + 1)
+    }
+
+
+def multiply_resources(progression: Progression | list[Boost],
                        resources: Container[ActionResource],
                        multiplier: int) -> None:
-    """Increase class resources."""
-    if boosts := progression.Boosts:
-        progression.Boosts = update_action_resources(boosts, resources,
-                                                     lambda _resource, count, _level: count * multiplier)
+    """Increase class resources, either of a progression or in place in its parsed Boosts (see parse_boosts)."""
+    if isinstance(progression, Progression):
+        if boosts := parse_boosts(progression.Boosts):
+            if update_action_resources(boosts, resources, lambda _resource, count, _level: count * multiplier):
+                progression.Boosts = format_boosts(boosts)
+    else:
+        update_action_resources(progression, resources, lambda _resource, count, _level: count * multiplier)
 
 
 def spells_always_prepared(progression: Progression) -> bool:
-    """Ensure that spells gained with AddSpells() are AlwaysPrepared."""
+    """
+    Ensure that spells gained with AddSpells() are AlwaysPrepared, returning True if the progression has any AddSpells()
+    selectors, whether or not they were already AlwaysPrepared.
+    """
     was_updated = False
 
     if progression.Selectors:
-        selectors = []
-        for selector in progression.Selectors:
-            if match := _ADD_SPELLS_REGEX.match(selector):
-                args = match.groups("")
-                selector = f"AddSpells({args[0]},{args[1]},{args[2]},{args[3]},{args[4] or "AlwaysPrepared"})"
-                was_updated = True
-            selectors.append(selector)
-        progression.Selectors = selectors
+        selectors = Selectors(progression.Selectors)
+        edited = False
+        for add_spells in selectors.of_type(AddSpells):
+            was_updated = True
+            if not add_spells.prepare_type:
+                selectors.replace(add_spells, replace(add_spells, prepare_type="AlwaysPrepared"))
+                edited = True
+        if edited:
+            progression.Selectors = selectors.format()
 
     return was_updated
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Entry point of `python -m modtools`.
+"""
+
+import sys
+
+from modtools.serve import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Fingerprints of mod builds, so that a build whose inputs have not changed can be skipped.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+from collections.abc import Callable
+from typing import Any
+
+
+def _sha256(path: os.PathLike) -> str | None:
+    """Return the SHA-256 hash of a file's content, or None if the file does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _library_modules(script: str) -> dict[str, str]:
+    """Return the paths of the loaded modules from underneath the script's directory (moddb, modtools, ...), by name."""
+    root = os.path.dirname(script) + os.sep
+    modules = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path and name != "__main__":
+            path = os.path.abspath(path)
+            if path.startswith(root) and "site-packages" not in path:
+                modules[name] = path
+    return modules
+
+
+class BuildCache:
+    """
+    Records a fingerprint of each mod build: the hashes of the mod's script, the library modules that it imported, the
+    unpak cache files that it read through get_cache_path(), and its command line arguments and build options. A
+    build is current when its fingerprint matches the recorded one and its output files are unchanged.
+    """
+
+    _record_path: str                          # Where the fingerprint of the last build is kept
+    _inputs: dict[str, str | None]             # Pak path -> cached file path (None if missing), read by this build
+    _record: dict[str, Any] | None             # The fingerprint of the last build, once loaded
+    _hashes: dict[str, tuple[int, int, str]]   # File path -> (mtime, size, hash), to avoid rehashing unchanged files
+
+    def __init__(self, cache_dir: os.PathLike, folder: str):
+        self._record_path = os.path.join(cache_dir, "builds", f"{folder}.json")
+        self._inputs = {}
+        self._record = None
+        self._hashes = {}
+
+    def record_input(self, pak_path: str, file_path: os.PathLike | None) -> None:
+        """Record that the build read a file from the unpak cache (or found it missing, if file_path is None)."""
+        self._inputs[str(pak_path)] = None if file_path is None else str(file_path)
+
+    def _load(self) -> dict[str, Any]:
+        if self._record is None:
+            try:
+                with open(self._record_path, "r") as f:
+                    self._record = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._record = {}
+            self._hashes = {path: tuple(entry) for path, entry in self._record.get("hashes", {}).items()}
+        return self._record
+
+    def _hash(self, path: os.PathLike) -> str | None:
+        """Return the SHA-256 hash of a file, reusing the last hash if its modification time and size are unchanged."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if (entry := self._hashes.get(path)) is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+        digest = _sha256(path)
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _fingerprint(self,
+                     options: dict[str, Any],
+                     modules: dict[str, str],
+                     inputs: dict[str, str | None]) -> str:
+        script = os.path.abspath(sys.modules["__main__"].__file__)
+        fingerprint = {
+            "python": sys.version,
+            "script": [script, self._hash(script)],
+            "argv": sys.argv[1:],
+            "options": options,
+            "modules": {name: self._hash(path) for name, path in sorted(modules.items())},
+            "inputs": {pak_path: path and self._hash(path) for pak_path, path in sorted(inputs.items())},
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _outputs(self, output_dir: os.PathLike) -> dict[str, str]:
+        outputs = {}
+        for dir_path, _, filenames in os.walk(output_dir):
+            for filename in filenames:
+                path = os.path.join(dir_path, filename)
+                outputs[os.path.relpath(path, output_dir).replace(os.sep, "/")] = self._hash(path)
+        return outputs
+
+    def is_current(self,
+                   options: dict[str, Any],
+                   get_cache_path: Callable[[str], os.PathLike],
+                   output_dir: os.PathLike) -> bool:
+        """
+        Return True if the last build's fingerprint matches, and its output is unchanged. The inputs of the last build
+        that this build has not yet read are looked up again through get_cache_path.
+        """
+        record = self._load()
+        if "fingerprint" not in record or not os.path.isdir(output_dir):
+            return False
+
+        inputs = dict(self._inputs)
+        for pak_path in record["inputs"]:
+            if pak_path not in inputs:
+                try:
+                    inputs[pak_path] = str(get_cache_path(pak_path))
+                except FileNotFoundError:
+                    inputs[pak_path] = None
+
+        script = os.path.abspath(sys.modules["__main__"].__file__)
+        modules = record["modules"] | _library_modules(script)
+        return (self._fingerprint(options, modules, inputs) == record["fingerprint"]
+                and self._outputs(output_dir) == record["outputs"])
+
+    def save(self, options: dict[str, Any], output_dir: os.PathLike, *, touched: list[Any] | None = None) -> None:
+        """
+        Record the fingerprint of a completed build, and the hashes of its output.
+
+        touched -- the keys of the game table entries that the build added or overrode, for reporting the mods that a
+                   game patch affects; they are not part of the fingerprint
+        """
+        script = os.path.abspath(sys.modules["__main__"].__file__)
+        modules = _library_modules(script)
+        self._record = {
+            "fingerprint": self._fingerprint(options, modules, self._inputs),
+            "inputs": sorted(self._inputs),
+            "modules": modules,
+            "outputs": self._outputs(output_dir),
+            "touched": touched or [],
+        }
+        used = {script, *modules.values(), *filter(None, self._inputs.values()),
+                *(os.path.join(output_dir, *path.split("/")) for path in self._record["outputs"])}
+        self._record["hashes"] = {path: list(entry) for path, entry in self._hashes.items() if path in used}
+        self._write()
+
+    def save_touched(self, touched: list[Any]) -> None:
+        """
+        Record the keys of the game table entries that a build which is not fingerprinted (a dry run, a profiled
+        build, or a build to another output) touched, keeping the fingerprint of the last fingerprinted build.
+        """
+        self._load()["touched"] = touched
+        self._write()
+
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(self._record_path), exist_ok=True)
+        with open(self._record_path, "w") as f:
+            json.dump(self._record, f, indent=2)
+            f.write("\n")
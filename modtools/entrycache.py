@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+An in-memory cache of the decompressed entries of .pak packages.
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Final
+
+DEFAULT_MAX_SIZE: Final = 256 << 20  # The default byte budget of an EntryCache
+
+
+class EntryCache:
+    """
+    A least-recently-used cache of decompressed .pak entries, bounded by the total size of the entries that it holds.
+    When adding an entry would exceed the budget, the least recently used entries are evicted; an entry larger than
+    the whole budget is not cached at all.
+    """
+
+    max_size: int                              # The byte budget
+    hits: int                                  # The number of lookups that found their entry
+    misses: int                                # The number of lookups that did not
+    _size: int                                 # The total size of the cached entries
+    _entries: OrderedDict[Hashable, bytes]     # Key -> entry, least recently used first
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 0:
+            raise ValueError(f"{EntryCache.__qualname__}: max_size must not be negative, not {max_size}")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        """The total size of the cached entries, in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Return the cached entry, marking it as the most recently used, or None if it is not cached."""
+        if (data := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        """Cache an entry as the most recently used, evicting the least recently used entries to make room for it."""
+        if (previous := self._entries.pop(key, None)) is not None:
+            self._size -= len(previous)
+        if len(data) > self.max_size:
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove every entry, and reset the counters."""
+        self._entries.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        return (f"{len(self._entries)} entries, {self._size / (1 << 20):.1f} of {self.max_size / (1 << 20):.1f} MiB; "
+                f"{self.hits} hits, {self.misses} misses"
+                f"{f" ({self.hits / lookups:.0%} hit rate)" if lookups else ""}")
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Synthetic game data for benchmarks, written in the layout of the unpak cache.
+"""
+
+import os
+import random
+
+from collections.abc import Iterable
+from modtools.gamedata import GameData, PassiveData, SpellData, StatusData
+from modtools.lsx.document import LsxDocument
+from modtools.lsx.game import (
+    BASE_CHARACTER_CLASSES,
+    CharacterClass,
+    CharacterRace,
+    ClassDescription,
+    ClassDescriptions,
+    GameObjects,
+    Progression,
+    Progressions,
+    SpellList,
+    SpellLists,
+    Templates,
+)
+from pathlib import PurePath
+from typing import Final
+from uuid import UUID
+
+# The number of entries generated at scale 1, approximately the size of the game's own tables
+GAME_SIZES: Final[dict[str, int]] = {
+    "SpellData": 4000,
+    "PassiveData": 2500,
+    "StatusData": 3000,
+    "SpellList": 700,
+    "GameObjects": 6000,
+}
+
+# The .pak paths of the generated files, by load order layer
+PROGRESSIONS_PATHS: Final = [
+    "Shared.pak/Public/Shared/Progressions/Progressions.lsx",
+    "Shared.pak/Public/SharedDev/Progressions/Progressions.lsx",
+    "GustavX.pak/Public/GustavX/Progressions/Progressions.lsx",
+]
+SPELL_LISTS_PATHS: Final = [
+    "Shared.pak/Public/Shared/Lists/SpellLists.lsx",
+    "Shared.pak/Public/SharedDev/Lists/SpellLists.lsx",
+    "GustavX.pak/Public/GustavX/Lists/SpellLists.lsx",
+]
+CLASS_DESCRIPTIONS_PATHS: Final = [
+    "Shared.pak/Public/Shared/ClassDescriptions/ClassDescriptions.lsx",
+    "Shared.pak/Public/SharedDev/ClassDescriptions/ClassDescriptions.lsx",
+    "GustavX.pak/Public/GustavX/ClassDescriptions/ClassDescriptions.lsx",
+]
+ROOT_TEMPLATES_PATH: Final = "Shared.pak/Public/Shared/RootTemplates/_merged.lsf.lsx"
+STATS_DATA_DIR: Final = "Shared.pak/Public/Shared/Stats/Generated/Data"
+
+_XML_DECLARATION: Final = b"""<?xml version="1.0" encoding="UTF-8"?>\n"""
+
+_OVERRIDE_FRACTION: Final = 0.1  # The fraction of entries that the later layers override
+
+_ICONS: Final = ["Action_SneakAttack_Melee", "Action_Barbarian_MagicAwareness", "Item_CONT_GEN_Chest_Travel_A_Small_A",
+                 "PassiveFeature_RemarkableAthlete_Proficiency", "Spell_Evocation_MagicMissile"]
+_SPELL_SUCCESS: Final = [
+    "DealDamage(MainMeleeWeapon,MainMeleeWeaponDamageType);ExecuteWeaponFunctors(MainHand)",
+    "IF(not SavingThrow(Ability.Strength,ManeuverSaveDC())):ApplyStatus(DISARM,100,0);"
+    "DealDamage(MainMeleeWeapon,MainMeleeWeaponDamageType)",
+    "IF(Character() and not SavingThrow(Ability.Constitution,ManeuverSaveDC())):ApplyStatus(DAZED,100,2)",
+]
+_BOOSTS: Final = [
+    "Initiative(2);IF(CharacterLevelGreaterThan(4)):Initiative(1);StatusImmunity(SURPRISED)",
+    "ActionResource(Movement,3.0,0);JumpMaxDistanceBonus(1.5)",
+    "Advantage(Ability,Dexterity)",
+]
+
+
+class _Generator:
+    """Deterministic generation of synthetic entries."""
+
+    _random: random.Random
+    _scale: int
+
+    def __init__(self, scale: int, seed: int):
+        self._random = random.Random(seed)
+        self._scale = scale
+
+    def uuid(self) -> str:
+        return str(UUID(int=self._random.getrandbits(128), version=4))
+
+    def handle(self) -> str:
+        return f"h{self.uuid().replace("-", "g")}"
+
+    def choice[T](self, values: list[T]) -> T:
+        return self._random.choice(values)
+
+    def sample[T](self, values: list[T], low: int, high: int) -> list[T]:
+        return self._random.sample(values, min(len(values), self._random.randint(low, high)))
+
+    def overrides[T](self, values: list[T]) -> list[T]:
+        return [value for value in values if self._random.random() < _OVERRIDE_FRACTION]
+
+    def count(self, kind: str) -> int:
+        return GAME_SIZES[kind] * self._scale
+
+    def names(self, values: Iterable[str]) -> list[str]:
+        """Return the names repeated once per unit of scale, with a numeric suffix after the first copy."""
+        return [name if copy == 0 else f"{name}_{copy}" for copy in range(self._scale) for name in values]
+
+
+def synthetic_game_data(scale: int = 1, seed: int = 0) -> list[GameData]:
+    """Return synthetic spell, passive, and status entries."""
+    generator = _Generator(scale, seed)
+    statuses = [f"SYNTHETIC_STATUS_{i}" for i in range(generator.count("StatusData"))]
+    game_data: list[GameData] = []
+    for i in range(generator.count("SpellData")):
+        game_data.append(SpellData(
+            f"Target_Synthetic_{i}",
+            SpellType="Target",
+            using=f"Target_Synthetic_{i // 2}" if i % 2 else None,
+            DisplayName=generator.handle(),
+            Description=generator.handle(),
+            Icon=generator.choice(_ICONS),
+            SpellSuccess=generator.choice(_SPELL_SUCCESS) + f";ApplyStatus({generator.choice(statuses)},100,1)",
+            TargetConditions="(Character() or Item()) and not Self() and not Dead()",
+            TooltipDamageList="DealDamage(MainMeleeWeapon,MainMeleeWeaponDamageType)",
+            UseCosts="ActionPoint:1",
+        ))
+    for i in range(generator.count("PassiveData")):
+        game_data.append(PassiveData(
+            f"Synthetic_Passive_{i}",
+            Boosts=generator.choice(_BOOSTS),
+            DisplayName=generator.handle(),
+            Description=generator.handle(),
+            Icon=generator.choice(_ICONS),
+            Properties=["Highlighted"],
+        ))
+    for status in statuses:
+        game_data.append(StatusData(
+            status,
+            StatusType="BOOST",
+            DisplayName=generator.handle(),
+            Description=generator.handle(),
+            Icon=generator.choice(_ICONS),
+            Boosts=generator.choice(_BOOSTS),
+        ))
+    return game_data
+
+
+def _spell_lists(generator: _Generator, spells: list[str]) -> list[SpellList]:
+    return [
+        SpellList(Name=f"Synthetic Spell List {i}", Spells=generator.sample(spells, 4, 16), UUID=generator.uuid())
+        for i in range(generator.count("SpellList"))
+    ]
+
+
+def _class_descriptions(generator: _Generator,
+                        class_names: list[str],
+                        table_uuids: dict[str, str],
+                        spell_lists: list[SpellList]) -> list[ClassDescription]:
+    class_uuids = {name: generator.uuid() for name in class_names}
+    base_classes = [name for name in class_names if name.split("_")[0] in BASE_CHARACTER_CLASSES]
+    return [
+        ClassDescription(
+            BaseHp=10,
+            CanLearnSpells=True if i % 4 == 0 else None,
+            DisplayName=generator.handle(),
+            Description=generator.handle(),
+            HpPerLevel=6,
+            Name=name,
+            ParentGuid=None if name in base_classes else class_uuids[generator.choice(base_classes)],
+            PrimaryAbility=1 + i % 6,
+            ProgressionTableUUID=table_uuids[name],
+            SpellCastingAbility=1 + i % 6,
+            SpellList=generator.choice(spell_lists).UUID,
+            UUID=class_uuids[name],
+            children=[ClassDescription.Tags(Object=generator.uuid())],
+        )
+        for i, name in enumerate(class_names)
+    ]
+
+
+def _progressions(generator: _Generator,
+                  class_names: list[str],
+                  race_names: list[str],
+                  table_uuids: dict[str, str],
+                  spell_lists: list[SpellList],
+                  passives: list[str]) -> list[Progression]:
+    progressions = []
+    for name in class_names:
+        for level in range(1, 21):
+            for is_multiclass in ([False, True] if level == 1 else [False]):
+                progressions.append(Progression(
+                    AllowImprovement=True if level in (4, 8, 12, 16, 19) else None,
+                    Boosts=[f"ActionResource(SpellSlot,{1 + level % 3},{min(9, (level + 1) // 2)})"],
+                    IsMulticlass=True if is_multiclass else None,
+                    Level=level,
+                    Name=name,
+                    PassivesAdded=generator.sample(passives, 0, 3) or None,
+                    ProgressionType=0,
+                    Selectors=[f"SelectSpells({generator.choice(spell_lists).UUID},{1 + level % 2},0)"]
+                    if level % 2 else None,
+                    TableUUID=table_uuids[name],
+                    UUID=generator.uuid(),
+                ))
+    for name in race_names:
+        for level in range(1, 6):
+            progressions.append(Progression(
+                Level=level,
+                Name=name,
+                PassivesAdded=generator.sample(passives, 1, 3),
+                ProgressionType=2,
+                TableUUID=table_uuids[name],
+                UUID=generator.uuid(),
+            ))
+    return progressions
+
+
+def _write_lsx(unpak_dir: os.PathLike, pak_path: str, document: LsxDocument) -> None:
+    _write(unpak_dir, pak_path, _XML_DECLARATION + document.render(version=(4, 0, 9, 331)))
+
+
+def _write(unpak_dir: os.PathLike, pak_path: str, content: bytes) -> None:
+    path = fixture_path(unpak_dir, pak_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def fixture_path(unpak_dir: os.PathLike, pak_path: str) -> str:
+    """Return the path of a .pak file's entry in the unpak cache, e.g. Shared.pak/Public/... -> Shared/Public/..."""
+    pak_name, _, relative_path = str(PurePath(pak_path).as_posix()).partition("/")
+    return os.path.join(unpak_dir, pak_name.removesuffix(".pak"), relative_path)
+
+
+def write_fixtures(unpak_dir: os.PathLike, *, scale: int = 1, seed: int = 0) -> None:
+    """
+    Write synthetic Progressions, SpellLists, ClassDescriptions, RootTemplates, and Stats files into unpak_dir. The
+    Shared layer holds every entry; the SharedDev and GustavX layers override a fraction of them, and GustavX adds the
+    levels above 12.
+    """
+    generator = _Generator(scale, seed)
+    game_data = synthetic_game_data(scale, seed)
+    spells = [data.name for data in game_data if isinstance(data, SpellData)]
+    passives = [data.name for data in game_data if isinstance(data, PassiveData)]
+    class_names = generator.names(CharacterClass)
+    race_names = generator.names(CharacterRace)
+    table_uuids = {name: generator.uuid() for name in class_names + race_names}
+
+    spell_lists = _spell_lists(generator, spells)
+    class_descriptions = _class_descriptions(generator, class_names, table_uuids, spell_lists)
+    progressions = _progressions(generator, class_names, race_names, table_uuids, spell_lists, passives)
+
+    shared_progressions = [progression for progression in progressions if progression.Level <= 12]
+    _write_lsx(unpak_dir, PROGRESSIONS_PATHS[0], Progressions(*shared_progressions))
+    _write_lsx(unpak_dir, PROGRESSIONS_PATHS[1], Progressions(*generator.overrides(shared_progressions)))
+    _write_lsx(unpak_dir, PROGRESSIONS_PATHS[2], Progressions(
+        *generator.overrides(shared_progressions),
+        *(progression for progression in progressions if progression.Level > 12)))
+
+    for path, layer in zip(SPELL_LISTS_PATHS, [spell_lists, generator.overrides(spell_lists),
+                                               generator.overrides(spell_lists)]):
+        _write_lsx(unpak_dir, path, SpellLists(*layer))
+    for path, layer in zip(CLASS_DESCRIPTIONS_PATHS, [class_descriptions, generator.overrides(class_descriptions),
+                                                      generator.overrides(class_descriptions)]):
+        _write_lsx(unpak_dir, path, ClassDescriptions(*layer))
+
+    _write_lsx(unpak_dir, ROOT_TEMPLATES_PATH, Templates(*(
+        GameObjects(
+            DisplayName=generator.handle(),
+            Description=generator.handle(),
+            Icon=generator.choice(_ICONS),
+            LevelName="",
+            MapKey=generator.uuid(),
+            Name=f"Synthetic_Template_{i}",
+            ParentTemplateId=generator.uuid(),
+            Stats=f"Synthetic_Template_{i}",
+            Type="item",
+            children=[GameObjects.InventoryList(children=[
+                GameObjects.InventoryList.InventoryItem(Object=f"Synthetic_TreasureTable_{i}"),
+            ])] if i % 5 == 0 else None,
+        )
+        for i in range(generator.count("GameObjects"))
+    )))
+
+    for filename, data_type in [("Spell_Target.txt", SpellData), ("Passive.txt", PassiveData),
+                                ("Status_BOOST.txt", StatusData)]:
+        _write(unpak_dir, f"{STATS_DATA_DIR}/{filename}",
+               "\n".join(str(data) for data in game_data if isinstance(data, data_type)).encode("utf-8"))
+
+
+class FixtureUnpak:
+    """A stand-in for Unpak that resolves .pak paths to the files written by write_fixtures()."""
+
+    _unpak_dir: os.PathLike
+
+    def __init__(self, unpak_dir: os.PathLike):
+        self._unpak_dir = unpak_dir
+
+    def get_path(self, pak_path: str) -> os.PathLike:
+        """Return the path of a generated file, raising FileNotFoundError if there is none."""
+        path = fixture_path(self._unpak_dir, pak_path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(pak_path)
+        return path
+
+    def get_data(self, pak_path: str) -> bytes:
+        """Return the contents of a generated file, raising FileNotFoundError if there is none."""
+        with open(self.get_path(pak_path), "rb") as f:
+            return f.read()
@@ -8,6 +8,7 @@ from .armor import *
 from .character import *
 from .collection import *
 from .criticalhittypedata import *
+from .functors import *
 from .gamedata import *
 from .interruptdata import *
 from .objectdata import *
@@ -3,16 +3,27 @@
 A class representing a collection of GameData objects.
 """
 
+import modtools.gamedata.valuelists as VL
+import modtools.prologue as prologue
 import os
 
-from collections.abc import Mapping
+from collections.abc import Iterable, Iterator, Mapping
+from functools import partial
+from modtools.gamedata.functors import parse_condition, parse_functors
 from modtools.gamedata.gamedata import GameData
-from modtools.prologue import TXT_PROLOGUE
+from modtools.render import RenderTask, write_files
 
 
 class GameDataCollection:
     """A collection of GameData objects."""
 
+    _PARSERS = {
+        VL.Conditions: parse_condition,
+        VL.RollConditions: parse_condition,
+        VL.StatsFunctors: parse_functors,
+        VL.TargetConditions: parse_condition,
+    }
+
     _game_data: list[GameData]
 
     def __init__(self):
@@ -23,17 +34,67 @@ class GameDataCollection:
         assert isinstance(game_data, GameData)
         self._game_data.append(game_data)
 
+    def __iter__(self) -> Iterator[GameData]:
+        return iter(self._game_data)
+
+    def remove(self, game_data: Iterable[GameData]) -> None:
+        """Remove GameData from the collection."""
+        removed = {id(data) for data in game_data}
+        self._game_data = [data for data in self._game_data if id(data) not in removed]
+
     def build(self, mod_dir: os.PathLike, folder: str) -> None:
         """Build the mod files corresponding to our game data."""
+        os.makedirs(os.path.join(mod_dir, "Public", folder, "Stats", "Generated", "Data"), exist_ok=True)
+        write_files(mod_dir, self.render_tasks(folder))
+
+    def validate(self) -> None:
+        """Parse the functors and conditions of our game data, raising ValueError if any are invalid."""
+        for game_data in self._game_data:
+            for key, field_type in game_data._fields_.items():
+                if (parse := self._PARSERS.get(field_type)) and (values := getattr(game_data, key, None)):
+                    for value in values:
+                        try:
+                            parse(value)
+                        except ValueError as e:
+                            raise ValueError(f"{game_data.name}: {key.replace("_", " ")}: {e}") from None
+
+    def render_tasks(self, folder: str) -> list[RenderTask]:
+        """Return the tasks rendering the mod files corresponding to our game data, one per file."""
         file_data: Mapping[str, list[GameData]] = {}  # Filename -> [GameData]
 
         for game_data in self._game_data:
             file_data.setdefault(game_data.filename(), []).append(game_data)
 
-        data_dir = os.path.join(mod_dir, "Public", folder, "Stats", "Generated", "Data")
-        os.makedirs(data_dir, exist_ok=True)
+        return [
+            RenderTask(os.path.join("Public", folder, "Stats", "Generated", "Data", filename),
+                       prologue.TXT_PROLOGUE,
+                       _GameDataRender(game_data))
+            for filename, game_data in file_data.items()
+        ]
+
+
+class _GameDataRender:
+    """
+    Renders a Stats file, in this process or in a worker process. A worker is sent only the render states of the
+    file's game data.
+    """
+
+    _game_data: list[GameData]
+
+    def __init__(self, game_data: list[GameData]):
+        self._game_data = game_data
+
+    def __call__(self) -> str:
+        return _render_game_data(self._game_data)
+
+    def __reduce__(self) -> tuple[type[partial], tuple]:
+        """Pickle the task as a call of _render_game_data_states() with the game data's render states."""
+        return (partial, (_render_game_data_states, [data.render_state() for data in self._game_data]))
+
+
+def _render_game_data(game_data: list[GameData]) -> str:
+    return "\n".join(str(data) for data in game_data)
+
 
-        for filename, game_data in file_data.items():
-            with open(os.path.join(data_dir, filename), "w") as f:
-                f.write(TXT_PROLOGUE)
-                f.write("\n".join(str(data) for data in game_data))
+def _render_game_data_states(states: list[tuple[type[GameData], dict]]) -> str:
+    return _render_game_data([GameData.from_render_state(state) for state in states])
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Parsing of the Stats functor and condition mini-language, e.g.
+    TARGET:IF(not Player(context.Source) and HasStatus('BURNING')):ApplyStatus(SELF,WET,100,1)
+"""
+
+import re
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cache
+
+
+@dataclass(frozen=True, slots=True)
+class Identifier:
+    """A name or literal, e.g. SELF, context.Source, 100, 1d6 or 100%; empty for an omitted argument."""
+    value: str  # The name or literal, as written
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@dataclass(frozen=True, slots=True)
+class StringLiteral:
+    """A quoted string, e.g. 'BURNING'."""
+    value: str  # The string's content, excluding the quotes
+
+    def __str__(self) -> str:
+        return f"'{self.value}'"
+
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    """A table of values, e.g. {'SG_Disguise','SG_Polymorph'}."""
+    items: tuple["Expression", ...]  # The table's items
+
+    def __str__(self) -> str:
+        return f"{{{",".join(str(item) for item in self.items)}}}"
+
+
+@dataclass(frozen=True, slots=True)
+class Call:
+    """A function call, e.g. HasStatus('BURNING',context.Source)."""
+    name: str                       # The called function, e.g. HasStatus or context.HasContextFlag
+    args: tuple["Expression", ...]  # The call's arguments
+
+    def __str__(self) -> str:
+        return f"{self.name}({",".join(str(arg) for arg in self.args)})"
+
+
+@dataclass(frozen=True, slots=True)
+class UnaryOp:
+    """A unary operation, e.g. not Dead() or -1."""
+    op: str                # The operator: not, - or +
+    operand: "Expression"  # The operand
+
+    def __str__(self) -> str:
+        operand = _bracket(self.operand, _UNARY_PRECEDENCE[self.op])
+        return f"not {operand}" if self.op == "not" else f"{self.op}{operand}"
+
+
+@dataclass(frozen=True, slots=True)
+class BinaryOp:
+    """A binary operation, e.g. Ally() and not Dead()."""
+    op: str              # The operator: or, and, a comparison, or an arithmetic operator
+    left: "Expression"   # The left-hand operand
+    right: "Expression"  # The right-hand operand
+
+    def __str__(self) -> str:
+        precedence = _BINARY_PRECEDENCE[self.op]
+        left = _bracket(self.left, precedence)
+        right = _bracket(self.right, precedence + 1)
+        return f"{left} {self.op} {right}" if self.op in ("and", "or") else f"{left}{self.op}{right}"
+
+
+type Expression = Identifier | StringLiteral | Table | Call | UnaryOp | BinaryOp
+
+
+@dataclass(frozen=True, slots=True)
+class FunctorGroup:
+    """A named group of functors, e.g. Cast2[DealDamage(UnarmedDamage,Bludgeoning)]."""
+    name: str                        # The group's name, e.g. Cast2 or CastOffhand
+    functors: tuple["Functor", ...]  # The functors in the group
+
+    def __str__(self) -> str:
+        return f"{self.name}[{";".join(str(functor) for functor in self.functors)}]"
+
+
+@dataclass(frozen=True, slots=True)
+class Functor:
+    """A single functor, e.g. TARGET:IF(not Dead()):ApplyStatus(WET,100,1)."""
+    context: tuple[str, ...]             # The functor's context prefixes (e.g. AI_IGNORE, TARGET or GROUND), in order
+    condition: Expression | None         # The IF(...) condition, if any
+    action: Expression | FunctorGroup    # The action, e.g. ApplyStatus(WET,100,1)
+
+    def __str__(self) -> str:
+        s = "".join(f"{context}:" for context in self.context)
+        if self.condition is not None:
+            s += f"IF({self.condition}):"
+        return s + str(self.action)
+
+
+_BINARY_PRECEDENCE = {
+    "or": 1,
+    "and": 2,
+    "==": 4, "~=": 4, "!=": 4, "<": 4, "<=": 4, ">": 4, ">=": 4,
+    "+": 5, "-": 5,
+    "*": 6, "/": 6,
+}
+
+_UNARY_PRECEDENCE = {
+    "not": 3,
+    "-": 7,
+    "+": 7,
+}
+
+_TOKEN_REGEX = re.compile(r"\s*(?:(?P<word>[\w.]+%?)|'(?P<string>[^']*)'|(?P<op>==|~=|!=|<=|>=|[<>+\-*/(),:;\[\]{}]))")
+
+_INTERNED: dict[Expression | FunctorGroup | Functor, Expression | FunctorGroup | Functor] = {}
+
+
+def _intern[T: (Identifier, StringLiteral, Table, Call, UnaryOp, BinaryOp, FunctorGroup, Functor)](node: T) -> T:
+    """Return the canonical instance of an AST node, so that equal nodes are shared."""
+    return _INTERNED.setdefault(node, node)
+
+
+def _precedence(node: Expression) -> int:
+    match node:
+        case BinaryOp(op=op):
+            return _BINARY_PRECEDENCE[op]
+        case UnaryOp(op=op):
+            return _UNARY_PRECEDENCE[op]
+        case _:
+            return 8
+
+
+def _bracket(node: Expression, precedence: int) -> str:
+    return f"({node})" if _precedence(node) < precedence else str(node)
+
+
+class _Parser:
+    """A recursive descent parser for a single functor or condition string."""
+
+    _text: str
+    _tokens: list[tuple[str, str]]  # (kind, value)
+    _pos: int
+
+    def __init__(self, text: str):
+        self._text = text
+        self._tokens = []
+        self._pos = 0
+
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            if not (match := _TOKEN_REGEX.match(text, pos)):
+                raise ValueError(f"Unexpected character {text[pos:].lstrip()[:1]!r} in {self._text!r}")
+            self._tokens.append((match.lastgroup, match[match.lastgroup]))
+            pos = match.end()
+
+    def _peek(self, offset: int = 0) -> tuple[str | None, str | None]:
+        pos = self._pos + offset
+        return self._tokens[pos] if pos < len(self._tokens) else (None, None)
+
+    def _next(self) -> tuple[str | None, str | None]:
+        token = self._peek()
+        self._pos += 1
+        return token
+
+    def _error(self, expected: str) -> ValueError:
+        kind, value = self._peek()
+        found = repr(value) if kind is not None else "end of string"
+        return ValueError(f"Expected {expected}, found {found} in {self._text!r}")
+
+    def _expect(self, op: str) -> None:
+        if self._peek() != ("op", op):
+            raise self._error(repr(op))
+        self._pos += 1
+
+    def _accept_op(self, *ops: str) -> str | None:
+        kind, value = self._peek()
+        if (kind == "op" and value in ops) or (kind == "word" and value in ops):
+            self._pos += 1
+            return value
+        return None
+
+    def _end(self) -> None:
+        if self._pos != len(self._tokens):
+            raise self._error("end of string")
+
+    def functor(self) -> Functor:
+        functor = self._functor()
+        self._end()
+        return functor
+
+    def functors(self) -> tuple[Functor, ...]:
+        functors = self._functors((None, None))
+        self._end()
+        return functors
+
+    def _functors(self, end: tuple[str | None, str | None]) -> tuple[Functor, ...]:
+        """Parse a ;-separated list of functors, which may be empty, ending at the given token."""
+        functors = []
+        while True:
+            if self._peek() not in (end, ("op", ";")):
+                functors.append(self._functor())
+            if not self._accept_op(";"):
+                return tuple(functors)
+
+    def _functor(self) -> Functor:
+        context = []
+        condition = None
+
+        while (token := self._peek())[0] == "word" and token[1] != "IF" and self._peek(1) == ("op", ":"):
+            context.append(token[1])
+            self._pos += 2
+
+        if self._peek() == ("word", "IF") and self._peek(1) == ("op", "("):
+            self._pos += 2
+            condition = self.expression()
+            self._expect(")")
+            self._expect(":")
+
+        kind, value = self._peek()
+        if kind == "word" and self._peek(1) == ("op", "["):
+            self._pos += 2
+            functors = self._functors(("op", "]"))
+            self._expect("]")
+            action = _intern(FunctorGroup(value, functors))
+        else:
+            action = self.expression()
+
+        return _intern(Functor(tuple(context), condition, action))
+
+    def condition(self) -> Expression:
+        node = self.expression()
+        self._end()
+        return node
+
+    def expression(self, precedence: int = 1) -> Expression:
+        if precedence == _UNARY_PRECEDENCE["not"]:
+            if self._accept_op("not"):
+                return _intern(UnaryOp("not", self.expression(precedence)))
+            return self.expression(precedence + 1)
+
+        if precedence > max(_BINARY_PRECEDENCE.values()):
+            return self._unary()
+
+        left = self.expression(precedence + 1)
+        ops = [op for op, op_precedence in _BINARY_PRECEDENCE.items() if op_precedence == precedence]
+        while op := self._accept_op(*ops):
+            left = _intern(BinaryOp(op, left, self.expression(precedence + 1)))
+        return left
+
+    def _unary(self) -> Expression:
+        if op := self._accept_op("-", "+"):
+            return _intern(UnaryOp(op, self._unary()))
+        return self._primary()
+
+    def _argument(self) -> Expression:
+        """Parse a call argument, which may be omitted, e.g. ApplyStatus(FRIGHTENED,100,2,,,,not Dead())."""
+        if self._peek() in (("op", ","), ("op", ")")):
+            return _intern(Identifier(""))
+        return self.expression()
+
+    def _primary(self) -> Expression:
+        kind, value = self._next()
+        if kind == "string":
+            return _intern(StringLiteral(value))
+        if kind == "word" and value not in ("and", "or", "not"):
+            if self._accept_op("("):
+                args = []
+                if not self._accept_op(")"):
+                    args.append(self._argument())
+                    while self._accept_op(","):
+                        args.append(self._argument())
+                    self._expect(")")
+                return _intern(Call(value, tuple(args)))
+            return _intern(Identifier(value))
+        if (kind, value) == ("op", "{"):
+            items = []
+            if not self._accept_op("}"):
+                items.append(self.expression())
+                while self._accept_op(","):
+                    items.append(self.expression())
+                self._expect("}")
+            return _intern(Table(tuple(items)))
+        if (kind, value) == ("op", "("):
+            node = self.expression()
+            self._expect(")")
+            return node
+        self._pos -= 1
+        raise self._error("an expression")
+
+
+@cache
+def parse_functor(text: str) -> Functor:
+    """Parse a single functor, e.g. IF(not Dead()):ApplyStatus(WET,100,1), raising ValueError if it is invalid."""
+    return _Parser(text).functor()
+
+
+@cache
+def parse_functors(text: str) -> tuple[Functor, ...]:
+    """Parse ;-separated functors, e.g. DealDamage(1d6,Fire);GROUND:Ignite(), raising ValueError if any is invalid."""
+    return _Parser(text).functors()
+
+
+@cache
+def parse_condition(text: str) -> Expression:
+    """Parse a condition, e.g. Ally() and not Dead(), raising ValueError if it is invalid."""
+    return _Parser(text).condition()
+
+
+def iter_calls(node: Functor | FunctorGroup | Expression) -> Iterator[Call]:
+    """Yield every call within a parsed functor or condition, outermost first."""
+    match node:
+        case Functor(condition=condition, action=action):
+            if condition is not None:
+                yield from iter_calls(condition)
+            yield from iter_calls(action)
+        case FunctorGroup(functors=functors):
+            for functor in functors:
+                yield from iter_calls(functor)
+        case Call(args=args):
+            yield node
+            for arg in args:
+                yield from iter_calls(arg)
+        case Table(items=items):
+            for item in items:
+                yield from iter_calls(item)
+        case UnaryOp(operand=operand):
+            yield from iter_calls(operand)
+        case BinaryOp(left=left, right=right):
+            yield from iter_calls(left)
+            yield from iter_calls(right)
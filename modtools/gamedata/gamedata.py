@@ -7,7 +7,7 @@ import modtools.gamedata.valuelists as VL
 
 from abc import ABCMeta, abstractmethod
 from collections.abc import Callable, Set
-from typing import ClassVar
+from typing import Any, ClassVar, Self
 
 
 class GameData(metaclass=ABCMeta):
@@ -67,6 +67,22 @@ class GameData(metaclass=ABCMeta):
 
         return s
 
+    def render_state(self) -> tuple[type[Self], dict[str, Any]]:
+        """
+        Returns what rendering the game data needs, and nothing more: its type, name, using, and set fields. This is
+        what is sent to a worker process that renders the game data.
+        """
+        return (type(self), {key: value for key, value in self.__dict__.items()
+                             if value is not None or not key.startswith("_")})
+
+    @classmethod
+    def from_render_state(cls, state: tuple[type[Self], dict[str, Any]]) -> Self:
+        """Returns game data recreated from its render state."""
+        data_type, values = state
+        data = object.__new__(data_type)
+        data.__dict__.update(values)
+        return data
+
     @classmethod
     def _wrap_accessors(cls, member_name: str) -> tuple[Callable[[object], any],
                                                         Callable[[object, any], None]]:
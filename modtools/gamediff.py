@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Keyed differences between two snapshots of the game's tables, and the mods that a game patch affects.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from modtools.replacers.lsxpaths import (
+    class_description_lsx_paths,
+    origin_lsx_paths,
+    progression_lsx_paths,
+    spell_list_lsx_paths,
+)
+from pathlib import PurePath
+from typing import Final
+from xml.etree.ElementTree import Element, parse as xml_parse, tostring as xml_tostring
+
+type EntryKey = str | tuple[str | int | bool, ...]
+
+
+def _value(node: Element, id: str) -> str | None:
+    """Return the value of a node's attribute, or None if the node does not have the attribute."""
+    for attribute in node.iterfind("attribute"):
+        if attribute.get("id") == id:
+            return attribute.get("value")
+    return None
+
+
+def _by_uuid(node: Element) -> EntryKey:
+    return _value(node, "UUID")
+
+
+def _by_name_level(node: Element) -> EntryKey:
+    return (_value(node, "Name"), int(_value(node, "Level") or 0),
+            (_value(node, "IsMulticlass") or "false").lower() == "true")
+
+
+@dataclass
+class GameTable:
+    """A game table, merged from the layers of .lsx files that the game loads in order."""
+    name: str                                  # The table's name, e.g. "Progressions"
+    paths: list[str]                           # The .pak paths of the table's layers, in load order
+    key: Callable[[Element], EntryKey]         # Returns the key identifying a node across the layers
+
+
+GAME_TABLES: Final = (
+    GameTable("Progressions", progression_lsx_paths, _by_name_level),
+    GameTable("SpellLists", spell_list_lsx_paths, _by_uuid),
+    GameTable("ClassDescriptions", class_description_lsx_paths, _by_uuid),
+    GameTable("Origins", origin_lsx_paths, _by_uuid),
+)
+
+
+@dataclass
+class EntryChange:
+    """A table entry that a game patch added, removed, or changed."""
+    key: EntryKey                                          # The entry's key
+    name: str | None                                       # The entry's Name, if any
+    change: str                                            # "added", "removed", or "changed"
+    attributes: list[str] = field(default_factory=list)    # The changed attributes, and "children" if they changed
+
+
+@dataclass
+class TableChanges:
+    """The changes to a game table."""
+    table: GameTable
+    changed_paths: list[str]          # The .pak paths of the layers whose files changed
+    entries: list[EntryChange]        # The added, removed, and changed entries of the merged table
+
+
+def snapshot_path(snapshot_dir: os.PathLike, pak_path: str) -> str:
+    """Return the path of a .pak file's entry in a snapshot (or the unpak cache): <dir>/<pak name>/<path>."""
+    pak_name, _, relative_path = PurePath(pak_path).as_posix().partition("/")
+    return os.path.join(snapshot_dir, pak_name.removesuffix(".pak"), *relative_path.split("/"))
+
+
+def take_snapshot(unpak_dir: os.PathLike, snapshot_dir: os.PathLike, tables: Iterable[GameTable] = GAME_TABLES) -> int:
+    """Copy the tables' files from the unpak cache into a snapshot, returning the number of files copied."""
+    count = 0
+    for table in tables:
+        for pak_path in table.paths:
+            if os.path.exists(source := snapshot_path(unpak_dir, pak_path)):
+                os.makedirs(os.path.dirname(target := snapshot_path(snapshot_dir, pak_path)), exist_ok=True)
+                shutil.copy2(source, target)
+                count += 1
+    return count
+
+
+def _file_hash(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _load_table(snapshot_dir: os.PathLike, table: GameTable) -> dict[EntryKey, Element]:
+    """Return the table's entries, merged from its layers, by key."""
+    entries: dict[EntryKey, Element] = {}
+    for pak_path in table.paths:
+        if os.path.exists(path := snapshot_path(snapshot_dir, pak_path)):
+            children = xml_parse(path).getroot().find("region/node/children")
+            for node in children.iterfind("node") if children is not None else ():
+                entries[table.key(node)] = node
+    return entries
+
+
+def _node_hash(node: Element) -> bytes:
+    return hashlib.blake2b(xml_tostring(node), digest_size=16).digest()
+
+
+def _changed_attributes(old: Element, new: Element) -> list[str]:
+    old_values = {attribute.get("id"): attribute.attrib for attribute in old.iterfind("attribute")}
+    new_values = {attribute.get("id"): attribute.attrib for attribute in new.iterfind("attribute")}
+    changed = sorted(id for id in old_values.keys() | new_values.keys() if old_values.get(id) != new_values.get(id))
+    old_children, new_children = old.find("children"), new.find("children")
+    if (old_children is None) != (new_children is None) or (
+            old_children is not None and _node_hash(old_children) != _node_hash(new_children)):
+        changed.append("children")
+    return changed
+
+
+def diff_table(old_dir: os.PathLike, new_dir: os.PathLike, table: GameTable) -> TableChanges:
+    """
+    Return the changes to a table between two snapshots. The table is only parsed if one of its layers' files
+    changed, and only the entries whose hashes differ are compared attribute by attribute.
+    """
+    changed_paths = [pak_path for pak_path in table.paths
+                     if _file_hash(snapshot_path(old_dir, pak_path)) != _file_hash(snapshot_path(new_dir, pak_path))]
+    if not changed_paths:
+        return TableChanges(table, [], [])
+
+    old_entries = _load_table(old_dir, table)
+    new_entries = _load_table(new_dir, table)
+    entries = []
+    for key in old_entries.keys() - new_entries.keys():
+        entries.append(EntryChange(key, _value(old_entries[key], "Name"), "removed"))
+    for key in new_entries.keys() - old_entries.keys():
+        entries.append(EntryChange(key, _value(new_entries[key], "Name"), "added"))
+    for key in old_entries.keys() & new_entries.keys():
+        old, new = old_entries[key], new_entries[key]
+        if old is not new and _node_hash(old) != _node_hash(new):
+            entries.append(EntryChange(key, _value(new, "Name"), "changed", _changed_attributes(old, new)))
+    entries.sort(key=lambda entry: (str(entry.name), str(entry.key)))
+    return TableChanges(table, changed_paths, entries)
+
+
+def affected_mods(builds_dir: os.PathLike, changes: Iterable[TableChanges]) -> dict[str, list[str]]:
+    """
+    Return the mods whose last build of any kind (as recorded by the build cache) added, overrode, or referred to any of
+    the changed entries, together with the changed entries that each touched.
+    """
+    changed = {entry.key: f"{table_changes.table.name} {f"{entry.name} " if entry.name else ""}{entry.key}"
+               for table_changes in changes for entry in table_changes.entries}
+    mods = {}
+    if os.path.isdir(builds_dir):
+        for filename in sorted(os.listdir(builds_dir)):
+            if filename.endswith(".json"):
+                with open(os.path.join(builds_dir, filename), "r") as f:
+                    touched = {tuple(key) if isinstance(key, list) else key for key in json.load(f).get("touched", [])}
+                if entries := sorted(changed[key] for key in touched & changed.keys()):
+                    mods[filename.removesuffix(".json")] = entries
+    return mods
+
+
+def format_changes(changes: Iterable[TableChanges], mods: dict[str, list[str]], *, verbose: bool = False) -> str:
+    """Return a report of the changes to the tables, and of the mods that they affect."""
+    lines = []
+    for table_changes in changes:
+        if not table_changes.changed_paths:
+            lines.append(f"{table_changes.table.name}: unchanged")
+            continue
+        counts = {change: sum(1 for entry in table_changes.entries if entry.change == change)
+                  for change in ("added", "removed", "changed")}
+        lines.append(f"{table_changes.table.name}: {", ".join(f"{n} {change}" for change, n in counts.items())}")
+        if verbose:
+            for entry in table_changes.entries:
+                attributes = f" ({", ".join(entry.attributes)})" if entry.attributes else ""
+                lines.append(f"    {entry.change} {entry.name or ""} {entry.key}{attributes}")
+    if mods:
+        lines.append("Affected mods:")
+        for mod, entries in mods.items():
+            lines.append(f"    {mod}: {", ".join(entries)}")
+    else:
+        lines.append("No recorded mod builds touch the changed entries")
+    return "\n".join(lines)
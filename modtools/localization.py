@@ -4,10 +4,13 @@ Localization for Baldur's Gate 3 mods.
 """
 
 import hashlib
+import modtools.prologue as prologue
 import os
 import re
 
-from modtools.prologue import XML_PROLOGUE
+from functools import partial
+from io import BytesIO
+from modtools.render import RenderTask, write_files
 from uuid import UUID
 
 import xml.etree.ElementTree as ElementTree
@@ -84,14 +87,24 @@ class Localization:
 
     def build(self, mod_dir: str) -> None:
         """Build the localization files in the given mod_dir."""
-        for short_lang_name, full_lang_name in self.__languages.items():
-            content_list = ElementTree.Element("contentList")
-            for _, translation in self.__translations.items():
-                translation.add_content(content_list, short_lang_name)
-            language_dir = os.path.join(mod_dir, "Localization", full_lang_name)
-            os.makedirs(language_dir, exist_ok=True)
-            with open(os.path.join(language_dir, f"{full_lang_name}.loca.xml"), "wb") as f:
-                f.write(XML_PROLOGUE)
-                xml_document = ElementTree.ElementTree(content_list)
-                ElementTree.indent(xml_document, space=" "*4)
-                xml_document.write(f, encoding="UTF-8", xml_declaration=False)
+        write_files(mod_dir, self.render_tasks())
+
+    def render_tasks(self) -> list[RenderTask]:
+        """Return the tasks rendering the localization files, one per language."""
+        return [
+            RenderTask(os.path.join("Localization", full_lang_name, f"{full_lang_name}.loca.xml"),
+                       prologue.XML_PROLOGUE,
+                       partial(self.render, short_lang_name))
+            for short_lang_name, full_lang_name in self.__languages.items()
+        ]
+
+    def render(self, short_lang_name: str) -> bytes:
+        """Returns the indented XML for a language's localization file, excluding the prologue."""
+        content_list = ElementTree.Element("contentList")
+        for _, translation in self.__translations.items():
+            translation.add_content(content_list, short_lang_name)
+        xml_document = ElementTree.ElementTree(content_list)
+        ElementTree.indent(xml_document, space=" "*4)
+        f = BytesIO()
+        xml_document.write(f, encoding="UTF-8", xml_declaration=False)
+        return f.getvalue()
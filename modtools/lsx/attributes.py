@@ -4,31 +4,128 @@ Classes representing .lsx attributes.
 """
 
 from abc import abstractmethod
-from ast import literal_eval
 from collections.abc import Callable
+from functools import lru_cache
 from numbers import Number
+from uuid import UUID
 from xml.etree.ElementTree import Element
 
+# The (minimum, maximum) values of the .lsx integer types.
+_INT_RANGES: dict[str, tuple[int, int]] = {
+    "int8": (-2**7, 2**7 - 1),
+    "uint8": (0, 2**8 - 1),
+    "int16": (-2**15, 2**15 - 1),
+    "uint16": (0, 2**16 - 1),
+    "int32": (-2**31, 2**31 - 1),
+    "uint32": (0, 2**32 - 1),
+    "int64": (-2**63, 2**63 - 1),
+    "old_int64": (-2**63, 2**63 - 1),
+    "uint64": (0, 2**64 - 1),
+}
+
+# The .lsx spellings of Boolean values.
+_BOOL_VALUES: dict[str, bool] = {
+    "true": True,
+    "false": False,
+}
+
+_PARSE_CACHE_SIZE = 1024  # The number of distinct literals cached by each parser.
+
+# The .lsx types whose values are tokens that repeat across the game's files (names, UUIDs, and lists of them).
+_INTERNED_TYPES: frozenset[str] = frozenset(["FixedString", "LSString", "guid"])
+
+# The pool of token values loaded during the session, so that each distinct value is held in a single str. Equal pooled
+# values are the same object, so they compare by identity, and their hashes are only computed once.
+_interned: dict[str, str] = {}
+
+
+def intern_value(value: str) -> str:
+    """Return the pooled str equal to value, adding value to the pool if it is not already there."""
+    return _interned.setdefault(value, value)
+
+
+def clear_interned() -> None:
+    """Empty the pool of interned values. Values that are still referenced are unaffected."""
+    _interned.clear()
+
+
+def _make_number_parser(type_name: str) -> Callable[[str], Number]:
+    """Return a cached parser for .lsx numeric literals of the given type."""
+    if type_name in ("float", "double"):
+        @lru_cache(maxsize=_PARSE_CACHE_SIZE)
+        def parse_float(value: str) -> Number:
+            try:
+                return int(value)  # Integral values are kept as int, so that they are re-encoded unchanged
+            except ValueError:
+                return float(value)
+
+        return parse_float
+
+    minimum, maximum = _INT_RANGES[type_name]
+
+    @lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def parse_int(value: str) -> int:
+        number = int(value)
+        if not minimum <= number <= maximum:
+            raise ValueError(f"{value} is out of range for {type_name}")
+        return number
+
+    return parse_int
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_bool(value: str) -> bool:
+    """Parse an .lsx Boolean literal."""
+    if (result := _BOOL_VALUES.get(value.lower())) is not None:
+        return result
+    return bool(int(value))
+
 
 class LsxAttribute:
     """An abstract class representing an .lsx attribute."""
 
     _python_type: str  # The attribute's Python type name
     _type_name: str    # The attribute's .lsx 'type' XML attribute
+    _interned: bool    # True if the attribute's loaded values are interned
 
     def __init__(self, python_type: str, type_name: str):
         self._python_type = python_type
         self._type_name = type_name
+        self._interned = type_name in _INTERNED_TYPES
+
+    def intern(self, raw: str | tuple[str, str]) -> str | tuple[str, str]:
+        """Returns the undecoded .lsx value to keep for a loaded attribute: the pooled str, if its type is interned."""
+        return _interned.setdefault(raw, raw) if self._interned and isinstance(raw, str) else raw
 
     @abstractmethod
+    def decode(self, value: any) -> any:
+        """Returns the attribute's Python value for the given .lsx value, or assigned value."""
+        pass
+
+    @abstractmethod
+    def encode(self, value: any) -> str | tuple[str, str]:
+        """Returns the .lsx value for the given Python value."""
+        pass
+
     def xml(self, id: str, value: any) -> Element:
         """Returns an XML encoding of the attribute."""
-        pass
+        return self.raw_xml(id, self.encode(value))
+
+    def raw_xml(self, id: str, raw: str | tuple[str, str]) -> Element:
+        """Returns an XML encoding of the attribute from its undecoded .lsx value."""
+        return Element("attribute", id=id, type=self._type_name, value=raw)
+
+    def _share_store(self, store: dict) -> dict:
+        """Returns a value store that a cloned node may share with the node that it was cloned from."""
+        return store
 
     @abstractmethod
     def _wrap_accessors(self, member: str) -> tuple[Callable[[object], any],
                                                     Callable[[object, any], None]]:
-        """Returns the get and set accessors for the LsxAttribute."""
+        """
+        Returns the get and set accessors for the LsxAttribute. Setters replace the member's value store rather than
+        modifying it, so that stores may be shared between cloned nodes.
+        """
         pass
 
 
@@ -38,8 +135,13 @@ class LsxBool(LsxAttribute):
     def __init__(self, type_name: str):
         super().__init__("bool", type_name)
 
-    def xml(self, id: str, value: bool) -> Element:
-        return Element("attribute", id=id, type=self._type_name, value=str(value).lower())
+    def decode(self, value: bool | str | None) -> bool | None:
+        if isinstance(value, str):
+            value = _parse_bool(value)
+        return bool(value) if value is not None else None
+
+    def encode(self, value: bool) -> str:
+        return str(value).lower()
 
     def _wrap_accessors(self, member: str) -> tuple[Callable[[object], any],
                                                     Callable[[object, any], None]]:
@@ -48,10 +150,7 @@ class LsxBool(LsxAttribute):
             return store.get("bool")
 
         def setter(obj: object, value: bool | None) -> None:
-            store: dict = obj.__dict__.setdefault(member, {})
-            if isinstance(value, str):
-                value = literal_eval(value.title())
-            store["bool"] = bool(value) if value is not None else None
+            obj.__dict__[member] = {"bool": self.decode(value)}
 
         return (getter, setter)
 
@@ -67,8 +166,20 @@ class LsxList(LsxAttribute):
         super().__init__("list[str]", type_name)
         self._separator = separator
 
-    def xml(self, id: str, value: list) -> Element:
-        return Element("attribute", id=id, type=self._type_name, value=self._separator.join(value))
+    def decode(self, values: list[str] | str | None) -> list[str] | None:
+        if values is not None:
+            if not isinstance(values, LsxList.LIST_TYPES):
+                values = [intern_value(x) for x in str(values).split(self._separator) if x]
+            else:
+                values = [str(x) for x in values]
+        return values
+
+    def encode(self, values: list[str]) -> str:
+        return self._separator.join(values)
+
+    def _share_store(self, store: dict) -> dict:
+        # Lists are commonly modified in place (progression.Boosts += [...]), so each clone needs its own list.
+        return {"list": list(values)} if (values := store.get("list")) is not None else store
 
     def _wrap_accessors(self, member: str) -> tuple[Callable[[object], any],
                                                     Callable[[object, any], None]]:
@@ -77,13 +188,7 @@ class LsxList(LsxAttribute):
             return store.get("list")
 
         def setter(obj: object, values: list[str] | None) -> None:
-            if values is not None:
-                if not isinstance(values, LsxList.LIST_TYPES):
-                    values = [x for x in str(values).split(self._separator) if x]
-                else:
-                    values = [str(x) for x in values]
-            store: dict = obj.__dict__.setdefault(member, {})
-            store["list"] = values
+            obj.__dict__[member] = {"list": self.decode(values)}
 
         return (getter, setter)
 
@@ -91,11 +196,17 @@ class LsxList(LsxAttribute):
 class LsxNumber(LsxAttribute):
     """An attribute subclass representing a Number."""
 
+    _parse: Callable[[str], Number]  # The parser for string values of the attribute's type.
+
     def __init__(self, type_name: str):
         super().__init__("float" if type_name in ("float", "double") else "int", type_name)
+        self._parse = _make_number_parser(type_name)
+
+    def decode(self, value: Number | str | None) -> Number | None:
+        return self._parse(value) if isinstance(value, str) else value
 
-    def xml(self, id: str, value: Number) -> Element:
-        return Element("attribute", id=id, type=self._type_name, value=str(value))
+    def encode(self, value: Number) -> str:
+        return str(value)
 
     def _wrap_accessors(self, member: str) -> tuple[Callable[[object], any],
                                                     Callable[[object, any], None]]:
@@ -104,10 +215,7 @@ class LsxNumber(LsxAttribute):
             return store.get("number")
 
         def setter(obj: object, value: Number | None) -> None:
-            store: dict = obj.__dict__.setdefault(member, {})
-            if isinstance(value, str):
-                value = literal_eval(value)
-            store["number"] = value if value is not None else None
+            obj.__dict__[member] = {"number": self.decode(value)}
 
         return (getter, setter)
 
@@ -118,8 +226,11 @@ class LsxString(LsxAttribute):
     def __init__(self, type_name: str):
         super().__init__("str", type_name)
 
-    def xml(self, id: str, value: str) -> Element:
-        return Element("attribute", id=id, type=self._type_name, value=value)
+    def decode(self, value: str | None) -> str | None:
+        return str(value) if value is not None else None
+
+    def encode(self, value: str) -> str:
+        return value
 
     def _wrap_accessors(self, member: str) -> tuple[Callable[[object], any],
                                                     Callable[[object, any], None]]:
@@ -128,35 +239,58 @@ class LsxString(LsxAttribute):
             return store.get("str")
 
         def setter(obj: object, value: str | None) -> None:
-            store: dict = obj.__dict__.setdefault(member, {})
-            store["str"] = str(value) if value is not None else None
+            obj.__dict__[member] = {"str": self.decode(value)}
 
         return (getter, setter)
 
 
+class LsxGuid(LsxString):
+    """
+    An attribute subclass representing a GUID. Values are kept as canonical strings, which are interned when loaded;
+    an int, such as UUID.int, may also be assigned, and the 128-bit int of a value is available through to_int().
+    """
+
+    def decode(self, value: str | int | UUID | None) -> str | None:
+        if isinstance(value, int):
+            return intern_value(str(UUID(int=value)))
+        return str(value) if value is not None else None
+
+    @staticmethod
+    @lru_cache(maxsize=_PARSE_CACHE_SIZE)
+    def to_int(value: str) -> int:
+        """Returns the 128-bit int of a GUID string, for use as a compact key."""
+        return UUID(value).int
+
+
 class LsxTranslation(LsxAttribute):
     """An attribute subclass representing a translated string."""
 
     def __init__(self, type_name: str):
         super().__init__("tuple[str, int] | str", type_name)
 
-    def xml(self, id: str, value: tuple[str, int]) -> Element:
+    def decode(self, value: str | tuple[str, int | str] | None) -> tuple[str, int] | None:
+        if not isinstance(value, tuple):
+            value = (value, 1)
+        handle, version = value
+        return (str(handle), int(version)) if handle is not None else None
+
+    def encode(self, value: tuple[str, int]) -> tuple[str, str]:
         handle, version = value
-        return Element("attribute", id=id, type=self._type_name, handle=handle, version=str(version))
+        return (handle, str(version))
+
+    def raw_xml(self, id: str, raw: str | tuple[str, str]) -> Element:
+        if isinstance(raw, str):
+            return super().raw_xml(id, raw)
+        handle, version = raw
+        return Element("attribute", id=id, type=self._type_name, handle=handle, version=version)
 
     def _wrap_accessors(self, member: str) -> tuple[Callable[[object], any],
                                                     Callable[[object, any], None]]:
         def getter(obj: object) -> tuple[str, int] | None:
             store: dict = obj.__dict__.setdefault(member, {})
-            handle = store.get("handle")
-            return (handle, store.get("version")) if handle is not None else None
+            return store.get("translation")
 
         def setter(obj: object, value: str | tuple[str, int] | None) -> None:
-            store: dict = obj.__dict__.setdefault(member, {})
-            if not isinstance(value, tuple):
-                value = (value, 1)
-            handle, version = value
-            store["handle"] = str(handle) if handle is not None else None
-            store["version"] = int(version)
+            obj.__dict__[member] = {"translation": self.decode(value)}
 
         return (getter, setter)
@@ -16,6 +16,7 @@ class LsxChildren[Node]:
 
     _types: tuple[type[Node], ...]  # The child types that the collection can contain.
     _children: list[Node]           # The list of children.
+    _shared: bool                   # True if _children is shared with another collection, and must be copied on write.
 
     def __init__(self, children: Iterable[Node] = None, *, types: Iterable[Node]):
         """Initialize the collection, setting the expected child types and, optionally, the children."""
@@ -24,6 +25,7 @@ class LsxChildren[Node]:
         self._types = tuple(types)
         self._check_child_types([type(child) for child in children])
         self._children = list(children)
+        self._shared = False
 
     @property
     def types(self) -> tuple[type[Node], ...]:
@@ -37,7 +39,7 @@ class LsxChildren[Node]:
 
     def __setitem__(self, index: int, child: Node) -> None:
         self._check_child_types((type(child),))
-        self._children[index] = child
+        self._writable()[index] = child
 
     def __iter__(self) -> Iterable[Node]:
         return iter(self._children)
@@ -50,27 +52,29 @@ class LsxChildren[Node]:
 
     def append(self, child: Node) -> Self:
         self._check_child_types((type(child),))
-        self._children.append(child)
+        self._writable().append(child)
         return self
 
     def clear(self) -> Self:
-        self._children.clear()
+        self._children = []
+        self._shared = False
         return self
 
     def extend(self, children: Iterable[Node]) -> Self:
         self._check_child_types([type(child) for child in children])
-        self._children.extend(children)
+        self._writable().extend(children)
         return self
 
     def sort(self, *, key: KeyFunction) -> Self:
         """Sort the collection by the key."""
-        self._children.sort(key=key)
+        self._writable().sort(key=key)
 
     def unique(self, *, key: KeyFunction) -> Self:
         """
         Remove duplicates from the collection by replacing earlier entries with later entries that have the same key.
         """
         self._children = list({key(child): child for child in self._children}.values())
+        self._shared = False
         return self
 
     def update(self, children: Iterable[Node], *, key: KeyFunction) -> Self:
@@ -83,6 +87,7 @@ class LsxChildren[Node]:
         rhs = {key(child): child for child in children}
         lhs.update(rhs)
         self._children = list(lhs.values())
+        self._shared = False
         return self
 
     def copy(self, *, predicate: Predicate | None = None) -> Self:
@@ -90,6 +95,16 @@ class LsxChildren[Node]:
         return LsxChildren(list(filter(predicate, self._children) if predicate else self._children),
                            types=self._types)
 
+    def share(self) -> Self:
+        """
+        Create a copy of this collection that shares its list of children until either collection is modified. The
+        children themselves are shared; replace, rather than modify, a child to keep the collections independent.
+        """
+        shared = LsxChildren(types=self._types)
+        shared._children = self._children
+        shared._shared = self._shared = True
+        return shared
+
     def find(self, predicate: Predicate) -> Node | None:
         """Return the first child that matches the 'predicate', or None if there is no match."""
         try:
@@ -108,26 +123,31 @@ class LsxChildren[Node]:
     def keepall(self, predicate: Predicate) -> Self:
         """Keep only those children matching the 'predicate'."""
         self._children = [child for child in self._children if predicate(child)]
+        self._shared = False
         return self
 
     def removeall(self, predicate: Predicate) -> Self:
         """Remove all children matching the 'predicate'."""
         self._children = [child for child in self._children if not predicate(child)]
+        self._shared = False
         return self
 
     def load(self, children_node: Element) -> None:
         """Load the children from the given XML <children> node."""
-        self._children.clear()
-
-        for node in children_node.findall("node"):
-            child_name = node.get("id")
-            try:
-                child_type: type[Node] = next(child_type for child_type in self._types if child_type._id_ == child_name)
-            except StopIteration:
-                raise TypeError(f"{LsxChildren.load.__qualname__} unsupported node id='{child_name}'")
-            child = child_type()
-            child.load(node)
-            self._children.append(child)
+        self.clear()
+
+        for node in children_node.iterfind("node"):
+            self._load_child(node.get("id")).load(node)
+
+    def _load_child(self, child_name: str) -> Node:
+        """Append a new, empty child of the type with the given node id, for loading, returning the child."""
+        try:
+            child_type: type[Node] = next(child_type for child_type in self._types if child_type._id_ == child_name)
+        except StopIteration:
+            raise TypeError(f"{LsxChildren.load.__qualname__} unsupported node id='{child_name}'")
+        child = child_type()
+        self._children.append(child)
+        return child
 
     def xml(self) -> Element:
         """Returns an XML encoding of the children."""
@@ -136,6 +156,13 @@ class LsxChildren[Node]:
             element.append(child.xml())
         return element
 
+    def _writable(self) -> list[Node]:
+        """Return the list of children for modification, copying it first if it is shared."""
+        if self._shared:
+            self._children = list(self._children)
+            self._shared = False
+        return self._children
+
     def _check_child_types(self, children: Iterable[type[Node]]) -> None:
         invalid_types = [t.__name__ for t in filter(lambda t: not issubclass(t, self._types), children)]
         if len(invalid_types) > 0:
@@ -3,12 +3,16 @@
 Representation of .lsx documents.
 """
 
+import modtools.prologue as prologue
 import os
 
 from collections.abc import Callable
+from functools import partial
+from io import BytesIO
 from modtools.lsx.children import LsxChildren
-from modtools.lsx.node import LsxNode
-from modtools.prologue import XML_PROLOGUE
+from modtools.lsx.lsf import encode_lsf, lsf_path
+from modtools.lsx.node import LsxNode, RenderState
+from modtools.render import RenderTask, write_files
 from xml.etree.ElementTree import Element, ElementTree, indent as xml_indent, SubElement
 
 
@@ -53,15 +57,36 @@ class LsxDocument:
 
     def save(self, mod_path: os.PathLike, *,
              version: tuple[int, int, int, int] | None = None,
+             binary: bool = False,
              **kwds: str) -> None:
-        """Save the document to the path identified by the document's 'path' property."""
-        path = os.path.normpath(os.path.join(mod_path, self.path.format(**kwds)))
+        """Save the document to the path identified by the document's 'path' property.
+
+        binary -- if True, save the document as binary .lsf, replacing the path's .lsx extension with .lsf; .lsf names
+                  the root node after the region, so the document's root <node> id is not preserved
+        """
+        write_files(mod_path, [self.render_task(version=version, binary=binary, **kwds)])
+
+    def render_task(self, *,
+                    version: tuple[int, int, int, int] | None = None,
+                    binary: bool = False,
+                    **kwds: str) -> RenderTask:
+        """Return the task rendering the document to the path identified by the document's 'path' property."""
+        path = os.path.normpath(self.path.format(**kwds))
+        if binary:
+            return RenderTask(lsf_path(path), b"", _DocumentRender(self, "render_lsf", version))
+        return RenderTask(path, prologue.XML_PROLOGUE, _DocumentRender(self, "render", version))
+
+    def render(self, *, version: tuple[int, int, int, int] | None = None) -> bytes:
+        """Returns the document's indented XML, excluding the prologue."""
         document = ElementTree(self.xml(version=version))
         xml_indent(document, space=" "*4)
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "wb") as f:
-            f.write(XML_PROLOGUE)
-            document.write(f, encoding="UTF-8", xml_declaration=False)
+        f = BytesIO()
+        document.write(f, encoding="UTF-8", xml_declaration=False)
+        return f.getvalue()
+
+    def render_lsf(self, *, version: tuple[int, int, int, int] | None = None) -> bytes:
+        """Returns the document's binary .lsf encoding."""
+        return encode_lsf(self.xml(version=version))
 
     def xml(self, *, version: tuple[int, int, int, int] | None = None) -> Element:
         """Returns an XML encoding of the document."""
@@ -83,3 +108,36 @@ class LsxDocument:
         def getter(obj: object) -> str:
             return getattr(obj, member)
         return getter
+
+
+class _DocumentRender:
+    """
+    Renders a document, in this process or in a worker process. A worker is sent only the document's type and the
+    render states of its children, rather than the document's nodes, with their decoded values and change tracking.
+    """
+
+    _document: LsxDocument
+    _method: str                                   # The name of the document's rendering method
+    _version: tuple[int, int, int, int] | None
+
+    def __init__(self, document: LsxDocument, method: str, version: tuple[int, int, int, int] | None):
+        self._document = document
+        self._method = method
+        self._version = version
+
+    def __call__(self) -> bytes:
+        return getattr(self._document, self._method)(version=self._version)
+
+    def __reduce__(self) -> tuple[type[partial], tuple]:
+        """Pickle the task as a call of _render_document() with the document's type and its children's states."""
+        children = [child.render_state() for child in self._document.children]
+        return (partial, (_render_document, type(self._document), children, self._method, self._version))
+
+
+def _render_document(document_type: type[LsxDocument],
+                     children: list[RenderState],
+                     method: str,
+                     version: tuple[int, int, int, int] | None) -> bytes:
+    """Render a document recreated from the render states of its children."""
+    document = document_type(*(LsxNode.from_render_state(child) for child in children))
+    return getattr(document, method)(version=version)
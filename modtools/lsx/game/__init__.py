@@ -6,6 +6,7 @@ BG3 .lsx definitions package.
 # flake8: noqa
 from .actionresourcedefinitions import *
 from .actionresources import *
+from .boosts import *
 from .characterability import *
 from .characterclass import *
 from .characterrace import *
@@ -15,11 +16,13 @@ from .featdescriptions import *
 from .feats import *
 from .levelmaps import *
 from .meta import *
+from .modsettings import *
 from .origins import *
 from .passivelists import *
 from .progressiondescriptions import *
 from .progressions import *
 from .roottemplates import *
+from .selectors import *
 from .skills import *
 from .spelllists import *
 from .tags import *
@@ -3,11 +3,10 @@
 Spell and action resources.
 """
 
-import re
-
-from collections.abc import Container, Iterable
+from collections.abc import Container
 from enum import StrEnum
-from typing import Callable, Final
+from modtools.lsx.game.boosts import ActionResourceBoost, Boost
+from typing import Callable
 
 
 class ActionResource(StrEnum):
@@ -35,25 +34,20 @@ class ActionResource(StrEnum):
     WRITHING_TIDE_POINTS = "WrithingTidePoint"
 
 
-_ACTION_RESOURCE_REGEX: Final = re.compile(r"^\s*ActionResource\((\w+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)\s*$")
-
-
-def update_action_resources(iter: Iterable[str],
+def update_action_resources(boosts: list[Boost],
                             resources: Container[ActionResource],
-                            apply: Callable[[str, int, int], int]) -> list[str]:
+                            apply: Callable[[str, int, int], int]) -> bool:
     """
-    Update action resources.
+    Update action resources in place, returning True if any were changed.
 
-    iter -- The iterable containing resources to be updated.
+    boosts -- The parsed boosts containing resources to be updated (see parse_boosts).
     resources -- The resources to match against.
     apply -- A callable that returns a new 'count' value when called with the (resource, count, level).
     """
-    results = []
-    for item in iter:
-        if (match := _ACTION_RESOURCE_REGEX.match(item)) is not None:
-            resource, count, level = match.groups()
-            if resource in resources:
-                updated_count = apply(resource, int(count), int(level))
-                item = f"ActionResource({resource},{updated_count},{level})"
-        results.append(item)
-    return results
+    was_updated = False
+    for boost in boosts:
+        if isinstance(boost, ActionResourceBoost) and boost.resource in resources:
+            updated_count = apply(boost.resource, boost.count, boost.level)
+            was_updated = was_updated or updated_count != boost.count
+            boost.count = updated_count
+    return was_updated
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Parsed representations of progression boosts, e.g. ActionResource(SpellSlot,2,1).
+"""
+
+import re
+
+from collections.abc import Iterable
+from dataclasses import Field, dataclass, field
+from modtools.lsx.game.progressions import Progression
+from typing import Final, Self
+
+
+def _source() -> Field[str | None]:
+    """A boost's original text, which does not take part in comparisons."""
+    return field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class ActionResourceBoost:
+    """ActionResource(resource,count,level)"""
+    resource: str                   # The action resource, e.g. SpellSlot
+    count: int                      # The number of resources granted
+    level: int                      # The resource level, e.g. the spell slot level; 0 for unlevelled resources
+    source: str | None = _source()  # The boost as written, if it was parsed
+
+    @classmethod
+    def from_args(cls, resource: str, count: str, level: str) -> Self:
+        return cls(resource, int(count), int(level))
+
+    def __str__(self) -> str:
+        return f"ActionResource({self.resource},{self.count},{self.level})"
+
+
+@dataclass
+class AbilityBoost:
+    """Ability(ability,amount[,maximum])"""
+    ability: str                    # The ability, e.g. Strength
+    amount: int                     # The amount added to the ability score
+    maximum: int | None = None      # The maximum ability score, if not the default
+    source: str | None = _source()  # The boost as written, if it was parsed
+
+    @classmethod
+    def from_args(cls, ability: str, amount: str, maximum: str | None = None) -> Self:
+        return cls(ability, int(amount), None if maximum is None else int(maximum))
+
+    def __str__(self) -> str:
+        maximum = "" if self.maximum is None else f",{self.maximum}"
+        return f"Ability({self.ability},{self.amount}{maximum})"
+
+
+@dataclass
+class ProficiencyBonusBoost:
+    """ProficiencyBonus(type,value)"""
+    type: str                       # The proficiency type, e.g. SavingThrow or Skill
+    value: str                      # The ability or skill, e.g. Constitution or Perception
+    source: str | None = _source()  # The boost as written, if it was parsed
+
+    @classmethod
+    def from_args(cls, type: str, value: str) -> Self:
+        return cls(type, value)
+
+    def __str__(self) -> str:
+        return f"ProficiencyBonus({self.type},{self.value})"
+
+
+type Boost = ActionResourceBoost | AbilityBoost | ProficiencyBonusBoost | str
+
+_BOOST_REGEX: Final = re.compile(r"^\s*(\w+)\(([^()]*)\)\s*$")
+
+_BOOST_TYPES: Final = {
+    "Ability": AbilityBoost,
+    "ActionResource": ActionResourceBoost,
+    "ProficiencyBonus": ProficiencyBonusBoost,
+}
+
+
+def parse_boost(boost: str) -> Boost:
+    """Parse a boost, returning the boost string unchanged if it is not one of the parsed boost types."""
+    if (match := _BOOST_REGEX.match(boost)) and (boost_type := _BOOST_TYPES.get(match[1])):
+        try:
+            parsed = boost_type.from_args(*(arg.strip() for arg in match[2].split(",")))
+        except (TypeError, ValueError):
+            return boost
+        parsed.source = boost
+        return parsed
+    return boost
+
+
+def parse_boosts(boosts: Iterable[str] | None) -> list[Boost]:
+    """Parse a list of boosts, such as Progression.Boosts."""
+    return [parse_boost(boost) for boost in boosts or []]
+
+
+def format_boost(boost: Boost) -> str:
+    """Format a parsed boost, keeping its original text if it has not been edited since it was parsed."""
+    if isinstance(boost, str):
+        return boost
+    if boost.source is not None and parse_boost(boost.source) == boost:
+        return boost.source
+    return str(boost)
+
+
+def format_boosts(boosts: Iterable[Boost]) -> list[str] | None:
+    """Format parsed boosts as a list of boost strings, or None if there are none."""
+    return [format_boost(boost) for boost in boosts] or None
+
+
+def write_boosts(progression: Progression, boosts: Iterable[Boost]) -> None:
+    """Write parsed boosts back to progression.Boosts, unless none of them was edited, added, or removed."""
+    if (formatted := format_boosts(boosts)) != (progression.Boosts or None):
+        progression.Boosts = formatted
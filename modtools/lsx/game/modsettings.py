@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Mod settings definitions: the player's modsettings.lsx, listing the enabled mods in load order.
+"""
+
+from modtools.lsx.children import LsxChildren
+from modtools.lsx.document import LsxDocument
+from modtools.lsx.node import LsxNode
+from modtools.lsx import Lsx
+from modtools.lsx.type import LsxType
+
+
+class ModOrder(LsxNode):
+    class Module(LsxNode):
+        UUID: str = LsxType.FIXEDSTRING
+
+        def __init__(self,
+                     *,
+                     UUID: str = None):
+            super().__init__(
+                UUID=UUID,
+            )
+
+    children: LsxChildren = (Module,)
+
+    def __init__(self,
+                 *,
+                 children: LsxChildren = None):
+        super().__init__(
+            children=children,
+        )
+
+
+class Mods(LsxNode):
+    class ModuleShortDesc(LsxNode):
+        Folder: str = LsxType.LSSTRING_VALUE
+        MD5: str = LsxType.LSSTRING_VALUE
+        Name: str = LsxType.LSSTRING_VALUE
+        PublishHandle: int = LsxType.UINT64
+        UUID: str = LsxType.FIXEDSTRING
+        Version64: int = LsxType.INT64
+
+        def __init__(self,
+                     *,
+                     Folder: str = None,
+                     MD5: str = None,
+                     Name: str = None,
+                     PublishHandle: int = None,
+                     UUID: str = None,
+                     Version64: int = None):
+            super().__init__(
+                Folder=Folder,
+                MD5=MD5,
+                Name=Name,
+                PublishHandle=PublishHandle,
+                UUID=UUID,
+                Version64=Version64,
+            )
+
+    children: LsxChildren = (ModuleShortDesc,)
+
+    def __init__(self,
+                 *,
+                 children: LsxChildren = None):
+        super().__init__(
+            children=children,
+        )
+
+
+class ModuleSettings(LsxDocument):
+    path = "modsettings.lsx"
+    children: LsxChildren = (ModOrder, Mods)
+
+
+Lsx.register(ModuleSettings)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Parsed representations of progression selectors, e.g. SelectSpells(UUID,1,0,WizardSpell).
+"""
+
+import re
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cache
+from typing import Final, Self
+from uuid import UUID
+
+
+def _format(name: str, *args: object) -> str:
+    """Format a selector, omitting trailing arguments that are None."""
+    args = list(args)
+    while args and args[-1] is None:
+        args.pop()
+    return f"{name}({",".join("" if arg is None else str(arg) for arg in args)})"
+
+
+def _optional_int(value: str | None) -> int | None:
+    return None if value is None else int(value)
+
+
+@dataclass(frozen=True)
+class AddSpells:
+    """AddSpells(UUID[,SelectorId][,CastingAbility][,ActionResource][,PrepareType][,CooldownType])"""
+    uuid: str                           # The SpellList UUID
+    selector_id: str | None = None      # The selector id, e.g. WizardSpell
+    casting_ability: str | None = None  # The spellcasting ability, e.g. Intelligence
+    action_resource: str | None = None  # The UUID of the action resource used to cast the spells
+    prepare_type: str | None = None     # The prepare type, e.g. AlwaysPrepared
+    cooldown_type: str | None = None    # The cooldown type, e.g. UntilRest
+
+    @classmethod
+    def from_args(cls, uuid: str, *args: str) -> Self:
+        return cls(uuid, *args)
+
+    def __str__(self) -> str:
+        return _format("AddSpells", self.uuid, self.selector_id, self.casting_ability, self.action_resource,
+                       self.prepare_type, self.cooldown_type)
+
+
+@dataclass(frozen=True)
+class SelectSpells:
+    """
+    SelectSpells(UUID,Amount[,SwapAmount][,SelectorId][,CastingAbility][,ActionResource][,PrepareType]
+                 [,CooldownType])
+    """
+    uuid: str                           # The SpellList UUID
+    amount: int                         # The number of spells to select
+    swap_amount: int | None = None      # The number of previously selected spells that may be replaced
+    selector_id: str | None = None      # The selector id, e.g. WizardSpell
+    casting_ability: str | None = None  # The spellcasting ability, e.g. Intelligence
+    action_resource: str | None = None  # The UUID of the action resource used to cast the spells
+    prepare_type: str | None = None     # The prepare type, e.g. AlwaysPrepared
+    cooldown_type: str | None = None    # The cooldown type, e.g. UntilRest
+
+    @classmethod
+    def from_args(cls, uuid: str, amount: str, swap_amount: str | None = None, *args: str) -> Self:
+        return cls(uuid, int(amount), _optional_int(swap_amount), *args)
+
+    def __str__(self) -> str:
+        return _format("SelectSpells", self.uuid, self.amount, self.swap_amount, self.selector_id,
+                       self.casting_ability, self.action_resource, self.prepare_type, self.cooldown_type)
+
+
+@dataclass(frozen=True)
+class SelectPassives:
+    """SelectPassives(UUID,Amount[,SelectorId])"""
+    uuid: str                       # The PassiveList UUID
+    amount: int                     # The number of passives to select
+    selector_id: str | None = None  # The selector id
+
+    @classmethod
+    def from_args(cls, uuid: str, amount: str, selector_id: str | None = None) -> Self:
+        return cls(uuid, int(amount), selector_id)
+
+    def __str__(self) -> str:
+        return _format("SelectPassives", self.uuid, self.amount, self.selector_id)
+
+
+@dataclass(frozen=True)
+class SelectSkills:
+    """SelectSkills(UUID,Amount[,SelectorId])"""
+    uuid: str                       # The SkillList UUID
+    amount: int                     # The number of skills to select
+    selector_id: str | None = None  # The selector id
+
+    @classmethod
+    def from_args(cls, uuid: str, amount: str, selector_id: str | None = None) -> Self:
+        return cls(uuid, int(amount), selector_id)
+
+    def __str__(self) -> str:
+        return _format("SelectSkills", self.uuid, self.amount, self.selector_id)
+
+
+@dataclass(frozen=True)
+class SelectSkillsExpertise:
+    """SelectSkillsExpertise(UUID,Amount[,LimitToProficiency][,SelectorId])"""
+    uuid: str                                # The SkillList UUID
+    amount: int                              # The number of skill expertises to select
+    limit_to_proficiency: str | None = None  # Whether expertise is limited to proficient skills: true or false
+    selector_id: str | None = None           # The selector id
+
+    @classmethod
+    def from_args(cls, uuid: str, amount: str, *args: str) -> Self:
+        return cls(uuid, int(amount), *args)
+
+    def __str__(self) -> str:
+        return _format("SelectSkillsExpertise", self.uuid, self.amount, self.limit_to_proficiency, self.selector_id)
+
+
+@dataclass(frozen=True)
+class SelectAbilityBonus:
+    """SelectAbilityBonus(UUID,Type,Amount...)"""
+    uuid: str                 # The AbilityList UUID
+    type: str                 # The bonus type, e.g. AbilityBonus
+    amounts: tuple[int, ...]  # The bonus amounts, e.g. (2, 1)
+
+    @classmethod
+    def from_args(cls, uuid: str, type: str, *amounts: str) -> Self:
+        return cls(uuid, type, tuple(int(amount) for amount in amounts))
+
+    def __str__(self) -> str:
+        return _format("SelectAbilityBonus", self.uuid, self.type, *self.amounts)
+
+
+@dataclass(frozen=True)
+class SelectEquipment:
+    """SelectEquipment(UUID,Amount[,SelectorId])"""
+    uuid: str                       # The EquipmentList UUID
+    amount: int                     # The number of items to select
+    selector_id: str | None = None  # The selector id
+
+    @classmethod
+    def from_args(cls, uuid: str, amount: str, selector_id: str | None = None) -> Self:
+        return cls(uuid, int(amount), selector_id)
+
+    def __str__(self) -> str:
+        return _format("SelectEquipment", self.uuid, self.amount, self.selector_id)
+
+
+type Selector = (AddSpells | SelectSpells | SelectPassives | SelectSkills | SelectSkillsExpertise | SelectAbilityBonus |
+                 SelectEquipment | str)
+
+_SELECTOR_REGEX: Final = re.compile(r"^\s*(\w+)\(([^()]*)\)\s*$")
+
+_SELECTOR_TYPES: Final = {
+    selector_type.__name__: selector_type
+    for selector_type in (AddSpells, SelectSpells, SelectPassives, SelectSkills, SelectSkillsExpertise,
+                          SelectAbilityBonus, SelectEquipment)
+}
+
+
+@cache
+def parse_selector(selector: str) -> Selector:
+    """Parse a selector, returning the selector string unchanged if it is not one of the parsed selector types."""
+    if (match := _SELECTOR_REGEX.match(selector)) and (selector_type := _SELECTOR_TYPES.get(match[1])):
+        try:
+            return selector_type.from_args(*(arg.strip() for arg in match[2].split(",")))
+        except (TypeError, ValueError):
+            pass
+    return selector
+
+
+class Selectors:
+    """Parsed progression selectors, indexed by selector type and UUID."""
+
+    _selectors: list[Selector]
+    _by_type: dict[type, list[Selector]]  # Selector type -> [Selector]
+    _by_uuid: dict[str, list[Selector]]   # UUID -> [Selector]
+
+    def __init__(self, selectors: Iterable[str | Selector] | None = None):
+        self._selectors = [parse_selector(selector) if isinstance(selector, str) else selector
+                           for selector in selectors or []]
+        self._reindex()
+
+    def __iter__(self) -> Iterator[Selector]:
+        return iter(self._selectors)
+
+    def __len__(self) -> int:
+        return len(self._selectors)
+
+    def _reindex(self) -> None:
+        self._by_type = {}
+        self._by_uuid = {}
+        for selector in self._selectors:
+            self._by_type.setdefault(type(selector), []).append(selector)
+            if not isinstance(selector, str):
+                self._by_uuid.setdefault(selector.uuid, []).append(selector)
+
+    def of_type[T](self, selector_type: type[T]) -> list[T]:
+        """Return the selectors of the given type, in order."""
+        return list(self._by_type.get(selector_type, []))
+
+    def with_uuid(self, uuid: str | UUID) -> list[Selector]:
+        """Return the selectors referring to the given list UUID, in order."""
+        return list(self._by_uuid.get(str(uuid), []))
+
+    def add(self, selector: str | Selector) -> None:
+        """Append a selector."""
+        selector = parse_selector(selector) if isinstance(selector, str) else selector
+        self._selectors.append(selector)
+        self._by_type.setdefault(type(selector), []).append(selector)
+        if not isinstance(selector, str):
+            self._by_uuid.setdefault(selector.uuid, []).append(selector)
+
+    def remove_type(self, selector_type: type) -> None:
+        """Remove all selectors of the given type."""
+        if self._by_type.pop(selector_type, None):
+            self._selectors = [selector for selector in self._selectors if type(selector) is not selector_type]
+            self._reindex()
+
+    def replace(self, old: Selector, new: Selector) -> None:
+        """Replace a selector with another, keeping its position."""
+        index = next(i for i, selector in enumerate(self._selectors) if selector is old)
+        self._selectors[index] = new
+        self._reindex()
+
+    def format(self) -> list[str] | None:
+        """Format the selectors as a list of selector strings, or None if there are none."""
+        return [str(selector) for selector in self._selectors] or None
@@ -3,13 +3,12 @@
 Tags definitions.
 """
 
-import os
-
 from modtools.lsx.children import LsxChildren
 from modtools.lsx.document import LsxDocument
 from modtools.lsx.node import LsxNode
 from modtools.lsx import Lsx
 from modtools.lsx.type import LsxType
+from modtools.render import RenderTask
 from xml.etree.ElementTree import Element, SubElement
 
 
@@ -64,15 +63,15 @@ class Tags(LsxDocument, LsxNode):
         child.load(node)
         self.children.append(child)
 
-    def save(self, mod_path: os.PathLike, *,
-             version: tuple[int, int, int, int] | None = None,
-             **kwds: str) -> None:
+    def render_task(self, *,
+                    version: tuple[int, int, int, int] | None = None,
+                    **kwds: str) -> RenderTask:
         """Retrieve the tag name for path formatting."""
         assert len(self.children) == 1
 
         tag: Tags.Tags = self.children[0]
         tag_name = tag.Name
-        super().save(mod_path, version=version, tag_name=tag_name, **kwds)
+        return super().render_task(version=version, tag_name=tag_name, **kwds)
 
     def xml(self, *, version: tuple[int, int, int, int] | None = None) -> Element:
         """Returns an XML encoding of the document. This replaces the <node><children> root with the tag <node>."""
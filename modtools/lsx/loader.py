@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Streaming loader of .lsx documents, creating their nodes directly from the XML parser's events.
+"""
+
+import os
+
+from dataclasses import dataclass
+from modtools.lsx.document import LsxDocument
+from modtools.lsx.node import LsxNode
+from typing import Final
+from xml.etree.ElementTree import XMLParser
+
+import modtools.lsx.detail as detail
+
+_READ_SIZE: Final = 1 << 16  # The number of bytes fed to the parser at a time
+_QUALNAME: Final = "Lsx.load"  # The loader's errors are reported as those of Lsx.load()
+_IN_MEMORY: Final = "<memory>"  # The path reported in errors for documents loaded from their contents
+
+
+@dataclass
+class _Frame:
+    """An open <node> element."""
+    node: LsxNode | None                          # The node being loaded, or None for the root or an ignored node
+    raw: dict[str, str | tuple[str, str]] | None  # The node's undecoded attribute values
+    children: detail.LsxChildren | None = None    # The collection that child nodes are loaded into, once opened
+
+
+class LsxLoader:
+    """
+    A target for XMLParser that loads an .lsx document, creating each LsxNode, and its raw attribute values, from the
+    start and end events of its elements, according to the registered document types. No element tree is built.
+    """
+
+    _path: str                                        # The path of the document, for error messages
+    _document_types: dict[str, type[LsxDocument]]     # The registered document types, by region id
+    _document: LsxDocument | None                     # The document, once its <region> has been seen
+    _root_is_child: bool                              # True if the root node is the document's single child
+    _saw_save: bool                                   # True once the <save> element has been seen
+    _saw_root: bool                                   # True once the root <node> element has been seen
+    _stack: list[_Frame]                              # The open <node> elements, innermost last
+    _frame: _Frame | None                             # The innermost open <node> element
+
+    def __init__(self, path: os.PathLike, document_types: dict[str, type[LsxDocument]]):
+        self._path = str(path)
+        self._document_types = document_types
+        self._document = None
+        self._root_is_child = False
+        self._saw_save = False
+        self._saw_root = False
+        self._stack = []
+        self._frame = None
+
+    @classmethod
+    def load(cls, source: os.PathLike | bytes | memoryview,
+             document_types: dict[str, type[LsxDocument]]) -> LsxDocument:
+        """Load the .lsx document at a path, or from its contents."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            parser = XMLParser(target=cls(_IN_MEMORY, document_types))
+            parser.feed(source)
+            return parser.close()
+
+        parser = XMLParser(target=cls(source, document_types))
+        with open(source, "rb") as f:
+            while data := f.read(_READ_SIZE):
+                parser.feed(data)
+        return parser.close()
+
+    def start(self, tag: str, xml_attrs: dict[str, str]) -> None:
+        if tag == "attribute":  # By far the most frequent element, so it is tested first
+            if (frame := self._frame) is not None and frame.node is not None:
+                frame.node._load_attribute(frame.raw, xml_attrs)
+            return
+
+        if not self._saw_save:
+            if tag != "save":
+                raise KeyError(f"{_QUALNAME} missing <save> node in LSX document '{self._path}'")
+            self._saw_save = True
+            return
+
+        match tag:
+            case "node":
+                self._start_node(xml_attrs.get("id"))
+                self._frame = self._stack[-1]
+            case "children":
+                self._start_children()
+            case "region" if self._document is None:
+                region_id = xml_attrs.get("id")
+                if (document_type := self._document_types.get(region_id)) is None:
+                    raise TypeError(f"{_QUALNAME} unsupported LSX document type: {region_id}")
+                self._document = document_type()
+
+    def end(self, tag: str) -> None:
+        if tag == "node" and (stack := self._stack):
+            frame = stack.pop()
+            self._frame = stack[-1] if stack else None
+            if frame.node is not None:
+                frame.node._loaded(frame.raw)
+                if not stack and self._root_is_child:
+                    self._document.children.append(frame.node)
+
+    def close(self) -> LsxDocument:
+        if not self._saw_save:
+            raise KeyError(f"{_QUALNAME} missing <save> node in LSX document '{self._path}'")
+        if self._document is None:
+            raise KeyError(f"{_QUALNAME} missing <region> node in LSX document '{self._path}'")
+        if not self._saw_root:
+            raise KeyError(f"{_QUALNAME} expected root id='{self._document.root}' in LSX document")
+        return self._document
+
+    def _start_node(self, node_id: str) -> None:
+        if self._stack:
+            parent = self._stack[-1]
+            if parent.children is None:  # A node outside of a <children> element is ignored, as are its descendants
+                self._stack.append(_Frame(None, None))
+            else:
+                node = parent.children._load_child(node_id)
+                self._stack.append(_Frame(node, node.__dict__.setdefault("_raw_", {})))
+            return
+
+        if self._document is None:
+            raise KeyError(f"{_QUALNAME} missing <region> node in LSX document '{self._path}'")
+        document_root = getattr(type(self._document), "_root")
+        if node_id != document_root:
+            raise KeyError(f"{_QUALNAME} expected root id='{document_root}' in LSX document")
+
+        self._saw_root = True
+        if document_root == "Tags":  # The root node is the document's single child, rather than its container
+            self._root_is_child = True
+            node = self._document._child_types_[0]()
+            self._stack.append(_Frame(node, node.__dict__.setdefault("_raw_", {})))
+        else:
+            self._stack.append(_Frame(None, None))
+
+    def _start_children(self) -> None:
+        if not self._stack:
+            return
+        frame = self._stack[-1]
+        if frame.node is not None:
+            frame.children = frame.node.children
+        elif len(self._stack) == 1 and not self._root_is_child:
+            frame.children = self._document.children
+        else:
+            return
+        frame.children.clear()
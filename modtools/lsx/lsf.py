@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Encoding and decoding of binary .lsf documents (LSOF version 6), the binary equivalent of .lsx documents.
+"""
+
+import base64
+import struct
+import zlib
+
+from typing import Final
+from uuid import UUID
+from xml.etree.ElementTree import Element, SubElement
+
+LSF_SIGNATURE: Final = b"LSOF"
+LSF_VERSION: Final = 6
+
+DEFAULT_ENGINE_VERSION: Final = (4, 0, 9, 331)  # Written when the document has no <version>
+
+# Signature, version, engine version; then the uncompressed and on-disk sizes of the strings, keys, nodes, attributes,
+# and values sections, the compression flags, two unknown fields, and the metadata format
+_HEADER: Final = struct.Struct("<4sIq10IBBHI")
+
+_NODE: Final = struct.Struct("<Iiii")       # Name, parent, next sibling, first attribute
+_ATTRIBUTE: Final = struct.Struct("<IIiI")  # Name, type and length, next attribute, value offset
+
+# The sections, in the order of their sizes in the header, and in the order that they are written
+_HEADER_SECTIONS: Final = ("strings", "keys", "nodes", "attributes", "values")
+_FILE_SECTIONS: Final = ("strings", "nodes", "attributes", "values", "keys")
+
+_HASH_BUCKETS: Final = 0x200
+_ZLIB_COMPRESSION: Final = 0x21  # zlib, at the default compression level
+_KEYS_AND_ADJACENCY: Final = 1   # Metadata format with node keys and sibling/attribute links
+
+# .lsx type name -> (.lsf type id, struct format of the value); strings, GUIDs and translations have no format
+_TYPES: Final[dict[str, tuple[int, str | None]]] = {
+    "None": (0, None),
+    "uint8": (1, "<B"),
+    "int16": (2, "<h"),
+    "uint16": (3, "<H"),
+    "int32": (4, "<i"),
+    "uint32": (5, "<I"),
+    "float": (6, "<f"),
+    "double": (7, "<d"),
+    "ivec2": (8, "<2i"),
+    "ivec3": (9, "<3i"),
+    "ivec4": (10, "<4i"),
+    "fvec2": (11, "<2f"),
+    "fvec3": (12, "<3f"),
+    "fvec4": (13, "<4f"),
+    "mat2x2": (14, "<4f"),
+    "mat3x3": (15, "<9f"),
+    "mat3x4": (16, "<12f"),
+    "mat4x3": (17, "<12f"),
+    "mat4x4": (18, "<16f"),
+    "bool": (19, "<?"),
+    "string": (20, None),
+    "path": (21, None),
+    "FixedString": (22, None),
+    "LSString": (23, None),
+    "uint64": (24, "<Q"),
+    "ScratchBuffer": (25, None),
+    "old_int64": (26, "<q"),
+    "int8": (27, "<b"),
+    "TranslatedString": (28, None),
+    "WString": (29, None),
+    "LSWString": (30, None),
+    "guid": (31, None),
+    "int64": (32, "<q"),
+}
+_TYPE_NAMES: Final = {type_id: name for name, (type_id, _) in _TYPES.items()}
+
+
+def lsf_path(lsx_path: str) -> str:
+    """Return the path of the .lsf equivalent of an .lsx file, e.g. _merged.lsf.lsx -> _merged.lsf."""
+    if lsx_path.endswith(".lsf.lsx"):
+        return lsx_path[:-len(".lsx")]
+    return lsx_path.removesuffix(".lsx") + ".lsf"
+
+
+def _swap_guid(data: bytes) -> bytes:
+    """Swap the pairs of bytes in the last 8 bytes of a GUID, as the game stores them."""
+    return data[:8] + bytes(data[i ^ 1] for i in range(8, 16))
+
+
+def _format_float(value: float, fmt: str) -> str:
+    """Return the shortest string for a value that parses to the same float or double."""
+    if fmt == "<d":
+        return f"{value:g}" if float(f"{value:g}") == value else repr(value)
+    packed = struct.pack(fmt, value)
+    for precision in range(1, 10):
+        if struct.pack(fmt, float(text := f"{value:.{precision}g}")) == packed:
+            return text
+    return repr(value)
+
+
+def _encode_value(type_name: str, attribute: Element) -> bytes:
+    """Return the .lsf encoding of an <attribute>'s value."""
+    _, fmt = _TYPES[type_name]
+    value = attribute.get("value", "")
+    if fmt == "<?":
+        return struct.pack(fmt, value.lower() in ("true", "1"))
+    if fmt is not None:
+        parse = float if fmt[-1] in "fd" else int
+        return struct.pack(fmt, *[parse(x) for x in value.split()])
+    match type_name:
+        case "None":
+            return b""
+        case "guid":
+            return _swap_guid(UUID(value).bytes_le)
+        case "ScratchBuffer":
+            return base64.b64decode(value)
+        case "TranslatedString":
+            handle = attribute.get("handle", "").encode("utf-8") + b"\0"
+            return struct.pack("<Hi", int(attribute.get("version") or 0), len(handle)) + handle
+        case _:
+            return value.encode("utf-8") + b"\0"
+
+
+def _decode_value(type_name: str, data: bytes, attribute: Element) -> None:
+    """Set an <attribute>'s value from its .lsf encoding."""
+    _, fmt = _TYPES[type_name]
+    if fmt == "<?":
+        attribute.set("value", "true" if data[0] else "false")
+    elif fmt is not None:
+        values = struct.unpack(fmt, data)
+        if fmt[-1] in "fd":
+            attribute.set("value", " ".join(_format_float(x, fmt[0] + fmt[-1]) for x in values))
+        else:
+            attribute.set("value", " ".join(str(x) for x in values))
+    else:
+        match type_name:
+            case "None":
+                attribute.set("value", "")
+            case "guid":
+                attribute.set("value", str(UUID(bytes_le=_swap_guid(data))))
+            case "ScratchBuffer":
+                attribute.set("value", base64.b64encode(data).decode("ascii"))
+            case "TranslatedString":
+                version, length = struct.unpack_from("<Hi", data)
+                attribute.set("handle", data[6:6 + length - 1].decode("utf-8"))
+                attribute.set("version", str(version))
+            case _:
+                attribute.set("value", data.rstrip(b"\0").decode("utf-8"))
+
+
+class _LsfEncoder:
+    """Accumulates the sections of an .lsf document."""
+
+    _names: list[list[str]]           # The string hash table: bucket -> names
+    _name_refs: dict[str, int]        # Name -> (bucket << 16 | index within the bucket)
+    _nodes: list[list[int]]           # [name, parent, next sibling, first attribute] of each node
+    _attributes: list[list[int]]      # [name, type and length, next attribute, value offset] of each attribute
+    _values: bytearray
+
+    def __init__(self):
+        self._names = [[] for _ in range(_HASH_BUCKETS)]
+        self._name_refs = {}
+        self._nodes = []
+        self._attributes = []
+        self._values = bytearray()
+
+    def _name(self, name: str) -> int:
+        if (ref := self._name_refs.get(name)) is None:
+            crc = zlib.crc32(name.encode("utf-8"))
+            bucket = (crc ^ (crc >> 9) ^ (crc >> 18) ^ (crc >> 27)) & (_HASH_BUCKETS - 1)
+            ref = self._name_refs[name] = (bucket << 16) | len(self._names[bucket])
+            self._names[bucket].append(name)
+        return ref
+
+    def add_node(self, node: Element, name: str, parent: int) -> int:
+        """Add a <node>, its attributes, and its descendants, returning the node's index."""
+        index = len(self._nodes)
+        self._nodes.append([self._name(name), parent, -1, -1])
+
+        previous: list[int] | None = None
+        for attribute in node.findall("attribute"):
+            type_name = attribute.get("type")
+            if type_name not in _TYPES:
+                raise TypeError(f"{name}.{attribute.get("id")}: {type_name} attributes are not supported in .lsf")
+            value = _encode_value(type_name, attribute)
+            if previous is None:
+                self._nodes[index][3] = len(self._attributes)
+            else:
+                previous[2] = len(self._attributes)
+            previous = [self._name(attribute.get("id")), _TYPES[type_name][0] | (len(value) << 6), -1,
+                        len(self._values)]
+            self._attributes.append(previous)
+            self._values += value
+
+        previous_child: int | None = None
+        for children in node.findall("children"):
+            for child in children.findall("node"):
+                child_index = self.add_node(child, child.get("id"), index)
+                if previous_child is not None:
+                    self._nodes[previous_child][2] = child_index
+                previous_child = child_index
+        return index
+
+    def _strings(self) -> bytes:
+        data = bytearray(struct.pack("<I", len(self._names)))
+        for bucket in self._names:
+            data += struct.pack("<H", len(bucket))
+            for name in bucket:
+                encoded = name.encode("utf-8")
+                data += struct.pack("<H", len(encoded)) + encoded
+        return bytes(data)
+
+    def encode(self, engine_version: int, compress: bool) -> bytes:
+        sections = {
+            "strings": self._strings(),
+            "keys": b"",
+            "nodes": b"".join(_NODE.pack(*node) for node in self._nodes),
+            "attributes": b"".join(_ATTRIBUTE.pack(*attribute) for attribute in self._attributes),
+            "values": bytes(self._values),
+        }
+        on_disk = {name: zlib.compress(section) if compress and section else section
+                   for name, section in sections.items()}
+        sizes = []
+        for name in _HEADER_SECTIONS:
+            sizes += [len(sections[name]), len(on_disk[name]) if compress and sections[name] else 0]
+        header = _HEADER.pack(LSF_SIGNATURE, LSF_VERSION, engine_version, *sizes,
+                              _ZLIB_COMPRESSION if compress else 0, 0, 0, _KEYS_AND_ADJACENCY)
+        return header + b"".join(on_disk[name] for name in _FILE_SECTIONS)
+
+
+def encode_lsf(save: Element, *, compress: bool = True) -> bytes:
+    """
+    Return the .lsf encoding of an .lsx <save> element. In .lsf, a region's root node takes the region's name, so the
+    root <node> id is not preserved.
+    """
+    major, minor, revision, build = DEFAULT_ENGINE_VERSION
+    if (version := save.find("version")) is not None:
+        major, minor, revision, build = (int(version.get(attr, 0)) for attr in ("major", "minor", "revision", "build"))
+    engine_version = (major & 0x7F) << 55 | (minor & 0xFF) << 47 | (revision & 0xFFFF) << 31 | (build & 0x7FFFFFFF)
+
+    encoder = _LsfEncoder()
+    for region in save.findall("region"):
+        if (root := region.find("node")) is None:
+            raise KeyError(f"{encode_lsf.__qualname__}: missing root <node> in region '{region.get("id")}'")
+        encoder.add_node(root, region.get("id"), -1)
+    return encoder.encode(engine_version, compress)
+
+
+def decode_lsf(data: bytes, *, root: str | None = None) -> Element:
+    """
+    Return the .lsx <save> element of an .lsf document, as written by encode_lsf(). Each region's root <node> takes
+    the given root id, or the region's name if None.
+    """
+    signature, version, engine_version, *fields = _HEADER.unpack_from(data)
+    if signature != LSF_SIGNATURE or version != LSF_VERSION:
+        raise ValueError(f"{decode_lsf.__qualname__}: not an LSOF version {LSF_VERSION} document")
+    sizes, (compression, _, _, metadata_format) = fields[:10], fields[10:]
+    if metadata_format != _KEYS_AND_ADJACENCY:
+        raise ValueError(f"{decode_lsf.__qualname__}: unsupported metadata format {metadata_format}")
+
+    sizes_by_section = {section: (sizes[i * 2], sizes[i * 2 + 1]) for i, section in enumerate(_HEADER_SECTIONS)}
+    sections: dict[str, bytes] = {}
+    offset = _HEADER.size
+    for section in _FILE_SECTIONS:
+        size, size_on_disk = sizes_by_section[section]
+        if size_on_disk == 0:
+            sections[section] = data[offset:offset + size]
+            offset += size
+        else:
+            if compression & 0x0F != 1:
+                raise ValueError(f"{decode_lsf.__qualname__}: unsupported compression {compression:#x}")
+            sections[section] = zlib.decompress(data[offset:offset + size_on_disk])
+            offset += size_on_disk
+
+    strings = sections["strings"]
+    names: list[list[str]] = []
+    (bucket_count,), position = struct.unpack_from("<I", strings), 4
+    for _ in range(bucket_count):
+        (count,), position = struct.unpack_from("<H", strings, position), position + 2
+        bucket = []
+        for _ in range(count):
+            (length,), position = struct.unpack_from("<H", strings, position), position + 2
+            bucket.append(strings[position:position + length].decode("utf-8"))
+            position += length
+        names.append(bucket)
+
+    def name(ref: int) -> str:
+        return names[ref >> 16][ref & 0xFFFF]
+
+    attributes = list(_ATTRIBUTE.iter_unpack(sections["attributes"]))
+    values = sections["values"]
+
+    major, minor = (engine_version >> 55) & 0x7F, (engine_version >> 47) & 0xFF
+    revision, build = (engine_version >> 31) & 0xFFFF, engine_version & 0x7FFFFFFF
+    save = Element("save")
+    SubElement(save, "version", major=str(major), minor=str(minor), revision=str(revision), build=str(build))
+
+    elements: list[Element] = []
+    for name_ref, parent, _, first_attribute in _NODE.iter_unpack(sections["nodes"]):
+        if parent == -1:
+            region = SubElement(save, "region", id=name(name_ref))
+            element = SubElement(region, "node", id=root or name(name_ref))
+        else:
+            parent_element = elements[parent]
+            if (children := parent_element.find("children")) is None:
+                children = SubElement(parent_element, "children")
+            element = SubElement(children, "node", id=name(name_ref))
+        elements.append(element)
+
+        index = first_attribute
+        while index != -1:
+            attribute_name, type_and_length, index, value_offset = attributes[index]
+            type_name = _TYPE_NAMES[type_and_length & 0x3F]
+            attribute = SubElement(element, "attribute", id=name(attribute_name), type=type_name)
+            _decode_value(type_name, values[value_offset:value_offset + (type_and_length >> 6)], attribute)
+
+    return save
@@ -7,9 +7,11 @@ import os
 
 from modtools.lsx.children import LsxChildren
 from modtools.lsx.document import LsxDocument
+from modtools.lsx.loader import LsxLoader
 from modtools.lsx.node import LsxNode
+from modtools.render import RenderTask, write_files
 from typing import ClassVar
-from xml.etree.ElementTree import parse as xml_parse
+from xml.etree.ElementTree import Element, fromstring as xml_fromstring, parse as xml_parse
 
 
 class Lsx:
@@ -17,6 +19,7 @@ class Lsx:
 
     _document_types: ClassVar[dict[str, type[LsxDocument]]] = {}
     _child_mapping: ClassVar[dict[type[LsxNode], type[LsxDocument]]] = {}
+    _parse_cache: ClassVar[dict[str, tuple[int, Element]] | None] = None
 
     _children: LsxChildren
 
@@ -41,40 +44,80 @@ class Lsx:
             cls._child_mapping[child_type] = document_type
 
     @classmethod
-    def load(cls, path: os.PathLike) -> LsxDocument:
-        with open(path, "rb") as f:
-            element = xml_parse(f).getroot()
-
-            # Parse the document preamble: <save><region id="..."><node id="..."><children>
-            if element.tag != "save":
-                raise KeyError(f"{Lsx.load.__qualname__} missing <save> node in LSX document '{path}'")
-
-            region = element.find("region")
-            if region is None:
-                raise KeyError(f"{Lsx.load.__qualname__} missing <region> node in LSX document '{path}'")
-
-            region_id = region.get("id")
-            if (document_type := Lsx._document_types.get(region_id)) is None:
-                raise TypeError(f"{Lsx.load.__qualname__} unsupported LSX document type: {region_id}")
-
-            root = region.find("node")
-            document_root = getattr(document_type, "_root")
-            if root is None or root.get("id") != document_root:
-                raise KeyError(f"{Lsx.load.__qualname__} expected root id='{document_type.root}' in LSX document")
+    def cache_parsed(cls, cache: dict[str, tuple[int, Element]] | None) -> None:
+        """
+        Keep the parsed XML of loaded documents in cache, by absolute path, reusing it while a file's modification
+        time is unchanged; None stops caching. This is for long-running processes, such as the build server.
+        """
+        cls._parse_cache = cache
 
-            document = document_type()
-
-            if document_root == "Tags":
-                document.load(root)
-            elif (children_node := root.find("children")) is not None:
-                document.load(children_node)
+    @classmethod
+    def _parse(cls, path: os.PathLike) -> Element:
+        """Return the root element of an .lsx file, from the parse cache if it is current."""
+        cache = cls._parse_cache
+        key = os.path.abspath(path)
+        mtime = os.stat(key).st_mtime_ns
+        if (entry := cache.get(key)) is not None and entry[0] == mtime:
+            return entry[1]
+        with open(key, "rb") as f:
+            element = xml_parse(f).getroot()
+        cache[key] = (mtime, element)
+        return element
 
-            return document
+    @classmethod
+    def load(cls, path: os.PathLike | bytes | memoryview) -> LsxDocument:
+        """
+        Load an .lsx document, from a path or from the document's contents. Its nodes are created directly from the
+        XML parser's events, unless parsed XML is being cached, in which case they are loaded from the (cached)
+        element tree; documents loaded from their contents are not cached.
+        """
+        if cls._parse_cache is None:
+            return LsxLoader.load(path, cls._document_types)
+
+        if isinstance(path, (bytes, bytearray, memoryview)):
+            element = xml_fromstring(path)
+            path = "<memory>"
+        else:
+            element = cls._parse(path)
+
+        # Parse the document preamble: <save><region id="..."><node id="..."><children>
+        if element.tag != "save":
+            raise KeyError(f"{Lsx.load.__qualname__} missing <save> node in LSX document '{path}'")
+
+        region = element.find("region")
+        if region is None:
+            raise KeyError(f"{Lsx.load.__qualname__} missing <region> node in LSX document '{path}'")
+
+        region_id = region.get("id")
+        if (document_type := Lsx._document_types.get(region_id)) is None:
+            raise TypeError(f"{Lsx.load.__qualname__} unsupported LSX document type: {region_id}")
+
+        root = region.find("node")
+        document_root = getattr(document_type, "_root")
+        if root is None or root.get("id") != document_root:
+            raise KeyError(f"{Lsx.load.__qualname__} expected root id='{document_root}' in LSX document")
+
+        document = document_type()
+
+        if document_root == "Tags":
+            document.load(root)
+        elif (children_node := root.find("children")) is not None:
+            document.load(children_node)
+
+        return document
 
     def save(self, mod_path: os.PathLike, *,
              version: tuple[int, int, int, int] | None = None,
+             binary: bool = False,
              **kwds: str) -> None:
-        """Save each child to the appropriate .lsx file."""
+        """Save each child to the appropriate .lsx file, or .lsf file if binary is True."""
+        write_files(mod_path, self.render_tasks(version=version, binary=binary, **kwds))
+
+    def render_tasks(self, *,
+                     version: tuple[int, int, int, int] | None = None,
+                     binary: bool = False,
+                     **kwds: str) -> list[RenderTask]:
+        """Return the tasks rendering each child to the appropriate .lsx (or .lsf) file, one per document."""
         documents: dict[type[LsxDocument], LsxDocument] = {}
 
         for child in self.children:
@@ -84,5 +127,4 @@ class Lsx:
             children: LsxChildren = document.children
             children.append(child)
 
-        for document in documents.values():
-            document.save(mod_path, version=version, **kwds)
+        return [document.render_task(version=version, binary=binary, **kwds) for document in documents.values()]
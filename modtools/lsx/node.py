@@ -4,12 +4,16 @@ Representation of .lsx nodes.
 """
 
 from collections import OrderedDict
-from modtools.lsx.attributes import LsxAttribute
+from collections.abc import Callable, Iterator
+from modtools.lsx.attributes import LsxAttribute, intern_value
 from typing import Self
 from xml.etree.ElementTree import Element
 
 import modtools.lsx.detail as detail
 
+# A node's type, the .lsx values of its set attributes, and the render states of its children
+type RenderState = tuple[type[LsxNode], dict[str, str | tuple[str, str]], list[RenderState]]
+
 
 class LsxNode:
     """A class representing an .lsx node."""
@@ -20,6 +24,10 @@ class LsxNode:
 
     children: detail.LsxChildren[Self]
 
+    _raw_: dict[str, str | tuple[str, str]]       # Undecoded attribute values from load(), by attribute id.
+    _clean_: dict[str, str | tuple[str, str]]     # Attribute .lsx values when the node was loaded or marked clean.
+    _clean_children_: tuple[Self, ...]            # The node's children when it was loaded or marked clean.
+
     @classmethod
     def __init_subclass__(cls) -> None:
         cls._id_ = str(cls.__dict__.get("_id_", cls.__name__))
@@ -32,7 +40,7 @@ class LsxNode:
                 cls._attributes_[member_name] = value
 
         for member_name, data_type in cls._attributes_.items():
-            getter, setter = data_type._wrap_accessors("_" + member_name)
+            getter, setter = cls._wrap_lazy_accessors(member_name, *data_type._wrap_accessors("_" + member_name))
             prop = property(fget=getter, fset=setter)
             setattr(cls, member_name, prop)
 
@@ -47,27 +55,109 @@ class LsxNode:
                     raise AttributeError(f"{self.__class__.__name__}.{name} is not defined", obj=self, name=name)
                 setattr(self, name, value)
 
+    def clone(self, **overrides) -> Self:
+        """
+        Returns a copy of the node with the given attributes (or children) overridden. Attribute values and children
+        are shared with this node until they are replaced in either node, so a game entry can be copied and modified
+        without changing the original. Child nodes are shared, not cloned.
+        """
+        node = object.__new__(type(self))
+        node.__dict__.update(self.__dict__)
+        if (raw := self.__dict__.get("_raw_")) is not None:
+            node.__dict__["_raw_"] = dict(raw)
+        for name, attribute in self._attributes_.items():
+            if (store := self.__dict__.get("_" + name)) is not None:
+                node.__dict__["_" + name] = attribute._share_store(store)
+        if (children := self.__dict__.get("_children")) is not None:
+            node.__dict__["_children"] = children.share()
+
+        for name, value in overrides.items():
+            if name not in self._attributes_ and (name != "children" or len(self._child_types_) == 0):
+                raise AttributeError(f"{self.__class__.__name__}.{name} is not defined", obj=self, name=name)
+            setattr(node, name, value)
+        return node
+
     def load(self, node: Element) -> None:
-        """Load the node from the given XML <node>."""
+        """
+        Load the node from the given XML <node>. Attribute values are kept undecoded until first accessed, and are
+        re-encoded verbatim if they are never accessed.
+        """
         assert node.get("id") == self._id_
 
-        for attribute in node.findall("attribute"):
-            id = attribute.get("id")
-            if (value := attribute.get("value")) is not None:
-                setattr(self, id, value)
-            else:
-                handle = attribute.get("handle")
-                version = attribute.get("version")
-                setattr(self, id, (handle, int(version)))
+        raw: dict[str, str | tuple[str, str]] = self.__dict__.setdefault("_raw_", {})
+        for attribute in node.iterfind("attribute"):
+            self._load_attribute(raw, attribute.attrib)
 
         if (children_node := node.find("children")) is not None:
             self.children.load(children_node)
 
+        self._loaded(raw)
+
+    def _load_attribute(self, raw: dict[str, str | tuple[str, str]], xml_attrs: dict[str, str]) -> None:
+        """Load an <attribute>, given its XML attributes, keeping the value undecoded in raw if it is defined."""
+        id = intern_value(xml_attrs.get("id"))
+        if (value := xml_attrs.get("value")) is None:
+            value = (xml_attrs.get("handle"), xml_attrs.get("version"))
+        if (definition := self._attributes_.get(id)) is not None:
+            raw[id] = definition.intern(value)
+        elif isinstance(value, tuple):
+            handle, version = value
+            setattr(self, id, (handle, int(version)))
+        else:
+            setattr(self, id, value)
+
+    def _loaded(self, raw: dict[str, str | tuple[str, str]]) -> None:
+        """Record the node's loaded attributes and children as unchanged."""
+        self.__dict__["_clean_"] = dict(raw)
+        self.__dict__["_clean_children_"] = tuple(self.__dict__.get("_children", ()))
+
+    @property
+    def is_dirty(self) -> bool:
+        """True if the node or its children have changed since the node was loaded or marked clean."""
+        return next(self._changed_fields(), None) is not None
+
+    def changed_fields(self) -> list[str]:
+        """
+        Returns the names of the attributes that have changed since the node was loaded or marked clean, together with
+        "children" if its children have been replaced, added, removed or changed. A node that was neither loaded nor
+        marked clean reports all of its set attributes and non-empty children.
+        """
+        return list(self._changed_fields())
+
+    def mark_clean(self) -> None:
+        """Record the node's current attributes and children as unchanged."""
+        children = tuple(self.__dict__.get("_children", ()))
+        for child in children:
+            child.mark_clean()
+        self.__dict__["_clean_"] = self._encoded_values()
+        self.__dict__["_clean_children_"] = children
+
+    def render_state(self) -> RenderState:
+        """
+        Returns what rendering the node needs, and nothing more: its type, the .lsx values of its set attributes, and
+        the render states of its children. This is what is sent to a worker process that renders the node.
+        """
+        return (type(self), self._encoded_values(),
+                [child.render_state() for child in self.__dict__.get("_children", ())])
+
+    @classmethod
+    def from_render_state(cls, state: RenderState) -> Self:
+        """Returns a node, with undecoded attribute values, recreated from its render state."""
+        node_type, values, children = state
+        node = node_type()
+        node.__dict__["_raw_"] = values
+        if children:
+            node.children = [cls.from_render_state(child) for child in children]
+        return node
+
     def xml(self) -> Element:
         """Returns an XML encoding of the node."""
         element = Element("node", id=self._id_)
+        raw = self.__dict__.get("_raw_")
         for id, attribute in self._attributes_.items():
-            if (value := getattr(self, id, None)) is not None:
+            if raw and (value := raw.get(id)) is not None:
+                element.append(attribute.raw_xml(id, value))
+            elif (value := getattr(self, id, None)) is not None:
                 element.append(attribute.xml(id, value))
         children: detail.LsxChildren[Self] = getattr(self, "children", [])
         if len(children) > 0:
@@ -83,3 +173,56 @@ class LsxNode:
             children: detail.LsxChildren[Self] = getattr(self, "children")
             attributes.append(f"children={children}")
         return f"{self._id_}({", ".join(attributes)})"
+
+    def _encoded_values(self) -> dict[str, str | tuple[str, str]]:
+        """Returns the .lsx values of the node's set attributes, by attribute id, without decoding undecoded values."""
+        state = self.__dict__
+        raw = state.get("_raw_") or {}
+        values: dict[str, str | tuple[str, str]] = {}
+        for id, attribute in self._attributes_.items():
+            if (value := raw.get(id)) is not None:
+                values[id] = value
+            elif "_" + id in state and (value := getattr(self, id)) is not None:  # Unset attributes have no store
+                values[id] = attribute.encode(value)
+        return values
+
+    def _changed_fields(self) -> Iterator[str]:
+        """Generate the names of the changed attributes, followed by "children" if the children have changed."""
+        clean = self.__dict__.get("_clean_")
+        raw = self.__dict__.get("_raw_") or {}
+        for id, attribute in self._attributes_.items():
+            if id not in raw:  # Undecoded values are unchanged
+                value = getattr(self, id)
+                if clean is None:
+                    if value is not None:
+                        yield id
+                elif (original := clean.get(id)) is None:
+                    if value is not None:
+                        yield id
+                elif attribute.decode(original) != value:
+                    yield id
+
+        children = self.__dict__.get("_children", ())
+        if clean is None:
+            if len(children) > 0:
+                yield "children"
+        elif tuple(children) != self.__dict__["_clean_children_"] or any(child.is_dirty for child in children):
+            yield "children"
+
+    @staticmethod
+    def _wrap_lazy_accessors(member: str,
+                             getter: Callable[[object], any],
+                             setter: Callable[[object, any], None]) -> tuple[Callable[[object], any],
+                                                                             Callable[[object, any], None]]:
+        """Wrap an attribute's accessors so that any undecoded value from load() is decoded on first access."""
+        def lazy_getter(obj: object) -> any:
+            if (raw := obj.__dict__.get("_raw_")) and (value := raw.pop(member, None)) is not None:
+                setter(obj, value)
+            return getter(obj)
+
+        def lazy_setter(obj: object, value: any) -> None:
+            if raw := obj.__dict__.get("_raw_"):
+                raw.pop(member, None)
+            setter(obj, value)
+
+        return (lazy_getter, lazy_setter)
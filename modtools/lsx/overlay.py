@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Layers of .lsx child nodes, stacked in the game's load order.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Self
+
+
+class LsxOverlay[Node]:
+    """
+    A stack of layers of .lsx child nodes, in load order, where a node in a later layer overrides the nodes with the
+    same key in earlier layers. Looking up a key checks the layers from the top down; the merged view of all of the
+    layers is only built when the overlay is iterated, and is kept until another layer is added.
+    """
+
+    type KeyFunction = Callable[[Node], Any]     # A function returning a key identifying a child node.
+
+    _key: KeyFunction                            # Identifies a node across the layers.
+    _order: KeyFunction | None                   # Orders the merged view, or None to keep the load order.
+    _layers: list[tuple[str, dict[Any, Node]]]   # (name, nodes by key) of each layer, bottom first.
+    _merged: list[Node] | None                   # The merged view, once built.
+
+    def __init__(self, layers: Iterable[Iterable[Node]] = (), *, key: KeyFunction, order: KeyFunction | None = None):
+        """Initialize the overlay with the key identifying its nodes, the order of its merged view, and its layers."""
+        self._key = key
+        self._order = order
+        self._layers = []
+        self._merged = None
+        for layer in layers:
+            self.add_layer(layer)
+
+    @property
+    def layers(self) -> list[str]:
+        """The names of the layers, bottom first."""
+        return [name for name, _ in self._layers]
+
+    def add_layer(self, children: Iterable[Node], *, name: str = "") -> Self:
+        """Add a layer on top of the others. Later nodes in the layer override earlier nodes with the same key."""
+        self._layers.append((name, {self._key(child): child for child in children}))
+        self._merged = None
+        return self
+
+    def __contains__(self, key: Any) -> bool:
+        return any(key in nodes for _, nodes in self._layers)
+
+    def __getitem__(self, key: Any) -> Node:
+        for _, nodes in reversed(self._layers):
+            if (node := nodes.get(key)) is not None:
+                return node
+        raise KeyError(key)
+
+    def get(self, key: Any, default: Node | None = None) -> Node | None:
+        """Return the topmost node with the key, or default if no layer has one."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def layer(self, key: Any) -> str | None:
+        """Return the name of the topmost layer having a node with the key, or None if no layer has one."""
+        for name, nodes in reversed(self._layers):
+            if key in nodes:
+                return name
+        return None
+
+    def __len__(self) -> int:
+        return len(self._view())
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(self._view())
+
+    def _view(self) -> list[Node]:
+        """
+        Return the merged view: each key in the position at which it was first loaded, holding its topmost node,
+        sorted by the overlay's order, if any.
+        """
+        if self._merged is None:
+            merged = {}
+            for _, nodes in self._layers:
+                merged.update(nodes)
+            self._merged = list(merged.values())
+            if self._order is not None:
+                self._merged.sort(key=self._order)
+        return self._merged
@@ -3,7 +3,7 @@
 Representation of .lsx types.
 """
 
-from modtools.lsx.attributes import LsxAttribute, LsxBool, LsxList, LsxNumber, LsxString, LsxTranslation
+from modtools.lsx.attributes import LsxAttribute, LsxBool, LsxGuid, LsxList, LsxNumber, LsxString, LsxTranslation
 
 
 class LsxType:
@@ -42,7 +42,7 @@ class LsxType:
     TRANSLATEDSTRING = LsxTranslation("TranslatedString")
     WSTRING = LsxString("WString")
     LSWSTRING = LsxList("LSWString")
-    GUID = LsxString("guid")
+    GUID = LsxGuid("guid")
     INT64 = LsxNumber("int64")
     TRANSLATEDFSSTRING = LsxString("TranslatedFSString")
 
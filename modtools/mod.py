@@ -6,19 +6,27 @@ The main mod definition for Baldur's Gate 3 mods.
 import hashlib
 import os
 import re
-import shutil
 import time
 
+from modtools.buildcache import BuildCache
 from modtools.gamedata import GameData, GameDataCollection
 from modtools.text import Text, TextCollection
 from modtools.unpak import Unpak
 from modtools.localization import Localization
 from modtools.lsx import Lsx
-from modtools.lsx.game import Dependencies, ModuleInfo
+from modtools.lsx.game import ClassDescription, Dependencies, ModuleInfo, Progression
 from modtools.lsx.node import LsxNode
-from typing import Tuple
+from modtools.output import DirectorySink, MemorySink, OutputSink, diff_manifests, load_manifest, save_manifest
+from modtools.profiler import BuildProfiler, profile_stage
+from modtools.reachability import ReachabilityGraph
+from modtools.render import render_files
+from modtools.symbols import SymbolTable, references, unresolved_references
+from typing import Final, Tuple
 from uuid import UUID
 
+# The build version recorded in meta.lsx by dry runs, so that their hashes are the same from one build to the next
+DRY_RUN_BUILD_VERSION: Final = 0
+
 
 class Mod:
     """Baldur's Gate 3 mod definition."""
@@ -33,6 +41,7 @@ class Mod:
     _level_20: bool
 
     _unpak: Unpak
+    _build_cache: BuildCache
 
     _localization: Localization
 
@@ -51,7 +60,8 @@ class Mod:
                  folder: str = None,
                  version: Tuple[int, int, int, int] = (4, 1, 1, 1),
                  cache_dir: os.PathLike | None = None,
-                 level_20: bool = False):
+                 level_20: bool = False,
+                 unpak: Unpak | None = None):
         """Define a mod.
 
         base_dir -- the base directory of the mod
@@ -61,6 +71,9 @@ class Mod:
         description -- an optional description for the mod (not localized)
         folder -- folder for the mod (defaults to the mod's name)
         version -- version of the mod (major, minor, revision, build)
+        cache_dir -- the directory of the unpak cache, and of the fingerprints of previous builds
+        level_20 -- whether the mod depends on the level 20 mod
+        unpak -- the source of the game's files, in place of an Unpak for cache_dir (e.g. for benchmarks)
         """
         self._author = author
         self._base_dir = base_dir
@@ -77,7 +90,8 @@ class Mod:
             m.update(bytes(f"BG3:{author}:{name}", "UTF-8"))
             self._uuid = UUID(bytes=m.digest()[0:16])
 
-        self._unpak = Unpak(cache_dir)
+        self._unpak = unpak or Unpak(cache_dir)
+        self._build_cache = BuildCache(cache_dir or os.path.join(os.path.dirname(__file__), ".cache"), self._folder)
 
         self._localization = Localization(self._uuid)
         self._localization.add_language("en", "English")
@@ -125,8 +139,14 @@ class Mod:
         return self._localization
 
     def get_cache_path(self, lsx_path: os.PathLike) -> os.PathLike:
-        """Get the path of a file in the unpak cache."""
-        return self._unpak.get_path(lsx_path)
+        """Get the path of a file in the unpak cache, recording it as an input of the build."""
+        try:
+            path = self._unpak.get_path(lsx_path)
+        except FileNotFoundError:
+            self._build_cache.record_input(lsx_path, None)
+            raise
+        self._build_cache.record_input(lsx_path, path)
+        return path
 
     @property
     def level_20(self) -> bool:
@@ -149,9 +169,9 @@ class Mod:
         else:
             raise TypeError("add: Invalid data type")
 
-    def _add_meta(self) -> None:
+    def _add_meta(self, build_version: int) -> None:
         """Add the meta definition."""
-        build_version = str(time.time_ns())
+        build_version = str(build_version)
 
         self.add(self._dependencies)
         self.add(ModuleInfo(
@@ -186,14 +206,158 @@ class Mod:
             ],
         ))
 
-    def build(self) -> None:
-        """Build the mod files underneath the _base_dir."""
-        mod_dir = os.path.join(self._base_dir, self._folder)
-        if os.path.exists(mod_dir):
-            shutil.rmtree(mod_dir)
-        os.makedirs(mod_dir, exist_ok=True)
-        self._add_meta()
-        self._game_data.build(mod_dir, self._folder)
-        self._lsx.save(mod_dir, version=self._version, folder=self._folder)
-        self._text.save(mod_dir, folder=self._folder)
-        self._localization.build(mod_dir)
+    def check_references(self) -> list[str]:
+        """Return a message for each name that the mod references, but neither the game nor the mod defines."""
+        symbols = SymbolTable.load(self.get_cache_path)
+        symbols.add_game_data(self._game_data)
+        symbols.add_lsx(self._lsx.children)
+        return [
+            f"{referrer}: unresolved {kind} reference: {name}"
+            for referrer, kind, name in unresolved_references(symbols, self._game_data, self._lsx.children)
+        ]
+
+    def prune(self) -> list[GameData]:
+        """Remove, and return, the spell, status, passive, and interrupt entries that nothing in the mod reaches."""
+        graph = ReachabilityGraph(self._game_data,
+                                  self._lsx.children,
+                                  self._text,
+                                  SymbolTable.load(self.get_cache_path))
+        unreachable = graph.unreachable()
+        self._game_data.remove(unreachable)
+        return unreachable
+
+    def build(self,
+              *,
+              jobs: int | None = None,
+              check_references: bool = False,
+              prune: bool = False,
+              profile: BuildProfiler | None = None,
+              output: OutputSink | None = None,
+              dry_run: bool = False,
+              force: bool = False,
+              validate: bool = False,
+              manifest: os.PathLike | None = None) -> None:
+        """Build the mod files underneath the _base_dir.
+
+        A build into the mod's directory is skipped when its fingerprint (the hashes of the script, the library modules
+        that it imported, the unpak cache files that it read, and its arguments) matches that of the previous build, and
+        the previous build's output is unchanged.
+
+        jobs -- if given, render the files in this many worker processes and report the time taken by each stage
+        check_references -- if True, report references to names that neither the game nor the mod defines
+        prune -- if True, omit the spell, status, passive, and interrupt entries that nothing in the mod reaches
+        profile -- if given, record the time and memory taken by each stage of the build
+        output -- if given, write the files to this sink rather than to the mod's directory
+        dry_run -- if True, render the files in memory and print the SHA-256 hash of each, rather than writing them;
+                   meta.lsx records a build version of DRY_RUN_BUILD_VERSION rather than the build time
+        force -- if True, build the mod even if the previous build is current
+        validate -- if True, parse the functors and conditions of the mod's game data, raising ValueError if any are
+                    invalid
+        manifest -- if given, make a dry run, report the mod's files that were added, removed, or changed since the
+                    manifest saved at this path by a previous dry run, and update the mod's entries in it; one
+                    manifest may be shared by several mods
+        """
+        dry_run = dry_run or manifest is not None
+        cached = output is None and not dry_run and profile is None
+        if cached and not force and self.is_up_to_date(check_references=check_references, prune=prune):
+            print(f"{self._name}: up to date")
+            return
+
+        if dry_run:
+            output = MemorySink()
+        elif output is None:
+            output = DirectorySink(self._output_dir())
+        with profile_stage(profile, "Mod.build"):
+            self._build(jobs=jobs, check_references=check_references, prune=prune, validate=validate, profile=profile,
+                        output=output, build_version=DRY_RUN_BUILD_VERSION if dry_run else time.time_ns())
+        if cached:
+            self._build_cache.save(self._build_options(check_references, prune), self._output_dir(),
+                                   touched=self._touched_keys())
+        else:
+            self._build_cache.save_touched(self._touched_keys())
+        if dry_run:
+            hashes = {f"{self._folder}/{path}": digest for path, digest in output.manifest().items()}
+            for path, digest in hashes.items():
+                print(f"{digest}  {path}")
+            if manifest is not None:
+                # The manifest may be shared with other mods, whose entries are kept as they are
+                saved = load_manifest(manifest)
+                prefix = f"{self._folder}/"
+                previous = {path: digest for path, digest in saved.items() if path.startswith(prefix)}
+                for difference in diff_manifests(previous, hashes):
+                    print(f"{self._name}: {difference}")
+                others = {path: digest for path, digest in saved.items() if not path.startswith(prefix)}
+                save_manifest(manifest, dict(sorted((others | hashes).items())))
+
+    def is_up_to_date(self, *, check_references: bool = False, prune: bool = False) -> bool:
+        """Return True if the previous build of the mod's directory, with the same options, is current."""
+        return self._build_cache.is_current(self._build_options(check_references, prune),
+                                            self._unpak.get_path,
+                                            self._output_dir())
+
+    def _output_dir(self) -> str:
+        return os.path.join(self._base_dir, self._folder)
+
+    def _touched_keys(self) -> list[str | list[str | int | bool]]:
+        """
+        Return the keys of the game table entries that the mod's .lsx nodes add, override, or refer to, as gamediff keys
+        them: each node's UUID, each progression's [Name, Level, IsMulticlass], the UUIDs of the spell and passive
+        lists that the progressions' selectors and the class descriptions name, and the class descriptions' parents.
+        """
+        keys = []
+        referenced = {str(name) for _, kind, name in references([], self._lsx.children)
+                      if kind in ("SpellList", "PassiveList")}
+        for node in self._lsx.children:
+            if (uuid := getattr(node, "UUID", None)) is not None:
+                keys.append(str(uuid))
+            if isinstance(node, Progression):
+                keys.append([node.Name, node.Level, node.IsMulticlass or False])
+            elif isinstance(node, ClassDescription):
+                referenced.update(str(uuid) for uuid in (node.ParentGuid, node.SpellList) if uuid)
+        keys.extend(sorted(referenced.difference(key for key in keys if isinstance(key, str))))
+        return keys
+
+    def _build_options(self, check_references: bool, prune: bool) -> dict[str, object]:
+        return {
+            "output_dir": os.path.abspath(self._output_dir()),
+            "version": self._version,
+            "check_references": check_references,
+            "prune": prune,
+        }
+
+    def _build(self,
+               *,
+               jobs: int | None,
+               check_references: bool,
+               prune: bool,
+               validate: bool,
+               profile: BuildProfiler | None,
+               output: OutputSink,
+               build_version: int) -> None:
+        if validate:
+            with profile_stage(profile, "validate"):
+                self._game_data.validate()
+        if check_references:
+            with profile_stage(profile, "check_references"):
+                for message in self.check_references():
+                    print(f"{self._name}: {message}")
+        if prune:
+            with profile_stage(profile, "prune"):
+                for data in self.prune():
+                    print(f"{self._name}: pruned unreachable {data._id_} {data.name}")
+        output.clear()
+        output.makedirs(os.path.join("Public", self._folder, "Stats", "Generated", "Data"))
+        self._add_meta(build_version)
+        with profile_stage(profile, "render"):
+            timings = render_files(output, {
+                "Stats": self._game_data.render_tasks(self._folder),
+                "Lsx": self._lsx.render_tasks(version=self._version, folder=self._folder),
+                "Text": self._text.render_tasks(folder=self._folder),
+                "Localization": self._localization.render_tasks(),
+            }, jobs=jobs)
+            if profile:
+                profile.add_timings(timings)
+        output.close()
+        if jobs is not None:
+            for stage, timing in timings.items():
+                print(f"{self._name} {stage}: {timing}")
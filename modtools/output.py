@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Destinations for rendered mod files: a directory, memory, or a .zip file.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+from collections.abc import Iterator, Mapping
+from pathlib import PurePath
+from zipfile import ZIP_DEFLATED, ZipFile
+
+
+class OutputSink:
+    """A destination for rendered mod files, addressed by their paths relative to the mod directory."""
+
+    def clear(self) -> None:
+        """Remove any previous output."""
+        pass
+
+    def makedirs(self, path: os.PathLike) -> None:
+        """Create a directory, for destinations that have them."""
+        pass
+
+    def write(self, path: os.PathLike, content: str | bytes) -> None:
+        """Write a file; str content is encoded as UTF-8, without newline translation, and bytes are written as is."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish writing the output."""
+        pass
+
+
+class DirectorySink(OutputSink):
+    """Writes the files underneath a directory."""
+
+    _root: os.PathLike
+
+    def __init__(self, root: os.PathLike):
+        self._root = root
+
+    @property
+    def root(self) -> os.PathLike:
+        return self._root
+
+    def clear(self) -> None:
+        if os.path.exists(self._root):
+            shutil.rmtree(self._root)
+
+    def makedirs(self, path: os.PathLike) -> None:
+        os.makedirs(os.path.join(self._root, path), exist_ok=True)
+
+    def write(self, path: os.PathLike, content: str | bytes) -> None:
+        path = os.path.normpath(os.path.join(self._root, path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content if isinstance(content, bytes) else content.encode("utf-8"))
+
+
+class MemorySink(OutputSink):
+    """Keeps the files in memory, e.g. to check a build's output without writing it."""
+
+    _files: dict[str, bytes]  # POSIX path -> content
+
+    def __init__(self):
+        self._files = {}
+
+    @property
+    def files(self) -> dict[str, bytes]:
+        return dict(self._files)
+
+    def clear(self) -> None:
+        self._files.clear()
+
+    def write(self, path: os.PathLike, content: str | bytes) -> None:
+        self._files[PurePath(path).as_posix()] = content if isinstance(content, bytes) else content.encode("utf-8")
+
+    def manifest(self) -> dict[str, str]:
+        """Return the SHA-256 hash of each file's content, by path, in path order."""
+        return {path: hashlib.sha256(self._files[path]).hexdigest() for path in sorted(self._files)}
+
+
+def load_manifest(manifest_path: os.PathLike) -> dict[str, str]:
+    """Load a manifest saved by save_manifest(), or return an empty manifest if there is none."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest_path: os.PathLike, manifest: Mapping[str, str]) -> None:
+    """Save a manifest of file hashes, by path, as JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8", newline="") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def diff_manifests(previous: Mapping[str, str], current: Mapping[str, str]) -> Iterator[str]:
+    """Describe each file that was added, removed, or changed between two manifests, in path order."""
+    for path in sorted(previous.keys() | current.keys()):
+        if path not in previous:
+            yield f"added {path}"
+        elif path not in current:
+            yield f"removed {path}"
+        elif previous[path] != current[path]:
+            yield f"changed {path}"
+
+
+class ZipSink(OutputSink):
+    """Writes the files into a .zip file, underneath an optional root directory."""
+
+    _zip_path: os.PathLike
+    _root: str
+    _zip_file: ZipFile | None
+
+    def __init__(self, zip_path: os.PathLike, root: str = ""):
+        self._zip_path = zip_path
+        self._root = root
+        self._zip_file = None
+
+    def clear(self) -> None:
+        self.close()
+        if os.path.exists(self._zip_path):
+            os.remove(self._zip_path)
+
+    def write(self, path: os.PathLike, content: str | bytes) -> None:
+        if self._zip_file is None:
+            self._zip_file = ZipFile(self._zip_path, "a", compression=ZIP_DEFLATED)
+        self._zip_file.writestr(PurePath(self._root, path).as_posix(), content)
+
+    def close(self) -> None:
+        if self._zip_file is not None:
+            self._zip_file.close()
+            self._zip_file = None
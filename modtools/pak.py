@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Reading and writing of Baldur's Gate 3 .pak (LSPK version 18) packages.
+"""
+
+import os
+import struct
+import zlib
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import IntEnum
+from modtools.output import OutputSink
+from pathlib import PurePath
+from typing import Final
+
+try:
+    import lz4.block as lz4_block
+except ImportError:
+    lz4_block = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+LSPK_SIGNATURE: Final = b"LSPK"
+LSPK_VERSION: Final = 18
+
+# Signature, then version, file list offset, file list size, flags, priority, MD5, number of parts
+_HEADER: Final = struct.Struct("<4sIQIBB16sH")
+
+# Name, offset (low 32 bits), offset (high 16 bits), archive part, flags, size on disk, uncompressed size
+_FILE_ENTRY: Final = struct.Struct("<256sIHBBII")
+
+_MAX_NAME_LENGTH: Final = 256
+
+
+class CompressionMethod(IntEnum):
+    """The compression methods of .pak entries, as found in the low bits of an entry's flags."""
+    NONE = 0
+    ZLIB = 1
+    LZ4 = 2
+    ZSTD = 3
+
+
+class CompressionLevel(IntEnum):
+    """The compression levels of .pak entries, as found in the high bits of an entry's flags."""
+    FAST = 0x10
+    DEFAULT = 0x20
+    MAX = 0x40
+
+
+_ZLIB_LEVELS: Final = {CompressionLevel.FAST: 1, CompressionLevel.DEFAULT: 6, CompressionLevel.MAX: 9}
+_ZSTD_LEVELS: Final = {CompressionLevel.FAST: 1, CompressionLevel.DEFAULT: 3, CompressionLevel.MAX: 19}
+
+
+def _lz4_literal_block(data: bytes) -> bytes:
+    """Encode data as an LZ4 block consisting of a single run of literals, for when lz4 is not installed."""
+    length = len(data)
+    if length < 15:
+        return bytes([length << 4]) + data
+    extra = length - 15
+    return bytes([0xF0]) + b"\xFF" * (extra // 255) + bytes([extra % 255]) + data
+
+
+def _lz4_compress(data: bytes, level: CompressionLevel) -> bytes:
+    """Compress data as an LZ4 block, without a size prefix."""
+    if lz4_block is None:
+        return _lz4_literal_block(data)
+    if level == CompressionLevel.FAST:
+        return lz4_block.compress(data, store_size=False)
+    return lz4_block.compress(data, mode="high_compression", compression=12 if level == CompressionLevel.MAX else 9,
+                              store_size=False)
+
+
+def _lz4_decompress(data: bytes, size: int) -> bytes:
+    """Decompress an LZ4 block of a known uncompressed size, in Python if lz4 is not installed."""
+    if lz4_block is not None:
+        return lz4_block.decompress(data, uncompressed_size=size)
+
+    def length(nibble: int, i: int) -> tuple[int, int]:
+        if nibble == 15:
+            while True:
+                nibble += data[i]
+                i += 1
+                if data[i - 1] != 255:
+                    break
+        return (nibble, i)
+
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        token = data[i]
+        literals, i = length(token >> 4, i + 1)
+        out += data[i:i + literals]
+        i += literals
+        if i >= len(data):
+            break
+        offset = data[i] | data[i + 1] << 8
+        match, i = length(token & 15, i + 2)
+        match += 4
+        start = len(out) - offset
+        if offset >= match:
+            out += out[start:start + match]
+        else:  # The match overlaps its own output, repeating the last offset bytes
+            for k in range(match):
+                out.append(out[start + k])
+    if len(out) != size:
+        raise ValueError(f"LZ4 block decompressed to {len(out)} bytes, rather than {size}")
+    return bytes(out)
+
+
+def _compress(data: bytes, method: CompressionMethod, level: CompressionLevel) -> bytes:
+    match method:
+        case CompressionMethod.NONE:
+            return data
+        case CompressionMethod.ZLIB:
+            return zlib.compress(data, _ZLIB_LEVELS[level])
+        case CompressionMethod.LZ4:
+            return _lz4_compress(data, level)
+        case CompressionMethod.ZSTD:
+            return zstandard.ZstdCompressor(level=_ZSTD_LEVELS[level]).compress(data)
+
+
+@dataclass(frozen=True)
+class PakEntry:
+    """An entry in a package's file table."""
+    name: str               # The entry's POSIX path
+    offset: int             # The offset of the entry's data in its archive part
+    size_on_disk: int       # The size of the entry's (possibly compressed) data
+    uncompressed_size: int  # The size of the entry's uncompressed data, or 0 if it is not compressed
+    part: int               # The archive part holding the entry's data: 0 for the .pak itself, n for <name>_n.pak
+    flags: int              # The entry's compression method and level
+
+    @property
+    def method(self) -> CompressionMethod:
+        return CompressionMethod(self.flags & 0x0F)
+
+
+@dataclass(frozen=True)
+class PakHeader:
+    """The header of a package."""
+    file_list_offset: int   # The offset of the file table
+    file_list_size: int     # The size of the file table, including its entry count and compressed size
+    flags: int              # The package's flags
+    priority: int           # The package's load priority
+    num_parts: int          # The number of archive parts
+
+
+def read_pak_header(pak_path: os.PathLike) -> PakHeader:
+    """Read the header of a .pak package."""
+    with open(pak_path, "rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{pak_path}: not an LSPK package")
+    signature, version, file_list_offset, file_list_size, flags, priority, _, num_parts = _HEADER.unpack(header)
+    if signature != LSPK_SIGNATURE or version != LSPK_VERSION:
+        raise ValueError(f"{pak_path}: not an LSPK version {LSPK_VERSION} package")
+    return PakHeader(file_list_offset, file_list_size, flags, priority, num_parts)
+
+
+def read_pak_entries(pak_path: os.PathLike) -> list[PakEntry]:
+    """Read the file table of a .pak package."""
+    header = read_pak_header(pak_path)
+    with open(pak_path, "rb") as f:
+        f.seek(header.file_list_offset)
+        count, compressed_size = struct.unpack("<II", f.read(8))
+        table = _lz4_decompress(f.read(compressed_size), count * _FILE_ENTRY.size)
+    return [PakEntry(name.rstrip(b"\0").decode("utf-8"), offset_low | offset_high << 32, size_on_disk,
+                     uncompressed_size, part, flags)
+            for name, offset_low, offset_high, part, flags, size_on_disk, uncompressed_size
+            in _FILE_ENTRY.iter_unpack(table)]
+
+
+def read_pak_entry(pak_path: os.PathLike, entry: PakEntry) -> bytes:
+    """Read the decompressed data of an entry of a .pak package."""
+    if entry.part:
+        base, extension = os.path.splitext(pak_path)
+        pak_path = f"{base}_{entry.part}{extension}"
+    with open(pak_path, "rb") as f:
+        f.seek(entry.offset)
+        data = f.read(entry.size_on_disk)
+    if len(data) != entry.size_on_disk:
+        raise ValueError(f"{pak_path}: {entry.name} is truncated")
+
+    match entry.method:
+        case CompressionMethod.NONE:
+            return data
+        case CompressionMethod.ZLIB:
+            return zlib.decompress(data)
+        case CompressionMethod.LZ4:
+            return _lz4_decompress(data, entry.uncompressed_size)
+        case CompressionMethod.ZSTD:
+            if zstandard is None:
+                raise ValueError(f"{pak_path}: {entry.name} requires the zstandard package")
+            return zstandard.ZstdDecompressor().decompress(data, max_output_size=entry.uncompressed_size)
+
+
+class PakWriter:
+    """
+    Writes files into an LSPK version 18 .pak package.
+
+    The files are compressed in parallel, in worker threads (zlib, lz4, and zstandard release the GIL while
+    compressing), then written in the order that they were added, followed by the file table.
+    """
+
+    _method: CompressionMethod
+    _level: CompressionLevel
+    _priority: int
+    _jobs: int | None
+    _files: dict[str, bytes]  # POSIX path -> uncompressed content
+
+    def __init__(self,
+                 *,
+                 method: CompressionMethod = CompressionMethod.ZLIB,
+                 level: CompressionLevel = CompressionLevel.DEFAULT,
+                 priority: int = 0,
+                 jobs: int | None = None):
+        """Create a package writer.
+
+        method -- the compression method of the entries; LZ4 requires the lz4 package, and ZSTD the zstandard package
+        level -- the compression level of the entries
+        priority -- the package's load priority
+        jobs -- the number of threads compressing entries (default: the number of processors)
+        """
+        if method == CompressionMethod.LZ4 and lz4_block is None:
+            raise ValueError("LZ4 compression requires the lz4 package")
+        if method == CompressionMethod.ZSTD and zstandard is None:
+            raise ValueError("Zstandard compression requires the zstandard package")
+        self._method = method
+        self._level = level
+        self._priority = priority
+        self._jobs = jobs
+        self._files = {}
+
+    def add(self, path: os.PathLike, content: bytes) -> None:
+        """Add a file, replacing any existing file with the same path."""
+        name = PurePath(path).as_posix()
+        if len(name.encode("utf-8")) >= _MAX_NAME_LENGTH:
+            raise ValueError(f"{name}: path is too long for a .pak entry")
+        self._files[name] = content
+
+    def add_directory(self, directory: os.PathLike) -> None:
+        """Add the files underneath a directory, by their paths relative to it."""
+        for dir_path, dir_names, filenames in os.walk(directory):
+            dir_names.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dir_path, filename)
+                with open(path, "rb") as f:
+                    self.add(os.path.relpath(path, directory), f.read())
+
+    def write(self, pak_path: os.PathLike) -> None:
+        """Write the package."""
+        names = list(self._files)
+        with ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            compressed = list(executor.map(lambda name: _compress(self._files[name], self._method, self._level),
+                                           names))
+
+        flags = 0 if self._method == CompressionMethod.NONE else self._method | self._level
+        entries = bytearray()
+        with open(pak_path, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            for name, data in zip(names, compressed):
+                offset = f.tell()
+                f.write(data)
+                entries += _FILE_ENTRY.pack(name.encode("utf-8"), offset & 0xFFFFFFFF, offset >> 32, 0, flags,
+                                            len(data), len(self._files[name]) if flags else 0)
+
+            file_list_offset = f.tell()
+            file_list = _lz4_compress(bytes(entries), CompressionLevel.MAX)
+            f.write(struct.pack("<II", len(names), len(file_list)))
+            f.write(file_list)
+            file_list_size = f.tell() - file_list_offset
+
+            f.seek(0)
+            f.write(_HEADER.pack(LSPK_SIGNATURE, LSPK_VERSION, file_list_offset, file_list_size, 0, self._priority,
+                                 bytes(16), 1))
+
+
+class PakSink(OutputSink):
+    """Writes a mod's rendered files straight into a .pak package, when the output is closed."""
+
+    _pak_path: os.PathLike
+    _writer: PakWriter
+
+    def __init__(self, pak_path: os.PathLike, **kwds):
+        """Create the sink; the keyword arguments are those of PakWriter."""
+        self._pak_path = pak_path
+        self._writer = PakWriter(**kwds)
+
+    def clear(self) -> None:
+        if os.path.exists(self._pak_path):
+            os.remove(self._pak_path)
+
+    def write(self, path: os.PathLike, content: str | bytes) -> None:
+        self._writer.add(path, content if isinstance(content, bytes) else content.encode("utf-8"))
+
+    def close(self) -> None:
+        self._writer.write(self._pak_path)
+
+
+def write_pak(pak_path: os.PathLike, directories: Iterable[os.PathLike], **kwds) -> None:
+    """Pack the files underneath the directories (e.g. a built mod's directory) into a .pak package."""
+    writer = PakWriter(**kwds)
+    for directory in directories:
+        writer.add_directory(directory)
+    writer.write(pak_path)
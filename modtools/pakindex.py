@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+An index of the entries of the game's .pak packages, so that entries can be found without searching the packages.
+"""
+
+import fnmatch
+import json
+import os
+
+from modtools.pak import PakEntry, read_pak_entries, read_pak_header
+from pathlib import PurePath
+from typing import Any, Final
+
+_INDEX_VERSION: Final = 1  # The version of the persisted index format
+
+
+class _PakTable:
+    """The indexed file table of a package."""
+
+    filename: str                             # The package's path
+    priority: int                             # The package's load priority
+    _names: list[str]                         # The entries' paths, in file table order
+    _fields: list[int]                        # The entries' offset, size on disk, uncompressed size, part, and flags
+    _by_name: dict[str, int]                  # Entry path -> position in the file table
+    _dirs: dict[str, dict[str, None]] | None  # Directory path -> the names of its files and subdirectories, once built
+
+    def __init__(self, filename: str, record: dict[str, Any]):
+        self.filename = filename
+        self.priority = record["priority"]
+        self._names = record["names"]
+        self._fields = record["entries"]
+        self._by_name = {name: i for i, name in enumerate(self._names)}
+        self._dirs = None
+
+    @staticmethod
+    def record(filename: str, stat: os.stat_result) -> dict[str, Any]:
+        """Read a package's file table, returning the record of it that is persisted in the index."""
+        entries = read_pak_entries(filename)
+        return {
+            "version": _INDEX_VERSION,
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "priority": read_pak_header(filename).priority,
+            "names": [entry.name for entry in entries],
+            "entries": [field for entry in entries
+                        for field in (entry.offset, entry.size_on_disk, entry.uncompressed_size, entry.part,
+                                      entry.flags)],
+        }
+
+    @property
+    def names(self) -> list[str]:
+        return self._names
+
+    def entry(self, name: str) -> PakEntry | None:
+        if (i := self._by_name.get(name)) is None:
+            return None
+        return PakEntry(name, *self._fields[i * 5:i * 5 + 5])
+
+    def glob(self, pattern: str) -> list[str]:
+        """Return the paths matching a pattern of fnmatch patterns, one per directory level."""
+        if self._dirs is None:
+            self._dirs = {}
+            for name in self._names:
+                path, separator, child = name.rpartition("/")
+                while child not in (children := self._dirs.setdefault(path, {})):
+                    children[child] = None
+                    if not separator:
+                        break
+                    path, separator, child = path.rpartition("/")
+
+        matches = [""]
+        for component in pattern.split("/"):
+            is_literal = not any(c in component for c in "*?[")
+            next_matches = []
+            for path in matches:
+                if children := self._dirs.get(path):
+                    if is_literal:
+                        names = [component] if component in children else []
+                    else:
+                        names = [child for child in children if fnmatch.fnmatchcase(child, component)]
+                    next_matches += [f"{path}/{name}" if path else name for name in names]
+            matches = next_matches
+        return [path for path in matches if path in self._by_name]
+
+
+class PakIndex:
+    """
+    An index of the entries in .pak packages, read from each package's file table once per version of the package
+    (its modification time and size), and persisted in the index directory. Entries are looked up by .pak path, such
+    as "Shared.pak/Public/Shared/Tags/<uuid>.lsf", without reading the packages.
+    """
+
+    _index_dir: str                  # Where the index of each package is persisted
+    _pak_dirs: list[str]             # The directories searched for packages, in order
+    _tables: dict[str, _PakTable]    # Package name (without .pak) -> its indexed file table, once loaded
+    _owners: dict[str, str] | None   # Entry path -> the name of the package that provides it, once built
+
+    def __init__(self, index_dir: os.PathLike, pak_dirs: list[os.PathLike]):
+        self._index_dir = str(index_dir)
+        self._pak_dirs = [str(pak_dir) for pak_dir in pak_dirs]
+        self._tables = {}
+        self._owners = None
+
+    @staticmethod
+    def split(pak_path: str) -> tuple[str, str]:
+        """Split a .pak path into the package's name (without .pak) and the entry's path."""
+        pak_name, _, name = PurePath(pak_path).as_posix().partition("/")
+        return (pak_name.removesuffix(".pak"), name)
+
+    def pak_filename(self, pak_name: str) -> str:
+        """Return the path of a package, raising FileNotFoundError if it is in none of the package directories."""
+        for pak_dir in self._pak_dirs:
+            if os.path.isfile(filename := os.path.join(pak_dir, f"{pak_name}.pak")):
+                return filename
+        raise FileNotFoundError(f"{pak_name}.pak not found in {", ".join(self._pak_dirs)}")
+
+    def _table(self, pak_name: str) -> _PakTable:
+        """Return the indexed file table of a package, reading the package only if its index is missing or stale."""
+        if (table := self._tables.get(pak_name)) is not None:
+            return table
+
+        filename = self.pak_filename(pak_name)
+        stat = os.stat(filename)
+        index_path = os.path.join(self._index_dir, f"{pak_name}.json")
+        try:
+            with open(index_path, "r") as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            record = None
+        if record is None or (record.get("version"), record.get("mtime"), record.get("size")) != (
+                _INDEX_VERSION, stat.st_mtime_ns, stat.st_size):
+            record = _PakTable.record(filename, stat)
+            os.makedirs(self._index_dir, exist_ok=True)
+            with open(index_path, "w") as f:
+                json.dump(record, f, separators=(",", ":"))
+
+        table = self._tables[pak_name] = _PakTable(filename, record)
+        return table
+
+    def entry(self, pak_path: str) -> PakEntry | None:
+        """
+        Return a package's entry, or None if the package has no such entry. An .lsf.lsx path, as found in the unpak
+        cache, names its .lsf entry.
+        """
+        pak_name, name = self.split(pak_path)
+        table = self._table(pak_name)
+        if (entry := table.entry(name)) is None and name.endswith(".lsf.lsx"):
+            entry = table.entry(name.removesuffix(".lsx"))
+        return entry
+
+    def exists(self, pak_path: str) -> bool:
+        """Return True if a package has the entry."""
+        return self.entry(pak_path) is not None
+
+    def glob(self, pattern: str) -> list[str]:
+        """
+        Return the .pak paths of the entries of a package matching a pattern of fnmatch patterns, one per directory
+        level, such as "Shared.pak/Public/*/Tags/*.lsf".
+        """
+        pak_name, pattern = self.split(pattern)
+        return [f"{pak_name}.pak/{name}" for name in self._table(pak_name).glob(pattern)]
+
+    def owner(self, name: str) -> str | None:
+        """
+        Return the name of the package that provides an entry (such as "Public/Shared/Tags/<uuid>.lsf") to the game:
+        of the packages in the package directories that have the entry, the one with the highest priority, or the
+        last one loaded. Returns None if no package has the entry.
+        """
+        if self._owners is None:
+            self._owners = {}
+            tables: dict[str, _PakTable] = {}
+            for pak_dir in self._pak_dirs:
+                for filename in sorted(os.listdir(pak_dir)) if os.path.isdir(pak_dir) else ():
+                    pak_name, extension = os.path.splitext(filename)
+                    if extension == ".pak" and pak_name not in tables:
+                        try:
+                            tables[pak_name] = self._table(pak_name)
+                        except ValueError:  # An archive part, or a package of another version
+                            pass
+            for pak_name, table in sorted(tables.items(), key=lambda item: item[1].priority):
+                self._owners.update(dict.fromkeys(table.names, pak_name))
+        return self._owners.get(PurePath(name).as_posix())
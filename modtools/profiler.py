@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Profiling of mod builds: wall time and peak traced memory per build stage and builder function.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from modtools.render import StageTiming
+from typing import Any, ContextManager
+
+
+@dataclass
+class StageProfile:
+    """The accumulated measurements of a build stage."""
+    calls: int = 0                  # The number of times the stage was entered
+    wall: float = 0.0               # Total wall time, in seconds
+    peak_memory: int | None = None  # The peak traced memory while in the stage, in bytes; None if not traced
+
+
+class BuildProfiler:
+    """
+    Records the wall time and peak traced memory of nested build stages, e.g. Replacer.build/spell_list_builder.
+
+    Profiling starts when the outermost stage is entered and stops when it is exited, at which point the optional
+    cProfile statistics and JSON summary are written, and the report is printed. Tracing memory with tracemalloc
+    slows the build down considerably; pass memory=False to time the stages alone.
+    """
+
+    _memory: bool                          # Whether to trace memory
+    _cprofile_path: str | None             # Where to write the cProfile statistics
+    _summary_path: str | None              # Where to write the JSON summary
+    _stages: dict[str, StageProfile]       # Stage path -> StageProfile, in first entry order
+    _stack: list[tuple[str, int]]          # The entered stage paths, and the peak memory seen so far in each
+    _profile: cProfile.Profile | None      # The active cProfile profiler
+    _started_tracemalloc: bool             # Whether tracemalloc was started by this profiler
+
+    def __init__(self,
+                 *,
+                 memory: bool = True,
+                 cprofile_path: os.PathLike | None = None,
+                 summary_path: os.PathLike | None = None):
+        """Create a profiler.
+
+        memory -- if True, record the peak traced memory of each stage
+        cprofile_path -- if given, write the cProfile statistics of the whole build to this file
+        summary_path -- if given, write a JSON summary of the stages to this file
+        """
+        self._memory = memory
+        self._cprofile_path = cprofile_path
+        self._summary_path = summary_path
+        self._stages = {}
+        self._stack = []
+        self._profile = None
+        self._started_tracemalloc = False
+
+    @property
+    def stages(self) -> dict[str, StageProfile]:
+        return dict(self._stages)
+
+    def _start(self) -> None:
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self._cprofile_path:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _stop(self) -> None:
+        if self._profile:
+            self._profile.disable()
+            self._profile.dump_stats(self._cprofile_path)
+            self._profile = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if self._summary_path:
+            self.save(self._summary_path)
+        print(self)
+
+    def _traced_peak(self) -> int:
+        """Return the peak traced memory since the last reset, then reset it."""
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Record the time and memory taken within the context as a stage, nested within any enclosing stage."""
+        if not self._stack:
+            self._start()
+        memory = self._memory and tracemalloc.is_tracing()
+        if memory and self._stack:
+            # The enclosing stage's peak so far, before the peak is reset for this stage
+            path, peak = self._stack[-1]
+            self._stack[-1] = (path, max(peak, self._traced_peak()))
+        elif memory:
+            tracemalloc.reset_peak()
+        path = f"{self._stack[-1][0]}/{name}" if self._stack else name
+        stage = self._stages.setdefault(path, StageProfile())
+        self._stack.append((path, 0))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            _, peak = self._stack.pop()
+            stage.calls += 1
+            stage.wall += wall
+            if memory:
+                peak = max(peak, self._traced_peak())
+                stage.peak_memory = max(stage.peak_memory or 0, peak)
+                if self._stack:
+                    outer_path, outer_peak = self._stack[-1]
+                    self._stack[-1] = (outer_path, max(outer_peak, peak))
+            if not self._stack:
+                self._stop()
+
+    def wrap[F: Callable[..., Any]](self, fn: F, name: str | None = None) -> F:
+        """Return a wrapper for fn that records each call as a stage; the wrapper keeps fn's attributes."""
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwds: Any) -> Any:
+            with self.stage(name or fn.__name__):
+                return fn(*args, **kwds)
+        return wrapper
+
+    def add_timings(self, timings: dict[str, StageTiming]) -> None:
+        """Add the render and write times of render_files() as stages within the current stage."""
+        prefix = f"{self._stack[-1][0]}/" if self._stack else ""
+        for name, timing in timings.items():
+            stage = self._stages.setdefault(f"{prefix}{name}", StageProfile())
+            stage.calls += timing.files
+            stage.wall += timing.render + timing.write
+
+    def summary(self) -> dict[str, Any]:
+        """Return the stages as a JSON-serializable dictionary."""
+        return {
+            "stages": [{"stage": path, **asdict(stage)} for path, stage in self._stages.items()],
+        }
+
+    def save(self, path: os.PathLike) -> None:
+        """Write the JSON summary of the stages."""
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write("\n")
+
+    def __str__(self) -> str:
+        lines = []
+        for path, stage in self._stages.items():
+            memory = "" if stage.peak_memory is None else f", peak {stage.peak_memory / (1024 * 1024):.1f} MiB"
+            lines.append(f"{path}: {stage.calls} call(s), {stage.wall:.3f}s{memory}")
+        return "\n".join(lines)
+
+
+def profile_stage(profiler: BuildProfiler | None, name: str) -> ContextManager[None]:
+    """Return profiler.stage(name), or a context that does nothing if there is no profiler."""
+    return profiler.stage(name) if profiler else nullcontext()
@@ -6,25 +6,38 @@ The prologues for Baldur's Gate 3 mod files.
 import __main__
 import os
 
-_script = os.path.basename(__main__.__file__)
-_prologue = f"DO NOT EDIT: This file was automatically generated by {_script}"
+LUA_PROLOGUE: str
+PYTHON_PROLOGUE: str
+TXT_PROLOGUE: str
+XML_PROLOGUE: bytes
 
-LUA_PROLOGUE = f"""\
--- {_prologue}
+
+def set_script(script: os.PathLike) -> None:
+    """Set the name of the generating script in the prologues, e.g. when a build server runs several scripts."""
+    global LUA_PROLOGUE, PYTHON_PROLOGUE, TXT_PROLOGUE, XML_PROLOGUE
+
+    prologue = f"DO NOT EDIT: This file was automatically generated by {os.path.basename(script)}"
+
+    LUA_PROLOGUE = f"""\
+-- {prologue}
 
 """
 
-PYTHON_PROLOGUE = f"""\
+    PYTHON_PROLOGUE = f"""\
 #!/usr/bin/env python3
-# {_prologue}
+# {prologue}
 """
 
-TXT_PROLOGUE = f"""\
-// {_prologue}
+    TXT_PROLOGUE = f"""\
+// {prologue}
 
 """
 
-XML_PROLOGUE = bytes(f"""\
+    XML_PROLOGUE = bytes(f"""\
 <?xml version="1.0" encoding="UTF-8"?>
-<!-- {_prologue} -->
+<!-- {prologue} -->
 """, "UTF-8")
+
+
+# Interactive sessions, and the worker processes that render files, have no script file
+set_script(getattr(__main__, "__file__", "modtools"))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+A reachability graph over a mod's generated game data, for eliminating entries that nothing references.
+"""
+
+import re
+
+from collections.abc import Iterable
+from modtools.gamedata import GameData
+from modtools.lsx.node import LsxNode
+from modtools.symbols import SymbolTable
+from modtools.text import Text
+from typing import Final
+
+# Entry types that are only used when referenced by name; other types (e.g. items) are always kept
+PRUNABLE_TYPES: Final = frozenset(["InterruptData", "PassiveData", "SpellData", "StatusData"])
+
+_WORD_REGEX: Final = re.compile(r"\w+")
+
+
+def _words(values: Iterable[object], words: set[str]) -> None:
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            _words(value, words)
+        elif value is not None:
+            words.update(_WORD_REGEX.findall(str(value)))
+
+
+def _game_data_words(data: GameData) -> set[str]:
+    """Return the words in an entry's using and field values; any of them may name another entry."""
+    words: set[str] = set()
+    _words([data.using], words)
+    _words((getattr(data, key, None) for key in data._fields_), words)
+    return words
+
+
+def _lsx_words(node: LsxNode, words: set[str]) -> None:
+    _words((getattr(node, name, None) for name in node._attributes_), words)
+    if node._child_types_:
+        for child in node.children:
+            _lsx_words(child, words)
+
+
+class ReachabilityGraph:
+    """
+    The references between a mod's GameData entries, and from its .lsx nodes and text files into those entries.
+
+    An entry references every entry named by a word of its field values, which over-approximates the game's own
+    references (using, ContainerSpells, ApplyStatus(), UnlockInterrupt(), conditions, ...). The .lsx nodes (e.g.
+    progressions and spell lists), text files, entries of types outside PRUNABLE_TYPES, and entries that override
+    one of the game's own entries are the roots.
+    """
+
+    _entries: list[GameData]
+    _by_name: dict[str, list[GameData]]   # Name -> [GameData]
+    _roots: set[str]                      # Names referenced by the roots
+
+    def __init__(self,
+                 game_data: Iterable[GameData],
+                 nodes: Iterable[LsxNode] = (),
+                 texts: Iterable[Text] = (),
+                 game_symbols: SymbolTable | None = None):
+        self._entries = list(game_data)
+        self._by_name = {}
+        for data in self._entries:
+            self._by_name.setdefault(data.name, []).append(data)
+
+        self._roots = set()
+        for node in nodes:
+            _lsx_words(node, self._roots)
+        _words((text.text for text in texts), self._roots)
+        for data in self._entries:
+            if data._id_ not in PRUNABLE_TYPES or (game_symbols and game_symbols.defines(data._id_, data.name)):
+                self._roots.add(data.name)
+
+    def reachable(self) -> list[GameData]:
+        """Return the entries reachable from the roots, in their original order."""
+        visited: set[int] = set()
+        pending = [data for name in self._roots for data in self._by_name.get(name, [])]
+        while pending:
+            data = pending.pop()
+            if id(data) not in visited:
+                visited.add(id(data))
+                pending.extend(referenced
+                               for word in _game_data_words(data)
+                               for referenced in self._by_name.get(word, [])
+                               if id(referenced) not in visited)
+        return [data for data in self._entries if id(data) in visited]
+
+    def unreachable(self) -> list[GameData]:
+        """Return the entries that nothing reaches, in their original order."""
+        reachable = {id(data) for data in self.reachable()}
+        return [data for data in self._entries if id(data) not in reachable]
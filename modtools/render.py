@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Rendering and writing of Baldur's Gate 3 mod files.
+"""
+
+import ast
+import os
+import sys
+import time
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from modtools.output import DirectorySink, OutputSink
+
+
+@dataclass
+class RenderTask:
+    """A mod file to be rendered and written."""
+    path: str                          # The file's path, relative to the mod directory
+    prologue: str | bytes              # The prologue written before the content; bytes for binary files
+    render: Callable[[], str | bytes]  # Returns the file's content (excluding the prologue)
+    parallel: bool = True              # Whether the task may be rendered in a worker process
+
+
+@dataclass
+class StageTiming:
+    """The time taken to render and write the files of a build stage."""
+    files: int = 0         # The number of files
+    render: float = 0.0    # Total render time, in seconds (summed across worker processes)
+    write: float = 0.0     # Total write time, in seconds
+
+    def __str__(self) -> str:
+        return f"{self.files} file(s), render {self.render:.3f}s, write {self.write:.3f}s"
+
+
+def _render(task: RenderTask) -> tuple[str | bytes, float]:
+    """Render the task, returning its content and the time taken to render it."""
+    start = time.perf_counter()
+    content = task.render()
+    return (content, time.perf_counter() - start)
+
+
+def _sink(output: os.PathLike | OutputSink) -> OutputSink:
+    """Return the sink for an output directory or sink."""
+    return output if isinstance(output, OutputSink) else DirectorySink(output)
+
+
+def _write(output: OutputSink, task: RenderTask, content: str | bytes) -> None:
+    """Write the prologue and content of a rendered task."""
+    output.write(task.path, task.prologue + content)
+
+
+def write_files(output: os.PathLike | OutputSink, tasks: Iterable[RenderTask]) -> None:
+    """Render and write the tasks' files, in order, to a mod directory or output sink."""
+    output = _sink(output)
+    for task in tasks:
+        content, _ = _render(task)
+        _write(output, task, content)
+
+
+def _is_main_test(test: ast.expr) -> bool:
+    """Return True if an expression is `__name__ == "__main__"` (either way around)."""
+    if not (isinstance(test, ast.Compare) and len(test.ops) == 1 and isinstance(test.ops[0], ast.Eq)):
+        return False
+    operands = {ast.dump(operand) for operand in (test.left, test.comparators[0])}
+    return operands == {ast.dump(ast.Name("__name__", ast.Load())), ast.dump(ast.Constant("__main__"))}
+
+
+def _is_main_guarded() -> bool:
+    """
+    Return True if the __main__ script guards its entry point with `if __name__ == "__main__":`. Worker processes that
+    are spawned, as they are on Windows, import the script again, so an unguarded script would build the mod again in
+    each of them.
+    """
+    if (path := getattr(sys.modules.get("__main__"), "__file__", None)) is None:
+        return True  # An interactive session, which workers do not import
+    try:
+        with open(path, "rb") as f:
+            module = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return False
+    return any(isinstance(statement, ast.If) and _is_main_test(statement.test) for statement in module.body)
+
+
+def render_files(output: os.PathLike | OutputSink,
+                 stages: dict[str, list[RenderTask]],
+                 *,
+                 jobs: int | None = None) -> dict[str, StageTiming]:
+    """
+    Render and write the files for each stage to a mod directory or output sink, returning the time taken by each
+    stage.
+
+    With jobs > 1, the tasks are rendered in that many worker processes. The files are still written by this process,
+    in stage and task order, so the output is the same as for a serial build. The tasks are rendered in this process
+    if the script being run does not guard its entry point with `if __name__ == "__main__":`, as the workers would
+    otherwise run it again.
+    """
+    output = _sink(output)
+    tasks = [(stage, task) for stage, stage_tasks in stages.items() for task in stage_tasks]
+    results: list[tuple[str | bytes, float] | None] = [None] * len(tasks)
+
+    if jobs is not None and jobs > 1 and _is_main_guarded():
+        parallel = [i for i, (_, task) in enumerate(tasks) if task.parallel]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for i, result in zip(parallel, executor.map(_render, [tasks[i][1] for i in parallel])):
+                results[i] = result
+
+    timings = {stage: StageTiming() for stage in stages}
+
+    for i, (stage, task) in enumerate(tasks):
+        content, render_time = results[i] or _render(task)
+        write_start = time.perf_counter()
+        _write(output, task, content)
+        timing = timings[stage]
+        timing.files += 1
+        timing.render += render_time
+        timing.write += time.perf_counter() - write_start
+
+    return timings
@@ -5,18 +5,18 @@ A decorator for class description replacement.
 
 from collections.abc import Callable, Iterable
 from modtools.lsx.game import CharacterClass
-from modtools.lsx import Lsx
 from modtools.lsx.game import ClassDescription
+from modtools.replacers.lsxpaths import class_description_lsx_paths
 from modtools.replacers.replacer import Replacer
+from typing import Final
 
 
 type ClassDescriptionBuilder = Callable[[Replacer, ClassDescription], None]
 type ClassDescriptionBuilderDict = dict[CharacterClass, ClassDescriptionBuilder]
 
 
-_CLASS_DESCRIPTIONS_LSX_PATH = "Shared.pak/Public/Shared/ClassDescriptions/ClassDescriptions.lsx"
-_CLASS_DESCRIPTIONS_DEV_LSX_PATH = "Shared.pak/Public/SharedDev/ClassDescriptions/ClassDescriptions.lsx"
-_CLASS_DESCRIPTIONS_GUSTAVX_LSX_PATH = "GustavX.pak/Public/GustavX/ClassDescriptions/ClassDescriptions.lsx"
+# Relative to each mod's Public/<Folder>/
+_CLASS_DESCRIPTIONS_LSX_PATH: Final = "ClassDescriptions/ClassDescriptions.lsx"
 
 
 def _by_name(class_description: ClassDescription) -> str:
@@ -28,16 +28,9 @@ def _by_uuid(class_description: ClassDescription) -> str:
 
 
 def _load_class_descriptions(replacer: Replacer) -> list[ClassDescription]:
-    """Load the game's Progressions from the .pak cache."""
-    class_descriptions_lsx = Lsx.load(replacer.get_cache_path(_CLASS_DESCRIPTIONS_LSX_PATH))
-    class_descriptions_dev_lsx = Lsx.load(replacer.get_cache_path(_CLASS_DESCRIPTIONS_DEV_LSX_PATH))
-    class_descriptions_gustavx_lsx = Lsx.load(replacer.get_cache_path(_CLASS_DESCRIPTIONS_GUSTAVX_LSX_PATH))
-
-    class_descriptions_lsx.children.update(class_descriptions_dev_lsx.children, key=_by_uuid)
-    class_descriptions_lsx.children.update(class_descriptions_gustavx_lsx.children, key=_by_uuid)
-    class_descriptions_lsx.children.sort(key=_by_name)
-
-    return list(class_descriptions_lsx.children)
+    """Load the game's ClassDescriptions from the .pak cache."""
+    return list(replacer.load_overlay(class_description_lsx_paths, _CLASS_DESCRIPTIONS_LSX_PATH,
+                                      key=_by_uuid, order=_by_name))
 
 
 def _make_builders(class_description_builders: list[ClassDescriptionBuilder]) -> ClassDescriptionBuilderDict:
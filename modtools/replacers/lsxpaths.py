@@ -8,3 +8,20 @@ progression_lsx_paths = [
     "Shared.pak/Public/SharedDev/Progressions/Progressions.lsx",
     "GustavX.pak/Public/GustavX/Progressions/Progressions.lsx",
 ]
+
+spell_list_lsx_paths = [
+    "Shared.pak/Public/Shared/Lists/SpellLists.lsx",
+    "Shared.pak/Public/SharedDev/Lists/SpellLists.lsx",
+    "GustavX.pak/Public/GustavX/Lists/SpellLists.lsx",
+]
+
+class_description_lsx_paths = [
+    "Shared.pak/Public/Shared/ClassDescriptions/ClassDescriptions.lsx",
+    "Shared.pak/Public/SharedDev/ClassDescriptions/ClassDescriptions.lsx",
+    "GustavX.pak/Public/GustavX/ClassDescriptions/ClassDescriptions.lsx",
+]
+
+origin_lsx_paths = [
+    "Gustav.pak/Public/Gustav/Origins/Origins.lsx",
+    "Gustav.pak/Public/GustavDev/Origins/Origins.lsx",
+]
@@ -4,17 +4,17 @@ A decorator for origin replacement.
 """
 
 from collections.abc import Callable
-from modtools.lsx import Lsx
 from modtools.lsx.game import Origin
+from modtools.replacers.lsxpaths import origin_lsx_paths
 from modtools.replacers.replacer import Replacer
+from typing import Final
 
 
 type OriginBuilder = Callable[[Replacer, Origin], None]
 type OriginBuilderDict = dict[str, OriginBuilder]
 
 
-_ORIGINS_LSX_PATH = "Gustav.pak/Public/Gustav/Origins/Origins.lsx"
-_ORIGINS_DEV_LSX_PATH = "Gustav.pak/Public/GustavDev/Origins/Origins.lsx"
+_ORIGINS_LSX_PATH: Final = "Origins/Origins.lsx"  # Relative to each mod's Public/<Folder>/
 
 
 def _by_name(origin: Origin) -> str:
@@ -27,11 +27,7 @@ def _by_uuid(origin: Origin) -> str:
 
 def _load_origins(replacer: Replacer) -> list[Origin]:
     """Load the game's Origins from the .pak cache."""
-    origins_lsx = Lsx.load(replacer.get_cache_path(_ORIGINS_LSX_PATH))
-    origins_dev_lsx = Lsx.load(replacer.get_cache_path(_ORIGINS_DEV_LSX_PATH))
-    origins_lsx.children.update(origins_dev_lsx.children, key=_by_uuid)
-    origins_lsx.children.sort(key=_by_name)
-    return list(origins_lsx.children)
+    return list(replacer.load_overlay(origin_lsx_paths, _ORIGINS_LSX_PATH, key=_by_uuid, order=_by_name))
 
 
 def _make_builders(origin_builders: list[OriginBuilder]) -> OriginBuilderDict:
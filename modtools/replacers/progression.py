@@ -8,9 +8,9 @@ from enum import IntEnum
 from modtools.lsx.game import BASE_CHARACTER_CLASSES, CharacterClass, CharacterRace
 from modtools.lsx import Lsx
 from modtools.lsx.game import Progression
-from modtools.mod import Mod
 from modtools.replacers.lsxpaths import progression_lsx_paths
 from modtools.replacers.replacer import Replacer
+from typing import Final
 
 
 class DontIncludeProgression(BaseException):
@@ -24,6 +24,8 @@ class _Classification(IntEnum):
     OTHER = 3  # NPC classes, origin characters
 
 
+_PROGRESSIONS_LSX_PATH: Final = "Progressions/Progressions.lsx"  # Relative to each mod's Public/<Folder>/
+
 type NameLevelKey = tuple[str, int, bool]
 type MultiNameLevelKey = tuple[list[str], list[int], bool]
 type ProgressionBuilder = Callable[[Replacer, Progression], None]
@@ -44,16 +46,20 @@ def _progression_order(progression: Progression) -> tuple[_Classification, str,
     return (classification, name, progression.Level, progression.IsMulticlass or False)
 
 
-def load_progressions(replacer_or_mod: Replacer | Mod, *, deduplicate: bool = True) -> list[Progression]:
+def load_progressions(replacer: Replacer, *, deduplicate: bool = True) -> list[Progression]:
     """Load the game's Progressions from the .pak cache."""
-    progressions_lsx = Lsx.load(replacer_or_mod.get_cache_path(progression_lsx_paths[0]))
-    additional_lsx_paths = progression_lsx_paths[1:] + (replacer_or_mod.args.include or [])
-    for lsx_path in additional_lsx_paths:
-        lsx = Lsx.load(replacer_or_mod.get_cache_path(lsx_path))
-        if deduplicate:
-            progressions_lsx.children.update(lsx.children, key=_progression_order)
-        else:
-            progressions_lsx.children.extend(lsx.children)
+    lsx_paths = progression_lsx_paths + (replacer.args.include or [])
+    if deduplicate:
+        return list(replacer.load_overlay(lsx_paths, _PROGRESSIONS_LSX_PATH,
+                                          key=_progression_order, order=_progression_order))
+    progressions_lsx = Lsx.load(replacer.get_cache_path(lsx_paths[0]))
+    for lsx_path in lsx_paths[1:]:
+        progressions_lsx.children.extend(Lsx.load(replacer.get_cache_path(lsx_path)).children)
+    for lsx_path in replacer.mod_lsx_paths(_PROGRESSIONS_LSX_PATH):
+        try:
+            progressions_lsx.children.extend(Lsx.load(replacer.get_cache_path(lsx_path)).children)
+        except FileNotFoundError:  # The mod does not change the Progressions
+            pass
     progressions_lsx.children.sort(key=_progression_order)
     return list(progressions_lsx.children)
 
@@ -84,9 +90,10 @@ def _update_progressions(replacer: Replacer,
 
     for progression in progressions:
         if progression.TableUUID:  # Ignore the one entry without a TableUUID
-            was_updated = replacer.allow_improvement(progression)
-            was_updated = replacer.adjust_resources(progression) or was_updated
-            was_updated = replacer.adjust_skills(progression) or was_updated
+            replacer.allow_improvement(progression)
+            replacer.adjust_resources(progression)
+            replacer.adjust_skills(progression)
+            was_updated = progression.is_dirty
 
             tableUuid[progression.Name] = progression.TableUUID
             progression_key = (progression.Name, progression.Level, progression.IsMulticlass or False)
@@ -141,10 +148,11 @@ def _create_progressions(replacer: Replacer,
             TableUUID=tableUuid[name],
             UUID=replacer.make_uuid(f"Progression:{name}:{level}")
         )
-        was_updated = False
-        was_updated = replacer.allow_improvement(progression)
-        was_updated = replacer.adjust_resources(progression) or was_updated
-        was_updated = replacer.adjust_skills(progression) or was_updated
+        progression.mark_clean()
+        replacer.allow_improvement(progression)
+        replacer.adjust_resources(progression)
+        replacer.adjust_skills(progression)
+        was_updated = progression.is_dirty
 
         for builder_fn in builder_fns:
             if not getattr(builder_fn, "only_existing_progressions", False):
@@ -7,19 +7,31 @@ import argparse
 import os
 
 from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from moddb import multiply_resources
+from moddb import level_deltas, multiply_resources
 from modtools.lsx.game import (
     ActionResource,
+    ActionResourceBoost,
     BASE_CHARACTER_CLASSES,
+    Boost,
     CharacterClass,
     CharacterSubclasses,
     Dependencies,
     Progression,
+    SelectSkills,
+    SelectSkillsExpertise,
+    Selectors,
+    parse_boosts,
+    write_boosts,
 )
 from modtools.localization import Localization
+from modtools.lsx import Lsx
+from modtools.lsx.game import ModuleSettings, Mods
+from modtools.lsx.overlay import LsxOverlay
 from modtools.mod import Mod
+from modtools.pak import PakSink
+from modtools.profiler import BuildProfiler, profile_stage
 from modtools.replacers.lsxpaths import progression_lsx_paths
 from typing import Any, ClassVar, Final
 from uuid import UUID
@@ -44,6 +56,17 @@ class Replacer:
         other_feats: set[int] = None                   # All other classes feat improvement levels
         included_classes: list[CharacterClass] = None  # The classes belonging together with the named classes
         level_20: bool = False                         # Include level 20 mod dependency
+        dry_run: bool = False                          # Print a manifest of the files instead of writing them
+        pak: str = None                                # Write the mod into this .pak file instead of a directory
+        force: bool = False                            # Build the mod even if the previous build is current
+        modsettings: str = None                        # Layer the mods enabled in this modsettings.lsx over the game
+        validate: bool = False                         # Parse the functors and conditions of the mod's game data
+        manifest: str = None                           # Compare a dry run with the manifest saved here, and save it
+
+    # The modules of the game itself, which are listed in modsettings.lsx but are not mods
+    GAME_MODULES: Final[frozenset[str]] = frozenset([
+        "Gustav", "GustavDev", "GustavX", "Honour", "HonourX", "MainUI", "ModBrowser", "Shared", "SharedDev",
+    ])
 
     ACTION_RESOURCES: Final[set[ActionResource]] = frozenset([
         ActionResource.ARCANE_RECOVERY_CHARGES,
@@ -67,6 +90,9 @@ class Replacer:
         ActionResource.WRITHING_TIDE_POINTS,
     ])
 
+    # The SkillList offered by SelectSkills() and SelectSkillsExpertise() at character creation
+    _SKILL_LIST_UUID: Final[str] = "f974ebd6-3725-4b90-bb5c-2b647d41615d"
+
     _FIGHTER_EXTRA_FEATS: Final[dict[int, set[int]]] = {
         1: set(),
         2: {3, 5, 13},
@@ -106,7 +132,7 @@ class Replacer:
         20: [4, 3, 3, 3, 3, 2, 2, 1, 1],
     }
 
-    _SPELL_SLOT_DELTA: Final[dict[int, list[int]]]
+    _SPELL_SLOT_DELTA: Final[dict[int, list[int]]] = level_deltas(_SPELL_SLOTS)
 
     _LIMITED_CASTERS: Final[set[CharacterClass]] = {
         CharacterClass.PALADIN,
@@ -126,6 +152,7 @@ class Replacer:
 
     _args: Args
     _mod: Mod
+    _mod_folders: list[str] | None  # The folders of the mods enabled by --modsettings, in load order, once parsed
 
     def __new__(cls, *args: str, **kwds: str):
         """Create the class, populating the _builders list."""
@@ -141,6 +168,7 @@ class Replacer:
 
     def __init__(self, base_dir: str, *, author: str, **kwds: str):
         self._parse_arguments(**kwds)
+        self._mod_folders = None
         self._mod = Mod(base_dir,
                         author=author,
                         name=self.args.name,
@@ -149,7 +177,8 @@ class Replacer:
                         folder=kwds.get("folder"),
                         version=kwds.get("version", (4, 1, 1, 1)),
                         cache_dir=kwds.get("cache_dir"),
-                        level_20=self.args.level_20)
+                        level_20=self.args.level_20,
+                        unpak=kwds.get("unpak"))
 
     @staticmethod
     def _class_list(s: str) -> list[CharacterClass]:
@@ -239,6 +268,20 @@ class Replacer:
                             help="Include a third-party mod in the progression.")
         parser.add_argument("--level-20", action="store_true", default=level_20,
                             help="Include level 20 mod dependency.")
+        parser.add_argument("--dry-run", action="store_true", default=False,
+                            help="Render the mod in memory and print the SHA-256 hash of each file, without writing.")
+        parser.add_argument("--pak", type=str, default=None,
+                            help="Write the mod into this .pak file, rather than into the mod's directory.")
+        parser.add_argument("--force", action="store_true", default=False,
+                            help="Build the mod even if its previous build is up to date.")
+        parser.add_argument("--modsettings", type=str, nargs="?", default=None, const=self._modsettings_path(),
+                            help="Layer the mods enabled in a modsettings.lsx over the game's files, in load order "
+                                 "(default: the player's modsettings.lsx).")
+        parser.add_argument("--validate", action="store_true", default=False,
+                            help="Parse the functors and conditions of the mod's game data, failing if any is invalid.")
+        parser.add_argument("--manifest", type=str, default=None,
+                            help="Make a dry run, report the files changed since the manifest saved in this JSON file "
+                                 "by a previous dry run, and save the new manifest there.")
         self._args = Replacer.Args(**vars(parser.parse_args()))
 
         if self.args.name is None:
@@ -275,6 +318,46 @@ class Replacer:
         """Get the path of a file in the unpak cache."""
         return self._mod.get_cache_path(lsx_path)
 
+    @staticmethod
+    def _modsettings_path() -> str:
+        """Return the path of the player's modsettings.lsx."""
+        return os.path.join(os.getenv("LOCALAPPDATA") or "", "Larian Studios", "Baldur's Gate 3", "PlayerProfiles",
+                            "Public", "modsettings.lsx")
+
+    def mod_lsx_paths(self, relative_path: str) -> list[str]:
+        """
+        Return the .pak paths of a file, relative to Public/<Folder>/, in each of the mods enabled by --modsettings, in
+        load order. Each mod's .pak is expected to be named after its folder.
+        """
+        if self.args.modsettings is None:
+            return []
+        if self._mod_folders is None:
+            module_settings: ModuleSettings = Lsx.load(self.args.modsettings)
+            self._mod_folders = [mod.Folder
+                                 for mods in module_settings.children.finditer(lambda child: isinstance(child, Mods))
+                                 for mod in mods.children
+                                 if mod.Folder and mod.Folder not in self.GAME_MODULES]
+        return [f"{folder}.pak/Public/{folder}/{relative_path}" for folder in self._mod_folders]
+
+    def load_overlay[Node](self,
+                           lsx_paths: Iterable[str],
+                           relative_path: str, *,
+                           key: LsxOverlay.KeyFunction,
+                           order: LsxOverlay.KeyFunction | None = None) -> LsxOverlay[Node]:
+        """
+        Load a game table from the layers of .lsx files in lsx_paths, followed by the file at relative_path in each of
+        the mods enabled by --modsettings that has one, in load order.
+        """
+        overlay = LsxOverlay(key=key, order=order)
+        for lsx_path in lsx_paths:
+            overlay.add_layer(Lsx.load(self.get_cache_path(lsx_path)).children, name=lsx_path)
+        for lsx_path in self.mod_lsx_paths(relative_path):
+            try:
+                overlay.add_layer(Lsx.load(self.get_cache_path(lsx_path)).children, name=lsx_path)
+            except FileNotFoundError:
+                pass
+        return overlay
+
     def make_name(self, suffix: str) -> str:
         return self._mod.make_name(suffix)
 
@@ -282,43 +365,46 @@ class Replacer:
         """Generate a UUID for the given key."""
         return self._mod.make_uuid("Replacer:" + key)
 
-    def allow_improvement(self, progression: Progression) -> bool:
+    def allow_improvement(self, progression: Progression) -> None:
         if progression.Name not in BASE_CHARACTER_CLASSES or progression.Level == 1:
-            return False
+            return
         character_class = CharacterClass(progression.Name)
         if character_class not in self.args.included_classes:
-            return False
+            return
         feats = (self.args.rogue_feats if character_class == CharacterClass.ROGUE
                 else self.args.fighter_feats if character_class == CharacterClass.FIGHTER
                 else self.args.other_feats)
         allow_improvement = progression.AllowImprovement
         progression.AllowImprovement = (progression.Level in feats) or (False if allow_improvement == False else None)
-        return allow_improvement != progression.AllowImprovement
 
-    def adjust_resources(self, progression: Progression) -> bool:
+    def adjust_resources(self, progression: Progression) -> None:
         if progression.Name not in CharacterClass:
-            return False
+            return
         character_class = CharacterClass(progression.Name)
         if character_class not in self.args.included_classes:
-            return False
-        existing_boosts = progression.Boosts
-        existing_passives = progression.PassivesAdded
-        multiply_resources(progression, [ActionResource.SPELL_SLOTS], self.args.spells)
-        multiply_resources(progression, [ActionResource.WARLOCK_SPELL_SLOTS], self.args.warlock_spells)
-        multiply_resources(progression, self.ACTION_RESOURCES, self.args.actions)
+            return
+        boosts = parse_boosts(progression.Boosts)
+        multiply_resources(boosts, [ActionResource.SPELL_SLOTS], self.args.spells)
+        multiply_resources(boosts, [ActionResource.WARLOCK_SPELL_SLOTS], self.args.warlock_spells)
+        multiply_resources(boosts, self.ACTION_RESOURCES, self.args.actions)
         if self.args.full_caster:
-            self._adjust_resources_full_caster(character_class, progression)
-        progression.Boosts = progression.Boosts or None
+            boosts = self._adjust_resources_full_caster(character_class, progression, boosts)
+        write_boosts(progression, boosts)
         progression.PassivesAdded = progression.PassivesAdded or None
-        return existing_boosts != progression.Boosts or existing_passives != progression.PassivesAdded
     
-    def _adjust_resources_full_caster(self, character_class: CharacterClass, progression: Progression) -> None:
+    def _adjust_resources_full_caster(self,
+                                      character_class: CharacterClass,
+                                      progression: Progression,
+                                      boosts: list[Boost]) -> list[Boost]:
         if (character_class in self._LIMITED_CASTERS or
             (character_class in self.args.classes and character_class in self._NON_CASTERS)):
-            progression.Boosts = [
-                *[boost for boost in (progression.Boosts or []) if not boost.startswith("ActionResource(SpellSlot")],
+            boosts = [
                 *[
-                    f"ActionResource(SpellSlot,{self.args.spells * delta},{spell_level})"
+                    boost for boost in boosts
+                    if not (isinstance(boost, ActionResourceBoost) and boost.resource == ActionResource.SPELL_SLOTS)
+                ],
+                *[
+                    ActionResourceBoost(ActionResource.SPELL_SLOTS, self.args.spells * delta, spell_level)
                     for spell_level in range(1, 10)
                     if (delta := self._SPELL_SLOT_DELTA[progression.Level][spell_level - 1]) > 0
                 ],
@@ -333,27 +419,41 @@ class Replacer:
                     if progression.Level in (1, 3, 5, 7, 9) else []
                 ),
             ]
+        return boosts
 
-    def adjust_skills(self, progression: Progression) -> bool:
+    def adjust_skills(self, progression: Progression) -> None:
         if progression.Name not in BASE_CHARACTER_CLASSES or progression.Level != 1 or progression.IsMulticlass:
-            return False
+            return
+        if self.args.skills is None and self.args.expertise is None:
+            return
         character_class = CharacterClass(progression.Name)
         if character_class not in self.args.included_classes:
-            return False
-        selectors = progression.Selectors
+            return
+        selectors = Selectors(progression.Selectors)
         if self.args.skills is not None:
-            selectors = [selector for selector in (selectors or []) if not selector.startswith("SelectSkills(")]
-            selectors.append(f"SelectSkills(f974ebd6-3725-4b90-bb5c-2b647d41615d,{self.args.skills})")
+            selectors.remove_type(SelectSkills)
+            selectors.add(SelectSkills(self._SKILL_LIST_UUID, self.args.skills))
         if self.args.expertise is not None:
-            selectors = [selector for selector in selectors if not selector.startswith("SelectSkillsExpertise(")]
-            selectors.append(f"SelectSkillsExpertise(f974ebd6-3725-4b90-bb5c-2b647d41615d,{self.args.expertise})")
-        if progression.Selectors == selectors:
-            return False
-        progression.Selectors = selectors
-        return True
-
-    def build(self) -> None:
-        """Build the mod."""
+            selectors.remove_type(SelectSkillsExpertise)
+            selectors.add(SelectSkillsExpertise(self._SKILL_LIST_UUID, self.args.expertise))
+        progression.Selectors = selectors.format()
+
+    def build(self, *, jobs: int | None = None, profile: BuildProfiler | None = None) -> None:
+        """Build the mod, optionally rendering its files in 'jobs' worker processes.
+
+        profile -- if given, record the time and memory taken by each builder, builder function, and build stage
+        """
+        # The mods named by a modsettings.lsx can change without changing the fingerprint, so those builds always run
+        if (profile is None
+                and not (self.args.force or self.args.dry_run or self.args.pak or self.args.modsettings
+                         or self.args.validate or self.args.manifest)
+                and self._mod.is_up_to_date()):
+            print(f"{self.args.name}: up to date")
+            return
+        with profile_stage(profile, "Replacer.build"):
+            self._build(jobs=jobs, profile=profile)
+
+    def _build(self, *, jobs: int | None, profile: BuildProfiler | None) -> None:
         if self._args.level_20:
             self._mod.add(Dependencies.ShortModuleDesc(
                 Folder="UnlockLevelCurve_a2ffd0e4-c407-8642-2611-c934ea0b0a77",
@@ -368,13 +468,11 @@ class Replacer:
                     "Progressions/Progressions.lsx")
 
         for builder, fns in self._builders.items():
-            builder(self, fns)
-        self._mod.build()
-
-Replacer._SPELL_SLOT_DELTA = {
-    level: [
-        (Replacer._SPELL_SLOTS[level][i] if i < len(Replacer._SPELL_SLOTS[level]) else 0) -
-        (Replacer._SPELL_SLOTS[level - 1][i] if i < len(Replacer._SPELL_SLOTS[level - 1]) else 0)
-        for i in range(0, 9)
-    ] for level in range(1, 21)
-}
+            if profile:
+                with profile.stage(builder.__name__.strip("_")):
+                    builder(self, [profile.wrap(fn) for fn in fns])
+            else:
+                builder(self, fns)
+        output = PakSink(self.args.pak, jobs=jobs) if self.args.pak else None
+        self._mod.build(jobs=jobs, profile=profile, output=output, dry_run=self.args.dry_run, force=True,
+                        validate=self.args.validate, manifest=self.args.manifest)
@@ -5,9 +5,9 @@ A decorator for origin replacement.
 
 from collections.abc import Callable
 from functools import cache
-from modtools.lsx import Lsx
-from modtools.lsx.children import LsxChildren
 from modtools.lsx.game import SpellList
+from modtools.lsx.overlay import LsxOverlay
+from modtools.replacers.lsxpaths import spell_list_lsx_paths
 from modtools.replacers.replacer import Replacer
 from typing import Callable, Final, Iterable
 from uuid import UUID
@@ -18,9 +18,7 @@ class DontIncludeSpellList(BaseException):
     pass
 
 
-_SPELL_LISTS_LSX_PATH = "Shared.pak/Public/Shared/Lists/SpellLists.lsx"
-_SPELL_LISTS_DEV_LSX_PATH = "Shared.pak/Public/SharedDev/Lists/SpellLists.lsx"
-_SPELL_LISTS_GUSTAVX_LSX_PATH = "GustavX.pak/Public/GustavX/Lists/SpellLists.lsx"
+_SPELL_LISTS_LSX_PATH: Final = "Lists/SpellLists.lsx"  # Relative to each mod's Public/<Folder>/
 
 type SpellListBuilder = Callable[[Replacer, SpellList], None]
 type SpellListBuilderDict = dict[str, list[SpellListBuilder]]
@@ -35,21 +33,13 @@ def _key_by_uuid(spell_list: SpellList) -> str:
 
 
 @cache
-def _load_spell_lists(replacer: Replacer) -> LsxChildren:
-    spell_lists_lsx = Lsx.load(replacer.get_cache_path(_SPELL_LISTS_LSX_PATH))
-    spell_lists_dev_lsx = Lsx.load(replacer.get_cache_path(_SPELL_LISTS_DEV_LSX_PATH))
-    spell_lists_gustavx_lsx = Lsx.load(replacer.get_cache_path(_SPELL_LISTS_GUSTAVX_LSX_PATH))
-    spell_lists_lsx.children.update(spell_lists_dev_lsx.children, key=_key_by_uuid)
-    spell_lists_lsx.children.update(spell_lists_gustavx_lsx.children, key=_key_by_uuid)
-    spell_lists_lsx.children.sort(key=_key_by_name)
-    return spell_lists_lsx.children
+def _load_spell_lists(replacer: Replacer) -> LsxOverlay[SpellList]:
+    return replacer.load_overlay(spell_list_lsx_paths, _SPELL_LISTS_LSX_PATH, key=_key_by_uuid, order=_key_by_name)
 
 
 @cache
 def _find_by_uuid(replacer: Replacer, uuid: UUID) -> SpellList:
-    def by_uuid(spell_list: SpellList) -> bool:
-        return spell_list.UUID == str(uuid)
-    return _load_spell_lists(replacer).find(by_uuid)
+    return _load_spell_lists(replacer).get(str(uuid))
 
 
 def _make_builders(spell_list_builders: list[SpellListBuilder]) -> SpellListBuilderDict:
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+A long-running build server that keeps the mod tools and parsed game files in memory, rebuilding mods when their
+scripts or the libraries that they use change. Run it with `python -m modtools serve`, and submit builds with
+`python -m modtools build <script> [args...]`.
+"""
+
+import argparse
+import ast
+import io
+import json
+import os
+import runpy
+import socket
+import socketserver
+import sys
+import time
+import traceback
+
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from importlib.util import resolve_name
+from types import ModuleType
+from typing import Any, Final
+from xml.etree.ElementTree import Element
+
+DEFAULT_HOST: Final = "127.0.0.1"
+DEFAULT_PORT: Final = 52379
+
+# Packages whose source is watched, relative to the root directory
+_LIBRARY_PACKAGES: Final = ("moddb", "modtools")
+
+# Packages and modules that are kept loaded between builds: the large, stateless definitions of the game's files, and
+# the modules that they use. The library modules that these import at module level are kept loaded too, so that a
+# warm module never holds on to a module that has been replaced. Any other module of the library packages is imported
+# afresh by each build, so that module-level state does not leak from one build into the next.
+_WARM_PACKAGES: Final = ("modtools.gamedata", "modtools.lsx")
+_WARM_MODULES: Final = ("modtools", "modtools.output", "modtools.prologue", "modtools.render", "modtools.serve",
+                        "modtools.unpak")
+
+
+@dataclass
+class _Target:
+    """A mod script that the server has built, and rebuilds when it or its dependencies change."""
+    script: str                                          # The script's absolute path
+    args: list[str]                                      # The script's command line arguments
+    dependencies: set[str] = field(default_factory=set)  # The paths of the library modules that it last imported
+
+
+def _is_warm(module_name: str) -> bool:
+    return module_name in _WARM_MODULES or any(module_name == package or module_name.startswith(package + ".")
+                                               for package in _WARM_PACKAGES)
+
+
+def _module_level_imports(path: str, package: str) -> set[str]:
+    """
+    Return the names of the modules that a module's source imports at module level, rather than within its functions,
+    together with the names that it imports from packages, which may be submodules.
+    """
+    try:
+        with open(path, "rb") as f:
+            statements = list(ast.parse(f.read(), path).body)
+    except (OSError, SyntaxError, ValueError):
+        return set()
+
+    names = set()
+    while statements:
+        match statements.pop():
+            case ast.Import(names=aliases):
+                names.update(alias.name for alias in aliases)
+            case ast.ImportFrom(module=module, names=aliases, level=level):
+                base = resolve_name("." * level + (module or ""), package) if level else module
+                names.add(base)
+                names.update(f"{base}.{alias.name}" for alias in aliases)
+            case ast.FunctionDef() | ast.AsyncFunctionDef():
+                pass
+            case statement:
+                statements.extend(child for child in ast.iter_child_nodes(statement) if isinstance(child, ast.stmt))
+    return names
+
+
+def _is_library(module_name: str) -> bool:
+    return any(module_name == package or module_name.startswith(package + ".") for package in _LIBRARY_PACKAGES)
+
+
+class BuildServer:
+    """Builds mod scripts in-process on request, and rebuilds them when their sources change."""
+
+    _root_dir: str
+    _poll_interval: float
+    _targets: dict[str, _Target]               # Script path -> target
+    _mtimes: dict[str, int]                    # Watched source path -> modification time
+    _parsed: dict[str, tuple[int, Element]]    # The parse cache of Lsx.load(), from which builds load documents afresh
+    _imports: dict[str, tuple[int, set[str]]]  # Module path -> (modification time, module-level imports)
+    _running: bool                             # False once a stop request has been received
+
+    def __init__(self, root_dir: os.PathLike, *, poll_interval: float = 0.25):
+        """Create a server for the mod scripts in root_dir, checking for changes every poll_interval seconds."""
+        self._root_dir = os.path.abspath(root_dir)
+        self._poll_interval = poll_interval
+        self._targets = {}
+        self._mtimes = {}
+        self._parsed = {}
+        self._imports = {}
+        self._running = False
+
+        if self._root_dir not in sys.path:
+            sys.path.insert(0, self._root_dir)
+        self._mtimes = self._scan()
+
+    def _scan(self) -> dict[str, int]:
+        """Return the modification times of the library sources and target scripts."""
+        mtimes = {}
+        for package in _LIBRARY_PACKAGES:
+            for dir_path, dir_names, filenames in os.walk(os.path.join(self._root_dir, package)):
+                dir_names[:] = [name for name in dir_names if not name.startswith((".", "__"))]
+                for filename in filenames:
+                    if filename.endswith(".py"):
+                        path = os.path.join(dir_path, filename)
+                        mtimes[path] = os.stat(path).st_mtime_ns
+        for script in self._targets:
+            if os.path.exists(script):
+                mtimes[script] = os.stat(script).st_mtime_ns
+        return mtimes
+
+    def _module_imports(self, module: ModuleType) -> set[str]:
+        """Return the names that a loaded module imports at module level, reparsing its source only if it changed."""
+        if (path := getattr(module, "__file__", None)) is None:
+            return set()
+        mtime = os.stat(path).st_mtime_ns
+        if (imports := self._imports.get(path)) is None or imports[0] != mtime:
+            imports = self._imports[path] = (mtime, _module_level_imports(path, module.__package__))
+        return imports[1]
+
+    def _warm_modules(self) -> set[str]:
+        """Return the names of the loaded warm modules, and of the library modules that they import, transitively."""
+        warm = {name for name in sys.modules if _is_library(name) and _is_warm(name)}
+        pending = list(warm)
+        while pending:
+            for name in self._module_imports(sys.modules[pending.pop()]):
+                if name not in warm and name in sys.modules and _is_library(name):
+                    warm.add(name)
+                    pending.append(name)
+        return warm
+
+    def _unload(self, *, warm: bool) -> None:
+        """Unload the library modules, including the warm modules if warm is True."""
+        keep = set() if warm else self._warm_modules()
+        for name in [name for name in sys.modules if _is_library(name) and name not in keep]:
+            del sys.modules[name]
+
+    def build(self, script: os.PathLike, args: list[str] | None = None) -> tuple[int, str]:
+        """Build a mod script, returning its exit status and output. The script is rebuilt when it changes."""
+        script = os.path.abspath(script)
+        target = self._targets.setdefault(script, _Target(script, list(args or [])))
+        if args is not None:
+            target.args = list(args)
+        self._mtimes[script] = os.stat(script).st_mtime_ns
+
+        self._unload(warm=False)
+        from modtools.lsx import Lsx
+        from modtools.prologue import set_script
+        Lsx.cache_parsed(self._parsed)
+        set_script(script)
+
+        output = io.StringIO()
+        argv = sys.argv
+        sys.argv = [script, *target.args]
+        status = 0
+        start = time.perf_counter()
+        try:
+            with redirect_stdout(output), redirect_stderr(output):
+                runpy.run_path(script, run_name="__main__")
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except BaseException:
+            output.write(traceback.format_exc())
+            status = 1
+        finally:
+            sys.argv = argv
+
+        warm = self._warm_modules()
+        target.dependencies = {
+            os.path.abspath(path) for name, module in sys.modules.items()
+            if _is_library(name) and name not in warm and (path := getattr(module, "__file__", None))
+        }
+        output.write(f"{os.path.basename(script)}: {"built" if status == 0 else "failed"} in "
+                     f"{time.perf_counter() - start:.2f}s\n")
+        return (status, output.getvalue())
+
+    def _poll(self) -> None:
+        """Rebuild the targets affected by any changed sources."""
+        mtimes = self._scan()
+        changed = {path for path, mtime in mtimes.items() if self._mtimes.get(path) != mtime}
+        changed |= self._mtimes.keys() - mtimes.keys()
+        self._mtimes = mtimes
+        if not changed:
+            return
+
+        warm_paths = {os.path.abspath(path) for name in self._warm_modules()
+                      if (path := getattr(sys.modules[name], "__file__", None))}
+        if changed & warm_paths:
+            self._unload(warm=True)
+            affected = list(self._targets.values())
+        else:
+            affected = [target for target in self._targets.values()
+                        if target.script in changed or target.dependencies & changed]
+
+        for target in affected:
+            _, output = self.build(target.script)
+            print(output, end="", flush=True)
+
+    def _handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        match request.get("command"):
+            case "build" if not os.path.isfile(request["script"]):
+                return {"status": 2, "output": f"No such mod script: {request["script"]}\n"}
+            case "build":
+                status, output = self.build(request["script"], request.get("args"))
+                print(output, end="", flush=True)
+                return {"status": status, "output": output}
+            case "stop":
+                self._running = False
+                return {"status": 0, "output": "Build server stopped\n"}
+            case command:
+                return {"status": 2, "output": f"Unknown command: {command}\n"}
+
+    def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """Serve build requests on a local socket, and rebuild changed targets, until stopped."""
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                response = server._handle(json.loads(self.rfile.readline()))
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        socketserver.TCPServer.allow_reuse_address = True
+        with socketserver.TCPServer((host, port), Handler) as tcp_server:
+            tcp_server.timeout = self._poll_interval
+            print(f"Serving builds of {self._root_dir} on {host}:{port}", flush=True)
+            self._running = True
+            while self._running:
+                tcp_server.handle_request()
+                self._poll()
+
+
+def submit(request: dict[str, Any], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> dict[str, Any]:
+    """Submit a request to a build server, returning its response."""
+    with socket.create_connection((host, port)) as connection:
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="modtools", description="The mod tools' build server, and its client.")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST,
+                        help=f"Address of the build server (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port of the build server (default: {DEFAULT_PORT})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the build server")
+    serve_parser.add_argument("scripts", type=str, nargs="*",
+                              help="Mod scripts to build immediately, and rebuild when they change")
+    serve_parser.add_argument("-d", "--root-dir", type=str, default=os.getcwd(),
+                              help="Directory containing the mod scripts, moddb, and modtools (default: the current "
+                                   "directory)")
+    serve_parser.add_argument("-i", "--interval", type=float, default=0.25,
+                              help="Seconds between checks for changed sources (default: 0.25)")
+
+    build_parser = commands.add_parser("build", help="Build a mod script on the build server")
+    build_parser.add_argument("script", type=str,
+                              help="The mod script")
+    build_parser.add_argument("args", nargs=argparse.REMAINDER,
+                              help="The script's arguments")
+
+    commands.add_parser("stop", help="Stop the build server")
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case "serve":
+            server = BuildServer(args.root_dir, poll_interval=args.interval)
+            for script in args.scripts:
+                print(server.build(script)[1], end="", flush=True)
+            server.serve_forever(args.host, args.port)
+            return 0
+        case "build":
+            response = submit({"command": "build", "script": os.path.abspath(args.script), "args": args.args},
+                              args.host, args.port)
+        case "stop":
+            response = submit({"command": "stop"}, args.host, args.port)
+    print(response["output"], end="")
+    return response["status"]
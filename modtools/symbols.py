@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+A symbol table of the names defined by the game and a mod, and a cross-reference check of the mod's references.
+"""
+
+import modtools.gamedata.valuelists as VL
+import os
+import re
+
+from collections.abc import Callable, Iterable, Iterator
+from modtools.gamedata import GameData, iter_calls, parse_functors
+from modtools.lsx import Lsx
+from modtools.lsx.game import (
+    AddSpells,
+    PassiveList,
+    Progression,
+    SelectPassives,
+    SelectSpells,
+    Selectors,
+    SpellList,
+)
+from modtools.lsx.node import LsxNode
+from typing import Final, Self
+
+type Reference = tuple[str, str, str]  # (referrer, kind, name), e.g. ("PassiveData Foo", "StatusData", "BAR")
+
+_STATS_DATA_DIRS: Final = [
+    "Shared.pak/Public/Shared/Stats/Generated/Data",
+    "Shared.pak/Public/SharedDev/Stats/Generated/Data",
+    "Gustav.pak/Public/Gustav/Stats/Generated/Data",
+    "Gustav.pak/Public/GustavDev/Stats/Generated/Data",
+    "GustavX.pak/Public/GustavX/Stats/Generated/Data",
+]
+
+_STATS_FILES: Final = [
+    "Armor.txt",
+    "Character.txt",
+    "CriticalHitTypes.txt",
+    "Interrupt.txt",
+    "Object.txt",
+    "Passive.txt",
+    *(f"Spell_{spell_type}.txt" for spell_type in ("Projectile", "ProjectileStrike", "Rush", "Shout", "Target",
+                                                   "Teleportation", "Throw", "Wall", "Zone")),
+    *(f"Status_{status_type}.txt" for status_type in ("BOOST", "DEACTIVATED", "DOWNED", "EFFECT", "FEAR", "HEAL",
+                                                      "INCAPACITATED", "INVISIBLE", "KNOCKED_DOWN", "POLYMORPHED",
+                                                      "SNEAKING")),
+    "Weapon.txt",
+]
+
+_LISTS_DIRS: Final = [
+    "Shared.pak/Public/Shared/Lists",
+    "Shared.pak/Public/SharedDev/Lists",
+    "GustavX.pak/Public/GustavX/Lists",
+]
+
+_LISTS_FILES: Final = ["PassiveLists.lsx", "SpellLists.lsx"]
+
+_STATS_ENTRY_REGEX: Final = re.compile(r"""^new entry "([^"]+)"\s*^type "([^"]+)\"""", re.MULTILINE)
+
+# The targets that may precede the referenced name in ApplyStatus(), RemoveStatus() and UseSpell()
+_TARGETS: Final = frozenset(["GROUND", "OBSERVER_OBSERVER", "OBSERVER_SOURCE", "OBSERVER_TARGET", "SELF", "SOURCE",
+                             "SWAP", "TARGET"])
+
+# Call name -> (referenced kind, whether the name may be preceded by a target)
+_CALL_REFERENCES: Final = {
+    "ApplyStatus": ("StatusData", True),
+    "RemoveStatus": ("StatusData", True),
+    "UnlockInterrupt": ("InterruptData", False),
+    "UnlockSpell": ("SpellData", False),
+    "UseSpell": ("SpellData", True),
+}
+
+
+class SymbolTable:
+    """A hash-indexed table of the names defined by the game and a mod, by kind (e.g. SpellData or SpellList)."""
+
+    _symbols: dict[str, set[str]]  # Kind -> {name or UUID}
+
+    def __init__(self):
+        self._symbols = {}
+
+    def add(self, kind: str, name: str) -> None:
+        """Add a symbol."""
+        self._symbols.setdefault(kind, set()).add(name)
+
+    def defines(self, kind: str, name: str) -> bool:
+        """Return True if the symbol is defined."""
+        return name in self._symbols.get(kind, ())
+
+    def add_stats(self, text: str) -> None:
+        """Add the entries defined in the text of a Stats .txt file."""
+        for name, kind in _STATS_ENTRY_REGEX.findall(text):
+            self.add(kind, name)
+
+    def add_game_data(self, game_data: Iterable[GameData]) -> None:
+        """Add the names of GameData entries."""
+        for data in game_data:
+            self.add(data._id_, data.name)
+
+    def add_lsx(self, nodes: Iterable[LsxNode]) -> None:
+        """Add the UUIDs of .lsx nodes, by node type."""
+        for node in nodes:
+            if uuid := getattr(node, "UUID", None):
+                self.add(type(node).__name__, str(uuid))
+
+    @classmethod
+    def load(cls, get_cache_path: Callable[[str], os.PathLike]) -> Self:
+        """Load the symbols defined by the game's Stats and Lists files from the .pak cache."""
+        symbols = cls()
+        for stats_dir in _STATS_DATA_DIRS:
+            for filename in _STATS_FILES:
+                try:
+                    with open(get_cache_path(f"{stats_dir}/{filename}"), "r", encoding="utf-8") as f:
+                        symbols.add_stats(f.read())
+                except FileNotFoundError:
+                    pass
+        for lists_dir in _LISTS_DIRS:
+            for filename in _LISTS_FILES:
+                try:
+                    symbols.add_lsx(Lsx.load(get_cache_path(f"{lists_dir}/{filename}")).children)
+                except FileNotFoundError:
+                    pass
+        return symbols
+
+
+def _call_references(referrer: str, values: Iterable[str]) -> Iterator[Reference]:
+    for value in values:
+        try:
+            functors = parse_functors(value)
+        except ValueError:
+            continue
+        for call in (call for functor in functors for call in iter_calls(functor)):
+            if reference := _CALL_REFERENCES.get(call.name):
+                kind, has_target = reference
+                names = [str(arg) for arg in call.args[:2 if has_target else 1]]
+                if names and names[0] in _TARGETS and len(names) > 1:
+                    names = names[1:]
+                if names and names[0]:
+                    yield (referrer, kind, names[0])
+
+
+def _game_data_references(data: GameData) -> Iterator[Reference]:
+    referrer = f"{data._id_} {data.name}"
+    if data.using:
+        yield (referrer, data._id_, data.using)
+    for key in data._fields_:
+        if not (values := getattr(data, key, None)):
+            continue
+        if key == "ContainerSpells":
+            yield from ((referrer, "SpellData", spell) for spell in values)
+        elif key == "Passives":
+            yield from ((referrer, "PassiveData", passive) for passive in values)
+        elif key == "Boosts" or data._fields_[key] == VL.StatsFunctors:
+            yield from _call_references(referrer, values)
+
+
+def _lsx_references(node: LsxNode) -> Iterator[Reference]:
+    referrer = f"{type(node).__name__} {getattr(node, "Name", None) or getattr(node, "UUID", "")}"
+    if isinstance(node, SpellList):
+        yield from ((referrer, "SpellData", spell) for spell in node.Spells or [])
+    elif isinstance(node, PassiveList):
+        yield from ((referrer, "PassiveData", passive) for passive in node.Passives or [])
+    elif isinstance(node, Progression):
+        referrer = f"Progression {node.Name} {node.Level}"
+        for passives in (node.PassivesAdded, node.PassivesRemoved):
+            yield from ((referrer, "PassiveData", passive) for passive in passives or [])
+        yield from _call_references(referrer, node.Boosts or [])
+        for selector in Selectors(node.Selectors):
+            if isinstance(selector, (AddSpells, SelectSpells)):
+                yield (referrer, "SpellList", selector.uuid)
+            elif isinstance(selector, SelectPassives):
+                yield (referrer, "PassiveList", selector.uuid)
+
+
+def references(game_data: Iterable[GameData], nodes: Iterable[LsxNode]) -> Iterator[Reference]:
+    """Yield the references made by the GameData entries and .lsx nodes."""
+    for data in game_data:
+        yield from _game_data_references(data)
+    for node in nodes:
+        yield from _lsx_references(node)
+
+
+def unresolved_references(symbols: SymbolTable,
+                          game_data: Iterable[GameData],
+                          nodes: Iterable[LsxNode]) -> list[Reference]:
+    """Return the references made by the GameData entries and .lsx nodes that the symbol table does not define."""
+    return [reference for reference in references(game_data, nodes) if not symbols.defines(*reference[1:])]
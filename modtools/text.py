@@ -3,10 +3,13 @@
 Text-based Baldur's Gate 3 mod files.
 """
 
+import modtools.prologue as prologue
 import os
 
 from abc import ABC, abstractmethod
-from modtools.prologue import LUA_PROLOGUE, TXT_PROLOGUE
+from collections.abc import Iterator
+from functools import partial
+from modtools.render import RenderTask, write_files
 from textwrap import dedent
 
 
@@ -24,7 +27,7 @@ class Text(ABC):
 
     @property
     def prologue(self) -> str:
-        return TXT_PROLOGUE
+        return prologue.TXT_PROLOGUE
 
 
 class TextCollection:
@@ -33,6 +36,9 @@ class TextCollection:
     def __init__(self):
         self._entries = []
 
+    def __iter__(self) -> Iterator[Text]:
+        return iter(self._entries)
+
     def add(self, entry: Text) -> None:
         assert isinstance(entry, Text), f"{type(entry).__name__} is not a subclass of Text"
         if entry not in self._entries:
@@ -40,18 +46,29 @@ class TextCollection:
 
     def save(self, mod_path: os.PathLike, **kwds: str) -> None:
         """Save each entry to the appropriate file."""
+        write_files(mod_path, self.render_tasks(**kwds))
+
+    def render_tasks(self, **kwds: str) -> list[RenderTask]:
+        """
+        Return the tasks rendering each entry to the appropriate file. These are rendered in-process, as entries may be
+        of Text subclasses defined by the mod's script.
+        """
         file_mappings: dict[str, list[Text]] = {}
 
         for entry in self._entries:
-            path = os.path.join(mod_path, entry.path.format(**kwds))
-            file_mappings.setdefault(path, []).append(entry)
+            file_mappings.setdefault(entry.path.format(**kwds), []).append(entry)
+
+        return [
+            RenderTask(path,
+                       entries[0].prologue,
+                       partial(_render_text, [entry.text for entry in entries]),
+                       parallel=False)
+            for path, entries in file_mappings.items()
+        ]
+
 
-        for filename, entries in file_mappings.items():
-            os.makedirs(os.path.dirname(filename), exist_ok=True)
-            with open(filename, "w") as f:
-                f.write(entries[0].prologue)
-                f.write("\n\n".join(entry.text for entry in entries))
-                f.write("\n")
+def _render_text(texts: list[str]) -> str:
+    return "\n\n".join(texts) + "\n"
 
 
 class Equipment(Text):
@@ -73,7 +90,7 @@ class Script(Text):
 
     @property
     def prologue(self) -> str:
-        return LUA_PROLOGUE
+        return prologue.LUA_PROLOGUE
 
 
 class SpellSet(Text):
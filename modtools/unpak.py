@@ -12,7 +12,11 @@ import sys
 import winreg
 
 from collections.abc import Mapping
+from modtools.entrycache import EntryCache
+from modtools.pak import read_pak_entry
+from modtools.pakindex import PakIndex
 from pathlib import PurePath
+from typing import ClassVar
 from zipfile import ZipFile
 
 EXPORT_TOOL_VERSION = "1.18.7"
@@ -23,16 +27,20 @@ class Unpak:
 
     _INSTALLDIR_REGEX = re.compile(R"""\s*"installdir"\s*"([^"]*)"\s*""")
 
+    _entry_cache: ClassVar[EntryCache | None] = EntryCache()
+
     _cache_dir: os.PathLike
     _export_tool_dir: os.PathLike
     _unpak_dir: os.PathLike
     _cached_files: Mapping[tuple[str, str], os.PathLike]
+    _index: PakIndex | None
 
     def __init__(self, cache_dir: os.PathLike | None = None):
         self._cache_dir = cache_dir or os.path.join(os.path.dirname(__file__), ".cache")
         self._export_tool_dir = os.path.join(self._cache_dir, f"ExportTool-v{EXPORT_TOOL_VERSION}")
         self._unpak_dir = os.path.join(self._cache_dir, "unpak")
         self._cached_files = {}
+        self._index = None
         self._cache_export_tool()
 
     def get_path(self, pak_path: str) -> os.PathLike:
@@ -43,10 +51,66 @@ class Unpak:
         if file_path := self._cached_files.get(file_key):
             return file_path
 
+        # Entries that the .pak does not have are found missing from its index, without searching the .pak
+        try:
+            is_missing = not self.index.exists(f"{pak_name}.pak/{relative_path}")
+        except ValueError:  # The .pak's file table could not be read; LSLib will search the .pak
+            is_missing = False
+        if is_missing:
+            raise FileNotFoundError(f"{relative_path} is not in {pak_name}.pak")
+
         file_path = self._cache_file(pak_name, relative_path)
         self._cached_files[file_key] = file_path
         return file_path
 
+    def get_data(self, pak_path: str) -> bytes:
+        """
+        Retrieve the contents of a file in a .pak. Recently read files are kept in memory, in the entry cache; others
+        are read straight from the .pak, or, for .lsf files, which LSLib converts to .lsf.lsx, from the unpak cache.
+        """
+        pak_name, relative_path = PakIndex.split(pak_path)
+        pak_filename = self.index.pak_filename(pak_name)
+        key = (pak_filename, os.stat(pak_filename).st_mtime_ns, relative_path)
+        if (cache := Unpak._entry_cache) is not None and (data := cache.get(key)) is not None:
+            return data
+
+        if (data := self._read_entry(pak_filename, pak_name, relative_path)) is None:
+            with open(self.get_path(pak_path), "rb") as f:
+                data = f.read()
+        if cache is not None:
+            cache.put(key, data)
+        return data
+
+    @classmethod
+    def cache_entries(cls, cache: EntryCache | None) -> None:
+        """Keep the files read by get_data() in cache, which all instances share; None stops caching."""
+        cls._entry_cache = cache
+
+    @classmethod
+    def entry_cache(cls) -> EntryCache | None:
+        """Return the cache of the files read by get_data(), with its hit and miss counts."""
+        return cls._entry_cache
+
+    @property
+    def index(self) -> PakIndex:
+        """The index of the entries in the game's and the installed mods' .pak files."""
+        if self._index is None:
+            self._index = PakIndex(os.path.join(self._cache_dir, "index"),
+                                   [self._get_bg3_data_dir(), self._get_bg3_mod_dir()])
+        return self._index
+
+    def _read_entry(self, pak_filename: str, pak_name: str, relative_path: str) -> bytes | None:
+        """Read a file straight from its .pak, or return None if it must be extracted by LSLib instead."""
+        if relative_path.endswith(".lsf.lsx"):
+            return None
+        try:
+            entry = self.index.entry(f"{pak_name}.pak/{relative_path}")
+            if entry is None:
+                raise FileNotFoundError(f"{relative_path} is not in {pak_name}.pak")
+            return read_pak_entry(pak_filename, entry)
+        except ValueError:  # The .pak's file table could not be read, or its entry could not be decompressed
+            return None
+
     def _cache_export_tool(self) -> None:
         """Download the LSLib export tool into the cache, if it is not already present."""
         os.makedirs(self._cache_dir, exist_ok=True)